@@ -4,6 +4,7 @@ from .fsck import fsck
 from .get import get
 from .history import history
 from .init import init
+from .maintenance import maintenance
 from .mkdir import mkdir
 from .mv import mv
 from .new import new
@@ -23,6 +24,7 @@ __all__ = [
     'get',
     'history',
     'init',
+    'maintenance',
     'mkdir',
     'mv',
     'new',
@@ -9,14 +9,22 @@ from onyo.argparse_helpers import (
 )
 from onyo.lib.commands import onyo_get
 from onyo.lib.exceptions import OnyoCLIExitCode
-from onyo.lib.filters import Filter
 from onyo.lib.inventory import Inventory
 from onyo.lib.onyo import OnyoRepo
+from onyo.lib.query import parse_query
 
 if TYPE_CHECKING:
     import argparse
 
 args_get = {
+    'count': dict(
+        args=('--count',),
+        action='store_true',
+        help=r"""
+            Print the number of matching items (per group of ``--group-by``).
+        """
+    ),
+
     'depth': dict(
         args=('-d', '--depth'),
         metavar='DEPTH',
@@ -30,6 +38,32 @@ args_get = {
         """
     ),
 
+    'distinct': dict(
+        args=('--distinct',),
+        metavar='KEY',
+        nargs='+',
+        help=r"""
+            Print the number of distinct values of **KEY**\ s (per group of
+            ``--group-by``).
+        """
+    ),
+
+    'format': dict(
+        args=('-f', '--format'),
+        metavar='FORMAT',
+        choices=('jsonl', 'tsv', 'csv'),
+        default=None,
+        help=r"""
+            Export results as JSON Lines (``jsonl``; one JSON object per
+            line), tab-separated values (``tsv``), or comma-separated values
+            (``csv``). The latter two begin with a header line. Values are
+            exported in full, rather than replacing dictionaries and lists
+            with tags; in ``tsv`` and ``csv`` they are encoded as JSON. Unset
+            keys are omitted (``jsonl``) or empty (``tsv``, ``csv``). Cannot be
+            combined with ``--machine-readable``.
+        """
+    ),
+
     'keys': dict(
         args=('-k', '--keys'),
         metavar='KEY',
@@ -40,6 +74,17 @@ args_get = {
         """
     ),
 
+    'limit': dict(
+        args=('-l', '--limit'),
+        metavar='LIMIT',
+        type=int,
+        required=False,
+        default=None,
+        help=r"""
+            Print at most **LIMIT** results (after sorting). Default is no limit.
+        """
+    ),
+
     'machine_readable': dict(
         args=('-H', '--machine-readable'),
         action='store_true',
@@ -50,6 +95,26 @@ args_get = {
         """
     ),
 
+    'max': dict(
+        args=('--max',),
+        metavar='KEY',
+        nargs='+',
+        help=r"""
+            Print the largest value of **KEY**\ s in natural sort order (per
+            group of ``--group-by``).
+        """
+    ),
+
+    'min': dict(
+        args=('--min',),
+        metavar='KEY',
+        nargs='+',
+        help=r"""
+            Print the smallest value of **KEY**\ s in natural sort order (per
+            group of ``--group-by``).
+        """
+    ),
+
     'match': dict(
         args=('-M', '--match'),
         metavar='MATCH',
@@ -76,8 +141,15 @@ args_get = {
 
             Tags and regular expressions work only with ``=`` and ``!=``.
 
-            An item must meet the criteria of all match statements for it to be
-            printed (i.e. each statement is connected with a logical **and**).
+            Criteria can be combined with the keywords ``and``, ``or``,
+            ``not``, and grouped with parentheses. ``KEY in VALUE,VALUE,...``
+            matches any of the comma-separated values, and ``exists KEY``
+            matches if the key is set. Keywords and parentheses must be passed
+            as separate arguments (and parentheses must be quoted in a shell).
+
+            An item must meet the criteria of all match statements not
+            connected with ``or`` for it to be printed (i.e. they are connected
+            with a logical **and**).
 
             When ``--match`` is invoked multiple times, an item must meet the
             criteria of only one invocation for it to be printed (i.e. each
@@ -90,6 +162,25 @@ args_get = {
             results logically to
 
             (``type=laptop`` **and** ``make=apple``) **or** (``type=display`` **and** ``make=eizo``)
+
+            which can also be written as
+
+            ``--match '(' type=laptop make=apple ')' or '(' type=display make=eizo ')'``
+        """
+    ),
+
+    'group_by': dict(
+        args=('-g', '--group-by'),
+        metavar='KEY',
+        nargs='+',
+        help=r"""
+            Group matching items by the values of **KEY**\ s, and print one
+            result per group instead of the items. The groups are aggregated
+            with ``--count``, ``--distinct``, ``--min``, ``--max``, and
+            ``--sum`` (default is ``--count``). Items are aggregated as they
+            are read, so only the groups are kept in memory. Cannot be
+            combined with ``--keys``. Results are sorted by the **KEY**\ s
+            unless sorted by other columns of the results (e.g. ``count``).
         """
     ),
 
@@ -139,6 +230,16 @@ args_get = {
         """
     ),
 
+    'sum': dict(
+        args=('--sum',),
+        metavar='KEY',
+        nargs='+',
+        help=r"""
+            Print the sum of the numeric values of **KEY**\ s (per group of
+            ``--group-by``). Other values are ignored.
+        """
+    ),
+
     'types': dict(
         args=('-t', '--types'),
         metavar="TYPES",
@@ -180,6 +281,30 @@ parsable format (suitable for piping):
 .. code:: shell
 
     $ onyo get --match type=laptop make=apple model=macbookpro --keys path --machine-readable
+
+List all laptops and displays that are not in the warehouse and have no user:
+
+.. code:: shell
+
+    $ onyo get --match type in laptop,display and not directory=warehouse and not exists user
+
+Export all assets with their type, make, and model to a JSON Lines file:
+
+.. code:: shell
+
+    $ onyo get --keys path type make model --format jsonl > inventory.jsonl
+
+Count the laptops in each directory, most first:
+
+.. code:: shell
+
+    $ onyo get --match type=laptop --group-by directory --count --sort-descending count
+
+List the 20 most recently modified laptops:
+
+.. code:: shell
+
+    $ onyo get --match type=laptop --sort-descending onyo.was.modified.time --limit 20
 """
 
 
@@ -210,7 +335,11 @@ def get(args: argparse.Namespace) -> None:
 
     inventory = Inventory(repo=OnyoRepo(Path.cwd(), find_root=True))
 
-    filters = [[Filter(f).match for f in m] for m in args.match] if args.match else None
+    filters = [[parse_query(m)] for m in args.match] if args.match else None
+
+    aggregates = [('count', None)] if args.count else []
+    for func in ['distinct', 'min', 'max', 'sum']:
+        aggregates += [(func, key) for key in getattr(args, func) or []]
 
     results = onyo_get(inventory=inventory,
                        sort=args.sort,
@@ -218,12 +347,13 @@ def get(args: argparse.Namespace) -> None:
                        exclude=excludes,
                        depth=args.depth,
                        machine_readable=args.machine_readable,
-                       # Type annotation for callables as filters, somehow
-                       # doesn't work with the bound method `Filter.match`.
-                       # Not clear, what's the problem.
                        match=filters,  # pyre-ignore[6]
                        keys=args.keys,
-                       types=args.types)
+                       types=args.types,
+                       limit=args.limit,
+                       output_format=args.format,
+                       group_by=args.group_by,
+                       aggregates=aggregates or None)
 
     if not results:
         raise OnyoCLIExitCode("'onyo get' exits 1 when no results are found.", 1)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from onyo.lib.commands import onyo_maintenance
+from onyo.lib.consts import MAINTENANCE_TASKS
+from onyo.lib.onyo import OnyoRepo
+
+if TYPE_CHECKING:
+    import argparse
+
+args_maintenance = {
+    'tasks': dict(
+        args=('-t', '--tasks'),
+        metavar='TASKS',
+        nargs='+',
+        choices=MAINTENANCE_TASKS,
+        default=None,
+        help=r"""
+            Tasks to run (``commit-graph``, ``repack``, ``caches``). Default is
+            to run all tasks.
+        """
+    ),
+}
+
+epilog_maintenance = r"""
+.. rubric:: Examples
+
+Optimize the repository and refresh Onyo's caches:
+
+.. code:: shell
+
+    $ onyo maintenance
+
+Only refresh Onyo's caches:
+
+.. code:: shell
+
+    $ onyo maintenance --tasks caches
+
+Write the commit-graph and refresh Onyo's caches automatically every 100
+commits:
+
+.. code:: shell
+
+    $ onyo config onyo.maintenance.auto 100
+"""
+
+
+def maintenance(args: argparse.Namespace) -> None:
+    r"""
+    Optimize the Onyo repository and refresh Onyo's caches.
+
+    Lookups of the history (such as ``onyo history`` and ``onyo.was.*``
+    pseudo-keys) get slower as a repository grows. The following tasks keep
+    the repository tuned:
+
+      * ``commit-graph``: write git's commit-graph with changed-path Bloom
+        filters, which speeds up walking the history of paths
+      * ``repack``: pack all objects into a single pack with a reachability
+        bitmap
+      * ``caches``: refresh Onyo's indexes and caches in ``.git/onyo/``
+
+    The time each task took and its effect are reported.
+
+    The ``commit-graph`` and ``caches`` tasks run automatically after every
+    **N** commits if ``onyo.maintenance.auto`` is set to **N**. ``repack`` is
+    only run by ``onyo maintenance``.
+    """
+    repo = OnyoRepo(Path.cwd(), find_root=True)
+    onyo_maintenance(repo, tasks=args.tasks)
@@ -203,6 +203,60 @@ def test_get_tag_output(repo: OnyoRepo) -> None:
     assert expected_output == ret.stdout
 
 
+@pytest.mark.repo_contents(*convert_contents(tag_asset_contents))
+def test_get_format(repo: OnyoRepo) -> None:
+    r"""Export full values as JSON Lines, TSV, and CSV."""
+
+    import csv
+    import json
+
+    cmd = ['onyo', 'get', '--keys', 'path', 'key', 'serial', '--format']
+    expected_keys = {'type_make_model.1': True,
+                     'type_make_model.2': False,
+                     'type_make_model.3': None,
+                     'type_make_model.5': 'value',
+                     'type_make_model.6': '',
+                     'type_make_model.7': ['a', 'b'],
+                     'type_make_model.8': [],
+                     'type_make_model.9': {'a': '1', 'b': '2'},
+                     'type_make_model.10': {}}
+
+    # JSON Lines: typed values; unset keys are omitted
+    ret = subprocess.run(cmd + ['jsonl'], capture_output=True, text=True)
+    assert ret.returncode == 0
+    assert not ret.stderr
+    rows = [json.loads(line) for line in ret.stdout.splitlines()]
+    assert [r['path'] for r in rows] == [f'type_make_model.{i}' for i in range(1, 11)]
+    assert {r['path']: r['key'] for r in rows if 'key' in r} == expected_keys
+    assert rows[3] == {'path': 'type_make_model.4', 'serial': '4'}
+
+    # TSV and CSV: a header; nested values as JSON; unset and null are empty
+    for fmt, dialect in [('tsv', 'excel-tab'), ('csv', 'excel')]:
+        ret = subprocess.run(cmd + [fmt], capture_output=True, text=True)
+        assert ret.returncode == 0
+        assert not ret.stderr
+        rows = list(csv.reader(ret.stdout.splitlines(), dialect=dialect))
+        assert rows[0] == ['path', 'key', 'serial']
+        assert rows[1] == ['type_make_model.1', 'true', '1']
+        assert rows[3] == ['type_make_model.3', '', '3']
+        assert rows[4] == ['type_make_model.4', '', '4']
+        assert rows[7] == ['type_make_model.7', '["a","b"]', '7']
+        assert rows[9] == ['type_make_model.9', '{"a":"1","b":"2"}', '9']
+        assert len(rows) == 11
+
+    # no results exits 1, but the header is printed
+    ret = subprocess.run(cmd + ['csv', '--match', 'key=nothing'], capture_output=True, text=True)
+    assert ret.returncode == 1
+    assert ret.stdout == 'path,key,serial\n'
+
+    # invalid format or combined with --machine-readable
+    ret = subprocess.run(cmd + ['yaml'], capture_output=True, text=True)
+    assert ret.returncode == 2
+    ret = subprocess.run(cmd + ['csv', '--machine-readable'], capture_output=True, text=True)
+    assert ret.returncode == 2
+    assert "cannot be combined" in ret.stderr
+
+
 match_asset_contents = [
     ('laptop_apple_model.1', {
         'type': 'laptop', 'make': 'apple', 'model': 'model', 'serial': '1',
@@ -237,6 +291,43 @@ match_asset_contents = [
 ]
 
 
+@pytest.mark.repo_contents(*convert_contents(match_asset_contents))
+def test_get_group_by(repo: OnyoRepo) -> None:
+    r"""Aggregate groups of matching items."""
+
+    cmd = ['onyo', 'get', '-H', '--group-by', 'type']
+    ret = subprocess.run(cmd, capture_output=True, text=True)
+    assert ret.returncode == 0
+    assert not ret.stderr
+    assert ret.stdout == "display\t4\nheadphones\t2\nlaptop\t4\n"
+
+    ret = subprocess.run(cmd + ['make', '--count', '--distinct', 'key', '--min', 'serial', '--max', 'serial',
+                                '--match', 'type', 'in', 'display,headphones'],
+                         capture_output=True, text=True)
+    assert ret.returncode == 0
+    assert not ret.stderr
+    assert ret.stdout == ("display\tdell\t2\t1\t5\t6\n"
+                          "display\teizo\t2\t0\t7\t8\n"
+                          "headphones\tsennheiser\t2\t1\t9\t10\n")
+
+    # sort by aggregate; no grouping aggregates all matches
+    ret = subprocess.run(['onyo', 'get', '-H', '-g', 'make', '-S', 'count', '-s', 'make', '--limit', '2'],
+                         capture_output=True, text=True)
+    assert ret.stdout == "apple\t2\ndell\t2\n"
+    ret = subprocess.run(['onyo', 'get', '--format', 'jsonl', '--count', '--match', 'type=laptop'],
+                         capture_output=True, text=True)
+    assert ret.stdout == '{"count":4}\n'
+
+    # no matches exits 1
+    ret = subprocess.run(cmd + ['--match', 'type=nothing'], capture_output=True, text=True)
+    assert ret.returncode == 1
+
+    # invalid combinations
+    for args in [['--keys', 'make'], ['--sort-ascending', 'make']]:
+        ret = subprocess.run(cmd + args, capture_output=True, text=True)
+        assert ret.returncode == 2
+
+
 @pytest.mark.repo_contents(*convert_contents(match_asset_contents))
 def test_get_complex_match(repo: OnyoRepo) -> None:
     r"""Multiple argument are passed to multiple match statements."""
@@ -301,6 +392,47 @@ def test_get_complex_match(repo: OnyoRepo) -> None:
     assert expected_output == ret.stdout
 
 
+
+@pytest.mark.repo_contents(*convert_contents(match_asset_contents))
+def test_get_match_expression(repo: OnyoRepo) -> None:
+    r"""Match statements can be combined with and/or/not, parentheses, ``in``, and ``exists``."""
+
+    cmd = ['onyo', 'get', '--machine-readable', '--keys', 'onyo.path.relative', '--sort-ascending', 'serial']
+
+    # equivalent to `test_get_complex_match`
+    match = ['--match', '(', 'type=laptop', 'make=framework', ')', 'or', '(', 'type=display', 'and', 'make=eizo', ')',
+             'OR', 'key=<true>']
+    ret = subprocess.run(cmd + match, capture_output=True, text=True)
+    assert ret.returncode == 0
+    assert not ret.stderr
+    assert ret.stdout == (
+        "laptop_framework_model.3\n"
+        "laptop_framework_model.4\n"
+        "display_dell_model.5\n"
+        "display_eizo_model.7\n"
+        "display_eizo_model.8\n"
+    )
+
+    match = ['--match', 'type', 'in', 'display,headphones', 'not', 'exists', 'key', 'and', 'not', 'make=dell',
+             '--match', 'serial=1']
+    ret = subprocess.run(cmd + match, capture_output=True, text=True)
+    assert ret.returncode == 0
+    assert not ret.stderr
+    assert ret.stdout == (
+        "laptop_apple_model.1\n"
+        "display_eizo_model.7\n"
+        "display_eizo_model.8\n"
+        "headphones_sennheiser_model.10\n"
+    )
+
+    # invalid expressions
+    for match in [['(', 'type=laptop'], ['type=laptop', 'or'], ['not'], ['type', 'in'], [')']]:
+        ret = subprocess.run(cmd + ['--match', *match], capture_output=True, text=True)
+        assert ret.returncode == 2
+        assert ret.stderr
+        assert not ret.stdout
+
+
 asset_contents = [
     ('laptop_apple_macbookpro.1', {'num': 8,
                                    'str': 'foo',
@@ -755,6 +887,33 @@ def test_get_sort(repo: OnyoRepo,
     assert result == expected_order
 
 
+@pytest.mark.repo_contents(*convert_contents([t for t in asset_contents
+                                              if t[0] in ['a13bc_foo_bar.1',
+                                                          'a2cd_foo_bar.2',
+                                                          'a36ab_foo_bar.3',
+                                                          'a36ab_afoo_bar.4']]))
+@pytest.mark.parametrize('limit,expected_order', [
+    ('0', []),
+    ('1', [4]),
+    ('3', [4, 1, 2]),
+    ('10', [4, 1, 2, 3]),
+])
+def test_get_limit(repo: OnyoRepo,
+                   limit: str,
+                   expected_order: list[int]) -> None:
+    r"""Test ``--limit`` restricts the results after sorting."""
+
+    cmd = ['onyo', 'get', '-H', '--keys', 'id', '-s', 'make', '-s', 'num', '--limit', limit]
+    ret = subprocess.run(cmd, capture_output=True, text=True)
+    assert ret.returncode == (0 if expected_order else 1)
+    assert not ret.stderr
+    assert [int(line) for line in ret.stdout.splitlines()] == expected_order
+
+    ret = subprocess.run(['onyo', 'get', '--limit', '-1'], capture_output=True, text=True)
+    assert ret.returncode == 2
+    assert "must not be negative" in ret.stderr
+
+
 @pytest.mark.parametrize('keys,expected', [
     ({'num': SORT_ASCENDING}, [1, 2, 3, 4]),
     ({'num': SORT_DESCENDING}, [3, 4, 2, 1]),  # no difference for 3,4 -> order is stable
@@ -782,6 +941,10 @@ def test_natural_sort(keys: dict[str, sort_t],
     # ^ No idea why this is the only place where pyre can't figure that ItemSpec is a UserDict
     assert expected == [data.get('id') for data in sorted_assets]
 
+    # the top-k are the same as the first k of a full sort
+    for limit in range(len(assets) + 1):
+        assert natural_sort(assets, keys=keys, limit=limit) == sorted_assets[:limit]  # pyre-ignore[6]
+
     # explicitly check path sorting:
     assets = [{'onyo.path.relative': Path('folder/file (1).txt')},
               {'onyo.path.relative': Path('folder/file.txt')},
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import subprocess
+
+import pytest
+
+from onyo.lib.onyo import OnyoRepo
+
+
+@pytest.mark.repo_files('a/laptop_apple_macbook.abc123')
+def test_maintenance(repo: OnyoRepo) -> None:
+    r"""``onyo maintenance`` reports the tasks it ran."""
+
+    ret = subprocess.run(['onyo', 'maintenance'], capture_output=True, text=True)
+    assert ret.returncode == 0
+    assert not ret.stderr
+    for task in ['commit-graph', 'repack', 'caches']:
+        assert task in ret.stdout
+    assert repo.git.is_clean_worktree()
+
+    ret = subprocess.run(['onyo', 'maintenance', '--tasks', 'caches'], capture_output=True, text=True)
+    assert ret.returncode == 0
+    assert 'caches' in ret.stdout
+    assert 'repack' not in ret.stdout
+
+
+def test_maintenance_invalid_task(repo: OnyoRepo) -> None:
+    r"""``onyo maintenance`` errors on unknown tasks."""
+
+    ret = subprocess.run(['onyo', 'maintenance', '--tasks', 'invalid'], capture_output=True, text=True)
+    assert ret.returncode != 0
+    assert "invalid choice" in ret.stderr
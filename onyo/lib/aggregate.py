@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from onyo.lib.consts import (
+    TAG_MAP_OUTPUT,
+    TAG_UNSET,
+)
+from onyo.lib.utils import natsort_key
+
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Callable,
+        Iterable,
+    )
+
+    from onyo.lib.items import Item
+
+log: logging.Logger = logging.getLogger('onyo.aggregate')
+
+AGGREGATE_FUNCTIONS = ('count', 'distinct', 'min', 'max', 'sum')
+r"""Functions to aggregate the Items of a group with.
+
+- ``count``: number of Items (takes no key)
+- ``distinct``: number of distinct values of a key
+- ``min``: smallest value of a key (in natural sort order)
+- ``max``: largest value of a key (in natural sort order)
+- ``sum``: sum of the numeric values of a key
+"""
+
+
+class _Count(object):
+    r"""Count the Items of a group."""
+
+    __slots__ = ('n',)
+
+    def __init__(self) -> None:
+        self.n = 0
+
+    def add(self,
+            value: Any) -> None:
+        self.n += 1
+
+    def result(self) -> int:
+        return self.n
+
+
+class _Distinct(object):
+    r"""Count the distinct values of a key.
+
+    This is the only aggregate whose memory grows with the Items of a group.
+    """
+
+    __slots__ = ('values',)
+
+    def __init__(self) -> None:
+        self.values = set()
+
+    def add(self,
+            value: Any) -> None:
+        if value is not TAG_UNSET:
+            self.values.add(_hashable(value))
+
+    def result(self) -> int:
+        return len(self.values)
+
+
+class _Extremum(object):
+    r"""Keep the smallest (or largest) value of a key in natural sort order."""
+
+    __slots__ = ('value', 'sort_key', 'f', 'largest')
+
+    def __init__(self,
+                 f: Callable[[Any], Any],
+                 largest: bool) -> None:
+        self.value = TAG_UNSET
+        self.sort_key = None
+        self.f = f
+        self.largest = largest
+
+    def add(self,
+            value: Any) -> None:
+        if value is TAG_UNSET or isinstance(value, (dict, list)):
+            return
+
+        sort_key = self.f(value)
+        if self.value is TAG_UNSET or \
+                (self.sort_key < sort_key if self.largest else sort_key < self.sort_key):
+            self.value = value
+            self.sort_key = sort_key
+
+    def result(self) -> Any:
+        return self.value
+
+
+class _Sum(object):
+    r"""Sum the numeric values of a key. Other values are ignored."""
+
+    __slots__ = ('total',)
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def add(self,
+            value: Any) -> None:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.total += value
+
+    def result(self) -> int | float:
+        return self.total
+
+
+def _hashable(value: Any) -> Any:
+    r"""Get ``value``, or its tag if it is a structure (and thus unhashable)."""
+
+    for symbol, types in TAG_MAP_OUTPUT.items():
+        if isinstance(value, types) and value is not None:
+            return symbol
+
+    return value
+
+
+class Aggregation(object):
+    r"""Group Items by the values of keys, and aggregate each group.
+
+    Items are consumed one at a time, and only the running aggregates of each
+    group are kept (see :py:data:`AGGREGATE_FUNCTIONS`). Structures (e.g.
+    dictionaries) are grouped by their tag (e.g. ``<dict>``) and keys that are
+    not set by their :py:data:`onyo.lib.consts.TAG_UNSET` tag.
+
+    Attributes
+    ----------
+    group_by
+        Keys to group Items by.
+    aggregates
+        Pairs of function and key to aggregate each group with. The key is
+        ``None`` for ``count``.
+    columns
+        Keys of the rows returned, i.e. ``group_by`` followed by the name of each
+        aggregate (e.g. ``count`` or ``sum(price)``).
+    """
+
+    def __init__(self,
+                 group_by: list[str] | None = None,
+                 aggregates: list[tuple[str, str | None]] | None = None) -> None:
+        r"""Set up an aggregation.
+
+        Parameters
+        ----------
+        group_by
+            Keys to group Items by. If empty, all Items form a single group.
+        aggregates
+            Pairs of function (see :py:data:`AGGREGATE_FUNCTIONS`) and key.
+            Default is to count the Items of each group.
+
+        Raises
+        ------
+        ValueError
+            An aggregate function is unknown, or is missing its key.
+        """
+
+        self.group_by: list[str] = group_by or []
+        self.aggregates: list[tuple[str, str | None]] = aggregates or [('count', None)]
+
+        for func, key in self.aggregates:
+            if func not in AGGREGATE_FUNCTIONS:
+                raise ValueError(f"Allowed aggregate functions: {', '.join(AGGREGATE_FUNCTIONS)}")
+            if not key and func != 'count':
+                raise ValueError(f"The aggregate function '{func}' requires a key.")
+
+        self.columns: list[str] = self.group_by + [func if func == 'count' else f'{func}({key})'
+                                                   for func, key in self.aggregates]
+
+    def _accumulators(self) -> list:
+        r"""Create the accumulators of a new group."""
+
+        accumulators = []
+        for func, key in self.aggregates:
+            match func:
+                case 'count':
+                    accumulators.append(_Count())
+                case 'distinct':
+                    accumulators.append(_Distinct())
+                case 'min' | 'max':
+                    accumulators.append(_Extremum(natsort_key(key), largest=func == 'max'))  # pyre-ignore[6]
+                case 'sum':
+                    accumulators.append(_Sum())
+
+        return accumulators
+
+    def __call__(self,
+                 items: Iterable[Item]) -> list[dict]:
+        r"""Aggregate ``items``.
+
+        Parameters
+        ----------
+        items
+            Items to aggregate.
+
+        Returns
+        -------
+        list[dict]
+            One row per group, with :py:attr:`columns` as keys. Groups are in
+            order of their first Item. No rows are returned if there are no
+            ``items``.
+        """
+
+        keys = [key for _, key in self.aggregates]
+        groups: dict[tuple, list] = dict()
+
+        for item in items:
+            group = tuple(_hashable(item[k]) if k in item else TAG_UNSET
+                          for k in self.group_by)
+            accumulators = groups.get(group)
+            if accumulators is None:
+                accumulators = groups[group] = self._accumulators()
+
+            for key, accumulator in zip(keys, accumulators):
+                accumulator.add(None if key is None else item[key] if key in item else TAG_UNSET)
+
+        return [dict(zip(self.columns, [*group, *(a.result() for a in accumulators)]))
+                for group, accumulators in groups.items()]
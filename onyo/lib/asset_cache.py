@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from onyo.lib.sqlite_cache import SQLiteCache
+from onyo.lib.ui import ui
+
+if TYPE_CHECKING:
+    from typing import (
+        Iterable,
+    )
+
+log: logging.Logger = logging.getLogger('onyo.asset_cache')
+
+
+class AssetCache(SQLiteCache):
+    r"""Persistent cache of asset contents, keyed by blob object ID.
+
+    The cache tracks the blob object ID of every file of the commit it was last
+    updated to (:py:attr:`head`). Changes are applied via :py:func:`update`, so
+    that only the files that differ from the previous commit need to be
+    looked at.
+
+    The content of blobs is added on demand via :py:func:`add_contents`, so
+    that it does not need to be read from git and parsed again. It is stored
+    as JSON of the content loaded with :py:func:`onyo.lib.utils.load_readonly`.
+    Content the read-only loader cannot load (or JSON cannot represent) is
+    stored as YAML text instead, to be parsed by the reader. Since blobs are
+    immutable, their content remains valid regardless of the commit or path
+    they are read from.
+
+    The database is an SQLite file, usually at ``.git/onyo/assets.sqlite``.
+    It is a cache and can be deleted at any time.
+
+    Attributes
+    ----------
+    path
+        The Path of the database file.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS files (
+        path TEXT PRIMARY KEY,
+        oid TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS contents (
+        oid TEXT PRIMARY KEY,
+        content TEXT NOT NULL,
+        parsed INTEGER NOT NULL
+    );
+    """
+
+    SCHEMA_VERSION = '3'
+
+    TABLES = ('files', 'contents')
+
+    def update(self,
+               changes: Iterable[tuple[Path, str | None]],
+               head: str,
+               reset: bool = False) -> None:
+        r"""Apply changed files to the cache.
+
+        The content of blobs that are no longer referenced by any file is
+        removed. All changes are applied in a single transaction.
+
+        Parameters
+        ----------
+        changes
+            Tuples of the Path (relative to the root of the repository) of a
+            file and the object ID of its blob. ``None`` removes the file.
+        head
+            The hexsha of the commit the cache is up-to-date with afterwards.
+        reset
+            Remove all files before applying ``changes``, which then must list
+            all files of ``head``. Contents of blobs that are still referenced
+            are kept.
+        """
+
+        removed = []
+        changed = []
+        for path, oid in changes:
+            if oid is None:
+                removed.append((path.as_posix(),))
+            else:
+                changed.append((path.as_posix(), oid))
+
+        with self._db:
+            if reset:
+                self._db.execute("DELETE FROM files")
+            self._db.executemany("DELETE FROM files WHERE path = ?", removed)
+            self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?)", changed)
+            self._db.execute("DELETE FROM contents WHERE oid NOT IN (SELECT oid FROM files)")
+            self._set_meta('head', head)
+
+        ui.log_debug(f"Updated asset cache with {len(removed) + len(changed)} changes at {head}")
+
+    def get_object_ids(self,
+                       paths: Iterable[Path]) -> dict[Path, str]:
+        r"""Get the blob object IDs of files.
+
+        Parameters
+        ----------
+        paths
+            Paths relative to the root of the repository. Paths that are not
+            in the cache are omitted from the result.
+        """
+
+        paths = {p.as_posix(): p for p in paths}
+        result = {}
+        for chunk in _chunks(list(paths.keys())):
+            rows = self._db.execute("SELECT path, oid FROM files WHERE path IN "
+                                    f"({','.join('?' * len(chunk))})", chunk)
+            result.update({paths[path]: oid for path, oid in rows})
+
+        return result
+
+    def get_contents(self,
+                     paths: Iterable[Path]) -> dict[Path, dict | str]:
+        r"""Get the contents of files.
+
+        Content is returned as a dictionary, as loaded by
+        :py:func:`onyo.lib.utils.load_readonly`. Every call returns new
+        objects. Content that is not cached in parsed form is returned as YAML
+        text instead (see :py:func:`add_contents`).
+
+        Parameters
+        ----------
+        paths
+            Paths relative to the root of the repository. Paths whose blob has
+            no cached content are omitted from the result.
+        """
+
+        paths = {p.as_posix(): p for p in paths}
+        result = {}
+        for chunk in _chunks(list(paths.keys())):
+            rows = self._db.execute("SELECT f.path, c.content, c.parsed FROM files f "
+                                    "JOIN contents c ON c.oid = f.oid WHERE f.path IN "
+                                    f"({','.join('?' * len(chunk))})", chunk)
+            result.update({paths[path]: json.loads(content) if parsed else content
+                           for path, content, parsed in rows})
+
+        return result
+
+    def add_contents(self,
+                     contents: Iterable[tuple[str, str]]) -> None:
+        r"""Add the YAML contents of blobs.
+
+        The content is loaded with :py:func:`onyo.lib.utils.load_readonly`
+        and stored as JSON. If that is not possible (e.g. the YAML is invalid,
+        or uses features the read-only loader does not support), the YAML text
+        is stored instead.
+
+        Parameters
+        ----------
+        contents
+            Tuples of the object ID of a blob and its YAML content.
+        """
+
+        from onyo.lib.utils import load_readonly
+
+        rows = []
+        for oid, content in contents:
+            documents = load_readonly(content, first=True)
+            if documents is not None and all(isinstance(d, dict) for d in documents):
+                parsed = documents[0] if documents else dict()
+                if _json_compatible(parsed):
+                    rows.append((oid, json.dumps(parsed, ensure_ascii=False, separators=(',', ':')), 1))
+                    continue
+            rows.append((oid, content, 0))
+
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO contents VALUES (?, ?, ?)", rows)
+
+
+def _json_compatible(value) -> bool:
+    r"""Whether JSON represents ``value`` exactly (e.g. all keys are strings)."""
+
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _json_compatible(v) for k, v in value.items())
+    if isinstance(value, list):
+        return all(_json_compatible(v) for v in value)
+    return value is None or isinstance(value, (str, bool, int, float))
+
+
+def _chunks(values: list[str],
+            size: int = 500) -> Iterable[list[str]]:
+    r"""Split ``values`` into chunks small enough for SQLite's variable limit."""
+
+    return (values[i:i + size] for i in range(0, len(values), size))
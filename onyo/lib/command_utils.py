@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections import UserDict
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from onyo.lib.consts import (
     SORT_DESCENDING,
+    TAG_UNSET,
 )
 from onyo.lib.inventory import (
     Inventory,
@@ -16,10 +18,16 @@ from onyo.lib.ui import ui
 
 if TYPE_CHECKING:
     from typing import (
+        Any,
+        Callable,
+        Iterable,
         Sequence,
         Tuple,
     )
-    from onyo.lib.consts import sort_t
+    from onyo.lib.consts import (
+        format_t,
+        sort_t,
+    )
     from onyo.lib.items import Item
 
 log: logging.Logger = logging.getLogger('onyo.command_utils')
@@ -158,37 +166,131 @@ def intersect_index(seq1: Sequence,
     return (None, None)
 
 
-def natural_sort(items: list[Item],
-                 keys: dict[str, sort_t]) -> list[Item]:
+class _Descending(object):
+    r"""Wrap a sort key to invert its order.
+
+    Allows to sort by a composite key that mixes ascending and descending
+    components in a single pass.
+    """
+
+    __slots__ = ('key',)
+
+    def __init__(self,
+                 key: Any) -> None:
+        self.key = key
+
+    def __eq__(self,
+               other: object) -> bool:
+        return self.key == other.key  # pyre-ignore[16]
+
+    def __lt__(self,
+               other: _Descending) -> bool:
+        return other.key < self.key
+
+
+def natural_sort(items: Iterable[Item],
+                 keys: dict[str, sort_t],
+                 limit: int | None = None) -> list[Item]:
     r"""Sort ``items`` according to a list of ``keys``.
 
+    ``items`` are sorted in a single (stable) pass by a composite key, which is
+    computed once per item.
+
     Parameters
     ----------
     items
         Items to sort.
     keys
         Keys to sort ``items`` by.
-    reverse
-        Sort in reverse order.
+    limit
+        Only return the first ``limit`` items. They are selected with a heap,
+        rather than sorting all ``items``.
     """
 
-    import locale
-    import natsort
+    import heapq
+
+    from onyo.lib.utils import natsort_key
+
+    key_funcs = [(key, natsort_key(key), keys[key] == SORT_DESCENDING) for key in keys]
+
+    def composite_key(item: Item) -> tuple:
+        return tuple(_Descending(f(item.get(key))) if descending else f(item.get(key))
+                     for key, f, descending in key_funcs)
+
+    if limit is not None:
+        return heapq.nsmallest(limit, items, key=composite_key)
+
+    return sorted(items, key=composite_key)
+
+
+def _json_default(obj: Any) -> Any:
+    r"""Get a JSON serializable representation of ``obj``.
+
+    A helper for :py:func:`get_row_formatter`.
+    """
+
+    return obj.data if isinstance(obj, UserDict) else str(obj)
+
+
+def get_row_formatter(output_format: format_t,
+                      keys: list[str]) -> Tuple[str | None, Callable[[dict], str]]:
+    r"""Get the header and a formatter of rows to export in ``output_format``.
+
+    Values keep their type: nested dictionaries and lists are included in full
+    (as JSON in ``tsv`` and ``csv``), rather than being replaced by a tag. Keys
+    whose value is :py:data:`onyo.lib.consts.TAG_UNSET` are omitted from
+    ``jsonl`` output, and empty in ``tsv`` and ``csv``.
+
+    A helper for :py:func:`onyo.lib.commands.onyo_get`.
+
+    Parameters
+    ----------
+    output_format
+        One of :py:data:`onyo.lib.consts.OUTPUT_FORMATS`.
+    keys
+        Keys of the rows, in the order to output them.
+
+    Returns
+    -------
+    tuple
+        The header line (``None`` if there is none) and a callable that formats
+        a row (a dictionary of ``keys`` and their values) as a line.
+    """
+
+    import csv
+    import io
+    import json
+
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+    if output_format == 'jsonl':
+        def to_jsonl(row: dict) -> str:
+            return encoder.encode({k: v for k, v in row.items() if v != TAG_UNSET})
+
+        return None, to_jsonl
+
+    def to_cell(value: Any) -> str:
+        if isinstance(value, str):
+            return '' if value == TAG_UNSET else value
+        if value is None:
+            return ''
+        if isinstance(value, (bool, int, float, dict, list, UserDict)):
+            return encoder.encode(value)
+        return str(value)
 
-    from onyo.lib.items import resolve_alias
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, dialect='excel-tab' if output_format == 'tsv' else 'excel', lineterminator='')
 
-    # set the locale for all categories to the user’s default setting
-    locale.setlocale(locale.LC_ALL, '')
+    def to_line(cells: list[str]) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(cells)
+        return buffer.getvalue()
 
-    for key in reversed(keys.keys()):
-        alg = natsort.ns.LOCALE | natsort.ns.INT
-        if resolve_alias(key).startswith('onyo.path'):
-            alg |= natsort.ns.PATH
-        items = sorted(items,
-                       key=natsort.natsort_keygen(key=lambda x: x.get(key), alg=alg),
-                       reverse=keys[key] == SORT_DESCENDING)
+    def to_delimited(row: dict) -> str:
+        return to_line([to_cell(row[k]) for k in keys])
 
-    return items
+    return to_line(keys), to_delimited
 
 
 def print_diff(diffable: Inventory | InventoryOperation) -> None:
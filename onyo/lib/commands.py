@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import subprocess
+from itertools import islice
 from pathlib import Path
 from typing import (
     ParamSpec,
@@ -14,6 +15,7 @@ from rich import box
 from rich.table import Table
 
 from onyo.lib.command_utils import (
+    get_row_formatter,
     inline_path_diff,
     inventory_path_to_yaml,
     natural_sort,
@@ -37,12 +39,17 @@ from onyo.lib.exceptions import (
     PendingInventoryOperationError,
 )
 from onyo.lib.items import (
+    is_pseudo_key,
     Item,
     ItemSpec,
+    resolve_alias,
 )
 from onyo.lib.inventory import Inventory, OPERATIONS_MAPPING
 from onyo.lib.onyo import OnyoRepo
-from onyo.lib.pseudokeys import PSEUDO_KEYS
+from onyo.lib.pseudokeys import (
+    PSEUDO_KEYS,
+    PSEUDOKEY_ALIASES,
+)
 from onyo.lib.ui import ui
 from onyo.lib.utils import (
     deduplicate,
@@ -58,7 +65,10 @@ if TYPE_CHECKING:
         Iterable,
         Literal,
     )
-    from onyo.lib.consts import sort_t
+    from onyo.lib.consts import (
+        format_t,
+        sort_t,
+    )
 
 log: logging.Logger = logging.getLogger('onyo.commands')
 
@@ -180,6 +190,7 @@ def onyo_config(inventory: Inventory,
     # end repo version shim
     subprocess.run(["git", 'config', '-f', str(ONYO_CONFIG)] +
                    config_args, cwd=inventory.repo.git.root, check=True)
+    inventory.repo.clear_config_cache()
 
     if not any(a.startswith('--get') or a == '--list' for a in config_args):
         # commit if there are any changes
@@ -412,7 +423,11 @@ def onyo_get(inventory: Inventory,
              keys: list[str] | None = None,
              sort: dict[str, sort_t] | None = None,
              types: list[Literal['assets', 'directories']] | None = None,
-             ) -> list[dict]:
+             limit: int | None = None,
+             output_format: format_t | None = None,
+             group_by: list[str] | None = None,
+             aggregates: list[tuple[str, str | None]] | None = None,
+             ) -> list[dict] | int:
     r"""Query the key-values of inventory items.
 
     All keys, both on-disk YAML and :py:data:`onyo.lib.pseudokeys.PSEUDO-KEYS`,
@@ -467,6 +482,31 @@ def onyo_get(inventory: Inventory,
         Default is ``['assets']``.
 
         Passed to :py:func:`onyo.lib.inventory.Inventory.get_items`.
+    limit
+        Maximum number of results (after sorting). Default is no limit.
+    output_format
+        Export results in one of :py:data:`onyo.lib.consts.OUTPUT_FORMATS`
+        (see :py:func:`onyo.lib.command_utils.get_row_formatter`) rather than
+        printing them. Values are not replaced with tags. Cannot be combined
+        with ``machine_readable``.
+    group_by
+        Keys to group the matching items by. Rather than the items, one result
+        per group is returned (see :py:class:`onyo.lib.aggregate.Aggregation`).
+        Its keys are ``group_by`` and the names of ``aggregates``. Cannot be
+        combined with ``keys``. ``sort`` defaults to ``group_by`` and must be
+        among the keys of the results.
+    aggregates
+        Pairs of aggregate function (see :py:data:`onyo.lib.aggregate.AGGREGATE_FUNCTIONS`)
+        and key to compute for each group. Default is to count the items of
+        each group. If passed without ``group_by``, all matching items form a
+        single group.
+
+    Returns
+    -------
+    list[dict] | int
+        The results, reduced to the selected keys. If they are printed as they
+        are read (machine-readable or ``output_format`` output sorted by
+        path), they are not kept and only their number is returned.
 
     Raises
     ------
@@ -474,7 +514,7 @@ def onyo_get(inventory: Inventory,
         Invalid argument
     """
 
-    from onyo.lib.consts import TAG_MAP_OUTPUT, TAG_UNSET
+    from onyo.lib.consts import OUTPUT_FORMATS, TAG_MAP_OUTPUT, TAG_UNSET
 
     selected_keys = keys.copy() if keys else None
     include = include or [inventory.root]
@@ -491,35 +531,96 @@ def onyo_get(inventory: Inventory,
     if sort and not all(v in allowed_sorting for k, v in sort.items()):
         raise ValueError(f"Allowed sorting modes: {', '.join(allowed_sorting)}")
 
-    selected_keys = selected_keys or inventory.repo.get_asset_name_keys() + ['onyo.path.relative']
-    results = list(inventory.get_items(include=include,
-                                       exclude=exclude,
-                                       depth=depth,
-                                       match=match,  # pyre-ignore[6]
-                                       types=types))
-
-    # sort results before filtering/replacing, so all keys can be sorted
-    results = natural_sort(
-        items=results,
-        keys=sort or {'onyo.path.relative': SORT_ASCENDING})  # pyre-ignore[6]
-
-    # reduce results to just the `selected_keys`
-    results = [{k: r[k] if k in r else TAG_UNSET
-                for k in selected_keys}
-               for r in results]
-
-    # replace structures with an indication of type.
-    for symbol in TAG_MAP_OUTPUT:
-        results = [{k: symbol if isinstance(v, TAG_MAP_OUTPUT[symbol]) else v
-                    for k, v in r.items()}
-                   for r in results]
-
-    if machine_readable:
-        sep = '\t'
-        for data in results:
-            values = sep.join([str(data[k]) for k in selected_keys])
-            ui.print(f'{values}')
+    if limit is not None and limit < 0:
+        raise ValueError("The limit of results must not be negative.")
+
+    if output_format and output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Allowed output formats: {', '.join(OUTPUT_FORMATS)}")
+
+    if output_format and machine_readable:
+        raise ValueError("An output format cannot be combined with machine-readable output.")
+
+    aggregation = None
+    if group_by or aggregates:
+        from onyo.lib.aggregate import Aggregation
+
+        if keys:
+            raise ValueError("Keys cannot be selected when aggregating. The results are the groups and aggregates.")
+        aggregation = Aggregation(group_by=group_by, aggregates=aggregates)
+        sort = sort or {k: SORT_ASCENDING for k in aggregation.group_by}
+        if not all(k in aggregation.columns for k in sort):
+            raise ValueError(f"Aggregated results can only be sorted by: {', '.join(aggregation.columns)}")
+        selected_keys = aggregation.columns
+        query_keys = aggregation.group_by + [k for _, k in aggregation.aggregates if k]
+    else:
+        selected_keys = selected_keys or inventory.repo.get_asset_name_keys() + ['onyo.path.relative']
+        sort = sort or {'onyo.path.relative': SORT_ASCENDING}
+        query_keys = selected_keys + list(sort.keys())
+
+    # Asset contents are only loaded if needed. Filters on content keys load
+    # them while collecting items, so that invalid assets are reported there.
+    lazy = all(is_pseudo_key(k, alias_map=PSEUDOKEY_ALIASES) for k in query_keys)
+    # Paths are unique, so sorting by path first decides the order alone. The
+    # paths can be sorted before reading any item, and machine-readable output
+    # can be printed as the items are read.
+    sort_key, sort_order = next(iter(sort.items()), (None, None))
+    stream = (machine_readable or bool(output_format)) and not aggregation and \
+        resolve_alias(sort_key, alias_map=PSEUDOKEY_ALIASES) == 'onyo.path.relative'  # pyre-ignore[6]
+    items = inventory.get_items(include=include,
+                                exclude=exclude,
+                                depth=depth,
+                                match=match,  # pyre-ignore[6]
+                                types=types,
+                                readonly=True,
+                                lazy=lazy,
+                                path_order=sort_order if stream else None)
+    if aggregation:
+        # Items are aggregated as they are read; only the groups are sorted.
+        items = natural_sort(items=aggregation(items), keys=sort, limit=limit)  # pyre-ignore[6]
+    elif stream:
+        items = islice(items, limit)
     else:
+        # sort results before filtering/replacing, so all keys can be sorted
+        items = natural_sort(items=items, keys=sort, limit=limit)  # pyre-ignore[6]
+
+    def reduce(item: Item | dict) -> dict:
+        # reduce to just the `selected_keys`, and replace structures with an
+        # indication of type.
+        data = dict()
+        for k in selected_keys:
+            v = item[k] if k in item else TAG_UNSET
+            if not output_format:
+                for symbol, types_ in TAG_MAP_OUTPUT.items():
+                    if isinstance(v, types_):
+                        v = symbol
+                        break
+            data[k] = v
+        return data
+
+    if output_format:
+        header, to_line = get_row_formatter(output_format, selected_keys)  # pyre-ignore[6]
+        if header is not None:
+            ui.print(header)
+    else:
+        def to_line(data: dict) -> str:
+            return '\t'.join([str(data[k]) for k in selected_keys])
+
+    if stream:
+        # memory stays constant; nothing is kept but the count
+        count = 0
+        for item in items:
+            ui.print(to_line(reduce(item)))
+            count += 1
+        return count
+
+    results = []
+    for item in items:
+        data = reduce(item)
+        results.append(data)
+        if machine_readable or output_format:
+            ui.print(to_line(data))
+
+    if not (machine_readable or output_format):
         if results:
             table = Table(
                 box=box.HORIZONTALS, title='', show_header=True,
@@ -617,6 +718,48 @@ def _get_history_cmd(inventory: Inventory,
     return history_cmd
 
 
+def onyo_maintenance(repo: OnyoRepo,
+                     tasks: list[str] | None = None) -> list[dict]:
+    r"""Optimize the repository and refresh Onyo's caches, and report the effect.
+
+    The following tasks are available:
+
+    * ``commit-graph``: write git's commit-graph with changed-path Bloom filters
+    * ``repack``: pack all objects into a single pack with a reachability bitmap
+    * ``caches``: refresh Onyo's indexes and caches
+
+    See :py:func:`onyo.lib.onyo.OnyoRepo.maintenance`.
+
+    Parameters
+    ----------
+    repo
+        The repository to maintain.
+    tasks
+        A list of tasks to run. By default, all tasks are run.
+
+    Raises
+    ------
+    ValueError
+        A specified task does not exist.
+    """
+
+    results = repo.maintenance(tasks)
+
+    table = Table(
+        box=box.HORIZONTALS, title='', show_header=True,
+        header_style='bold')
+    for column in ['task', 'time', 'measure', 'before', 'after']:
+        table.add_column(column, overflow='fold')
+    for result in results:
+        time = f"{result['time']:.2f}s"
+        for measure, before in result['before'].items():
+            table.add_row(result['task'], time, measure, str(before), str(result['after'][measure]))
+            time = ''
+    ui.rich_print(table)
+
+    return results
+
+
 @raise_on_inventory_state
 def onyo_mkdir(inventory: Inventory,
                dirs: list[Path],
@@ -1345,7 +1488,7 @@ def onyo_tsv_to_yaml(tsv: Path) -> None:
     import csv
     from io import StringIO
 
-    from onyo.lib.utils import get_patched_yaml
+    from onyo.lib.utils import patched_yaml
 
     dicts = []
     with tsv.open('r', newline='') as tsv_file:
@@ -1368,11 +1511,10 @@ def onyo_tsv_to_yaml(tsv: Path) -> None:
                 raise ValueError(f"Values exceed number of columns in {str(tsv)} at line {i}: {d[None]}")
 
     # build YAML stream
-    yaml = get_patched_yaml()
-    yaml.explicit_start = True
     s = StringIO()
-    for d in dicts:
-        yaml.dump(d.data, s)
+    with patched_yaml() as yaml:
+        for d in dicts:
+            yaml.dump(d.data, s)
 
     ui.print(s.getvalue(), end='')
 
@@ -8,6 +8,7 @@ from onyo.lib.pseudokeys import PSEUDOKEY_ALIASES
 if TYPE_CHECKING:
     from typing import Literal
     sort_t = Literal['ascending', 'descending']
+    format_t = Literal['jsonl', 'tsv', 'csv']
 
 
 RESERVED_KEYS = ['template', 'onyo'] + list(PSEUDOKEY_ALIASES.keys())
@@ -25,6 +26,14 @@ Use for backwards compatibility, upgrades, and detecting repositories created by
 a newer version.
 """
 
+OUTPUT_FORMATS = ['jsonl', 'tsv', 'csv']
+r"""Formats to export the output of :py:func:`onyo_get` in.
+
+- ``jsonl``: one JSON object per line (JSON Lines)
+- ``tsv``: tab-separated values with a header line
+- ``csv``: comma-separated values with a header line
+"""
+
 SORT_ASCENDING = 'ascending'
 r"""Sort ascending.
 
@@ -124,6 +133,15 @@ r"""Path of the Onyo config file."""
 TEMPLATE_DIR = ONYO_DIR / 'templates'
 r"""Path of the directory that stores templates."""
 
+GIT_CACHE_DIR = Path('onyo')
+r"""Path of the directory (relative to the ``.git`` directory) that stores Onyo's local caches."""
+
+MAINTENANCE_TASKS = ['commit-graph', 'repack', 'caches']
+r"""Tasks of :py:func:`onyo.lib.onyo.OnyoRepo.maintenance`, in order of execution."""
+
+MAINTENANCE_AUTO_TASKS = ['commit-graph', 'caches']
+r"""Tasks of :py:func:`onyo.lib.onyo.OnyoRepo.maintenance` run automatically after a commit (see ``onyo.maintenance.auto``)."""
+
 ANCHOR_FILE_NAME = '.anchor'
 r"""Name of the empty file created in all directories to "anchor" them.
 
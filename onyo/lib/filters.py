@@ -8,18 +8,21 @@ from dataclasses import (
 from typing import TYPE_CHECKING
 
 from onyo.lib.consts import (
-    SORT_DESCENDING,
     TAG_MAP_TYPES,
     TAG_EMPTY,
     TAG_UNSET,
     TAG_MAP_VALUES,
 )
 from onyo.lib.exceptions import OnyoInvalidFilterError
-from onyo.lib.items import Item
-from onyo.lib.command_utils import natural_sort
+from onyo.lib.utils import natsort_key
 
 if TYPE_CHECKING:
-    from typing import Tuple
+    from typing import (
+        Callable,
+        Tuple,
+    )
+
+    from onyo.lib.items import Item
 
 
 @dataclass
@@ -40,14 +43,19 @@ class Filter:
     key: str = field(init=False)
     value: str = field(init=False)
     operator: str = field(init=False)
+    _predicate: Callable[[Item], bool] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         r"""Set up a ``key=value`` conditional as a filter.
 
         ``value`` must be a valid Python regular expression.
+
+        The conditional is compiled once into a predicate, so that matching an
+        Item does not need to parse ``value`` again.
         """
 
         self.key, self.operator, self.value = self._format(self._arg)
+        self._predicate = self._compile()
 
     @staticmethod
     def _format(arg: str) -> Tuple[str, str, str]:
@@ -94,239 +102,197 @@ class Filter:
 
         return key, operator, value
 
-    @staticmethod
-    def _re_match(text: str,
-                  r: str) -> bool:
-        r"""Does a whole string fully match a regular expression pattern.
-
-        Parameters
-        ----------
-        text
-            String to match
-        r
-            Regular expression Pattern
-        """
-
-        try:
-            return True if re.compile(r).fullmatch(text) else False
-        except re.error:
-            return False
-
-    def _tags_or_types_match(self,
-                             item: Item) -> bool:
-        r"""Whether the tags or types of ``self.value`` equals ``Item[self.key]``.
+    def _compile_tags_or_types_match(self) -> Callable[[Item], bool] | None:
+        r"""Compile whether the tags or types of ``self.value`` equals ``Item[self.key]``.
 
-        Parameters
-        ----------
-        item
-            Item to compare against.
+        The returned predicate raises ``KeyError`` if ``self.key`` is not in the
+        item (and ``self.value`` is not ``<unset>``).
 
-        Raises
-        ------
-        KeyError
-            ``self.key`` is not in ``item`` (and ``self.value`` is not ``<unset>``)
-        ValueError
-            ``self.key`` is not a tag or empty literal.
+        Returns
+        -------
+        Callable[[Item], bool] | None
+            The predicate. ``None`` if ``self.value`` is not a tag or empty
+            literal.
         """
 
-        if self.value == TAG_UNSET:
-            # match if the key is not present
-            return self.key not in item
-
-        if self.key not in item:
-            # we can't match anything other than TAG_UNSET, if key is not present
-            raise KeyError
+        key = self.key
+        value = self.value
 
-        item_value = item[self.key]
+        if value == TAG_UNSET:
+            # match if the key is not present
+            return lambda item: key not in item
 
         # onyo type representation match (<list>, <dict>, etc)
-        if self.value in TAG_MAP_TYPES:
-            return isinstance(item_value, TAG_MAP_TYPES[self.value])
+        if value in TAG_MAP_TYPES:
+            types = TAG_MAP_TYPES[value]
+            return lambda item: isinstance(item[key], types)
 
         # onyo value representation match (<false>, <null>, <true>, etc)
-        if self.value in TAG_MAP_VALUES:
-            return item_value is TAG_MAP_VALUES[self.value]
+        if value in TAG_MAP_VALUES:
+            obj = TAG_MAP_VALUES[value]
+            return lambda item: item[key] is obj
 
         # <empty> is special
-        if self.value == TAG_EMPTY:
-            return any(item_value == x for x in [None, '', [], {}])
+        if value == TAG_EMPTY:
+            return lambda item: any(item[key] == x for x in [None, '', [], {}])
 
         # literal empty structure representations
-        match self.value:
+        match value:
             case '[]' | '{}':
-                return str(item_value) == self.value
+                return lambda item: str(item[key]) == value
             case '""' | "''":
-                return str(item_value) == ''
+                return lambda item: str(item[key]) == ''
 
-        raise ValueError
+        return None
 
-    def _match_equal(self,
-                     item: Item) -> bool:
-        r"""Whether ``self.value`` equals ``Item[self.key]``.
-
-        Parameters
-        ----------
-        item
-            Item to compare against.
-        """
+    def _compile_equal(self) -> Callable[[Item], bool]:
+        r"""Compile whether ``self.value`` equals ``Item[self.key]``."""
 
-        try:
-            return self._tags_or_types_match(item)
-        except ValueError:
-            # not a tag or empty type literal
-            return item[self.key] == self.value
+        key = self.key
+        value = self.value
 
-    def _match_equal_with_re(self,
-                             item: Item) -> bool:
-        r"""Whether ``self.value`` equals ``Item[self.key]``.
+        return self._compile_tags_or_types_match() or (lambda item: item[key] == value)
 
-        Regex is supported.
+    def _compile_equal_with_re(self) -> Callable[[Item], bool]:
+        r"""Compile whether ``self.value`` equals ``Item[self.key]``.
 
-        Parameters
-        ----------
-        item
-            Item to compare against.
+        Regex is supported. The pattern is compiled once. An invalid pattern
+        does not match anything.
         """
 
+        tags_or_types_match = self._compile_tags_or_types_match()
+        if tags_or_types_match:
+            return tags_or_types_match
+
+        key = self.key
+        value = self.value
         try:
-            return self._tags_or_types_match(item)
-        except ValueError:
-            # not a tag or empty type literal
-            item_value = item[self.key]
-            return item_value == self.value or self._re_match(str(item_value), self.value)
+            pattern = re.compile(value)
+        except re.error:
+            return lambda item: item[key] == value
 
-    def _match_not_equal(self,
-                     item: Item) -> bool:
-        r"""Whether ``self.value`` does not equal ``Item[self.key]``.
+        def equal_with_re(item: Item) -> bool:
+            item_value = item[key]
+            return item_value == value or pattern.fullmatch(str(item_value)) is not None
 
-        Regex is supported.
+        return equal_with_re
 
-        Parameters
-        ----------
-        item
-            Item to compare against.
+    def _compile_not_equal(self) -> Callable[[Item], bool]:
+        r"""Compile whether ``self.value`` does not equal ``Item[self.key]``.
+
+        Regex is supported.
         """
 
-        return not self._match_equal_with_re(item)
+        equal_with_re = self._compile_equal_with_re()
+        return lambda item: not equal_with_re(item)
 
-    def _match_greater_than(self,
-                            item: Item) -> bool:
-        r"""Whether ``self.value`` is > ``Item[self.key]``.
+    def _compile_greater_than(self) -> Callable[[Item], bool]:
+        r"""Compile whether ``self.value`` is > ``Item[self.key]``.
 
-        A natural sort is used (i.e. '300' > '5').
+        A natural sort is used (i.e. '300' > '5'). The sort key of
+        ``self.value`` is computed once.
 
-        Parameters
-        ----------
-        item
-            Item to compare against.
-
-        Raises
-        ------
-        KeyError
-            ``self.key`` is not in ``item`` (and ``self.value`` is not ``<unset>``)
-        ValueError
-            Comparison is not possible (e.g. across types/tags)
+        The returned predicate raises ``KeyError`` if ``self.key`` is not in the
+        item, and ``ValueError`` if the comparison is not possible (e.g. across
+        types/tags).
         """
 
+        key = self.key
+
         if self.value in [*TAG_MAP_TYPES, *TAG_MAP_VALUES, TAG_EMPTY, TAG_UNSET]:
             # type comparisons are not possible
-            raise ValueError
-
-        if self.key not in item:
-            # comparison with nothing is not possible
-            raise KeyError
+            def not_comparable(item: Item) -> bool:
+                raise ValueError
 
-        item_value = item[self.key]
+            return not_comparable
 
         # literal empty structures ([], {})
         empty_structs = {'[]': list, '{}': dict, '""': str, "''": str}
         if self.value in empty_structs:
-            if isinstance(item_value, empty_structs[self.value]):
-                # an non-empty dict/list/string is indeed greater than an empty one
-                return bool(item_value)
-            else:
+            struct = empty_structs[self.value]
+
+            def greater_than_empty(item: Item) -> bool:
+                item_value = item[key]
+                if isinstance(item_value, struct):
+                    # an non-empty dict/list/string is indeed greater than an empty one
+                    return bool(item_value)
+
                 # comparison is not possible
                 raise ValueError
 
-        # ``item`` is intentionally put second in the list, so that it will stay
-        # in place when the compared key values match, and only move up when
-        # it's indeed greater.
-        item_list = [
-            Item({self.key: self.value}),
-            item,
-        ]
-        keys = {
-            self.key: SORT_DESCENDING,
-        }
-        sorted_item_list = natural_sort(item_list, keys=keys)  # pyre-ignore[6]
+            return greater_than_empty
 
-        return sorted_item_list[0] == item
+        sort_key = natsort_key(key)
+        value_key = sort_key(self.value)
+        # matching values are not greater
+        return lambda item: sort_key(item[key]) > value_key
 
-    def _match_greater_than_or_equal(self,
-                                     item: Item) -> bool:
-        r"""Whether ``self.value`` is >= ``Item[self.key]``.
+    def _compile_greater_than_or_equal(self) -> Callable[[Item], bool]:
+        r"""Compile whether ``self.value`` is >= ``Item[self.key]``.
 
         A natural sort is used (i.e. '300' > '5').
-
-        Parameters
-        ----------
-        item
-            Item to compare against.
-
-        Raises
-        ------
-        ValueError
-            Comparison is not possible (e.g. across types/tags)
         """
 
+        equal = self._compile_equal()
+        greater_than = self._compile_greater_than()
+
         if self.value in [*TAG_MAP_TYPES, *TAG_MAP_VALUES, TAG_EMPTY, TAG_UNSET]:
             # type comparisons are not possible
-            raise ValueError
+            return greater_than
 
-        if self._match_equal(item):
-            return True
+        return lambda item: equal(item) or greater_than(item)
 
-        return self._match_greater_than(item)
-
-    def _match_less_than(self,
-                         item: Item) -> bool:
-        r"""Whether ``self.value`` is < ``Item[self.key]``.
+    def _compile_less_than(self) -> Callable[[Item], bool]:
+        r"""Compile whether ``self.value`` is < ``Item[self.key]``.
 
         A natural sort is used (i.e. '5' < '300').
-
-        Parameters
-        ----------
-        item
-            Item to compare against.
         """
 
-        return not self._match_greater_than_or_equal(item)
+        greater_than_or_equal = self._compile_greater_than_or_equal()
+        return lambda item: not greater_than_or_equal(item)
 
-    def _match_less_than_or_equal(self,
-                                  item: Item) -> bool:
-        r"""Whether ``self.value`` is <= ``Item[self.key]``.
+    def _compile_less_than_or_equal(self) -> Callable[[Item], bool]:
+        r"""Compile whether ``self.value`` is <= ``Item[self.key]``.
 
         A natural sort is used (i.e. '5' < '300').
-
-        Parameters
-        ----------
-        item
-            Item to compare against.
-
-        Raises
-        ------
-        ValueError
-            Comparison is not possible (e.g. across types/tags)
         """
 
+        equal = self._compile_equal()
+        greater_than = self._compile_greater_than()
+
         if self.value in [*TAG_MAP_TYPES, *TAG_MAP_VALUES, TAG_EMPTY, TAG_UNSET]:
             # type comparisons are not possible
-            raise ValueError
+            return greater_than
+
+        return lambda item: equal(item) or not greater_than(item)
 
-        if self._match_equal(item):
-            return True
+    def _compile(self) -> Callable[[Item], bool]:
+        r"""Compile this ``Filter`` into a predicate specialized for its operator and value.
+
+        The predicate may raise ``KeyError`` or ``ValueError`` when the question
+        makes no sense.
+
+        Raises
+        ------
+        OnyoInvalidFilterError
+            No valid operator was found.
+        """
 
-        return not self._match_greater_than(item)
+        match self.operator:
+            case "=":
+                return self._compile_equal_with_re()
+            case "!=":
+                return self._compile_not_equal()
+            case ">":
+                return self._compile_greater_than()
+            case ">=":
+                return self._compile_greater_than_or_equal()
+            case "<":
+                return self._compile_less_than()
+            case "<=":
+                return self._compile_less_than_or_equal()
+            case _:
+                raise OnyoInvalidFilterError
 
     def match(self,
               item: Item) -> bool:
@@ -336,29 +302,10 @@ class Filter:
         ----------
         item
             Item to match against.
-
-        Raises
-        ------
-        OnyoInvalidFilterError
-            No valid operator was found.
         """
 
         try:
-            match self.operator:
-                case "=":
-                    return self._match_equal_with_re(item)
-                case "!=":
-                    return self._match_not_equal(item)
-                case ">":
-                    return self._match_greater_than(item)
-                case ">=":
-                    return self._match_greater_than_or_equal(item)
-                case "<":
-                    return self._match_less_than(item)
-                case "<=":
-                    return self._match_less_than_or_equal(item)
-                case _:
-                    raise OnyoInvalidFilterError
+            return self._predicate(item)
         except (KeyError, ValueError):
             # when the question makes no sense, return False
             return False
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import subprocess
 from pathlib import Path
@@ -12,13 +13,201 @@ from onyo.lib.ui import ui
 
 if TYPE_CHECKING:
     from typing import (
+        IO,
         Generator,
         Iterable,
         Literal,
     )
+    fast_import_change_t = tuple[str, Path] | tuple[str, Path, Path] | tuple[str, Path, bytes]
 
 log: logging.Logger = logging.getLogger('onyo.git')
 
+_LOG_FIELD_SEPARATOR = '\x1f'
+r"""Separator of the fields of a commit in :py:data:`_LOG_FORMAT` (ASCII unit separator)."""
+
+_LOG_FORMAT = '%x1f'.join(['%H', '%an', '%ae', '%cn', '%ce', '%cI', '%B'])
+r"""``git log --pretty`` format of :py:func:`GitRepo.history`. The message comes last, so it may contain the separator."""
+
+_LOG_READ_SIZE = 65536
+r"""Maximum number of bytes read from ``git log`` at once by :py:func:`GitRepo.history`."""
+
+
+def _cleanup_message(message: str) -> str:
+    r"""Clean up a commit message the way ``git commit --cleanup=whitespace`` does.
+
+    Trailing whitespace is stripped from every line, consecutive empty lines are
+    collapsed, and leading and trailing empty lines are removed.
+
+    Parameters
+    ----------
+    message
+        The commit message.
+    """
+
+    lines = []
+    for line in message.splitlines():
+        line = line.rstrip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+
+    while lines and not lines[-1]:
+        lines.pop()
+
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _quote_path(path: str) -> bytes:
+    r"""Quote a path for ``git fast-import`` (as a C-style string).
+
+    Parameters
+    ----------
+    path
+        Path relative to the root of the repository, in POSIX notation.
+    """
+
+    escaped = path.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{escaped}"'.encode()
+
+
+class GitCatFile(object):
+    r"""A long-lived ``git cat-file --batch`` (or ``--batch-check``) process.
+
+    Objects are requested over a single pipe, rather than starting a new
+    ``git`` process per object. Requests are written in chunks and the
+    responses are read back before the next chunk is sent. This keeps the
+    pipes from filling up and blocking either side.
+
+    The process is started on first use and stays alive until :py:func:`close`
+    is called (which happens automatically at interpreter exit).
+    """
+
+    CHUNK_SIZE: int = 16384
+    r"""Maximum number of bytes of object names to send before reading responses.
+
+    Must stay well below the OS's pipe buffer size.
+    """
+
+    def __init__(self,
+                 root: Path,
+                 check: bool = False) -> None:
+        r"""Instantiate a ``GitCatFile`` for the repository at ``root``.
+
+        Parameters
+        ----------
+        root
+            The absolute Path of the root of the git repository.
+        check
+            Use ``--batch-check`` (object information only) instead of
+            ``--batch`` (object information and content).
+        """
+
+        self.root = root
+        self.check = check
+        self._process: subprocess.Popen | None = None
+
+    def __deepcopy__(self,
+                     memo: dict) -> GitCatFile:
+        r"""Copy without the running process, which a copy starts on its own demand."""
+
+        return GitCatFile(self.root, check=self.check)
+
+    def _start(self) -> subprocess.Popen:
+        r"""Start the ``git cat-file`` process, if it is not already running."""
+
+        if self._process is None or self._process.poll() is not None:
+            mode = '--batch-check' if self.check else '--batch'
+            ui.log_debug(f"Starting 'git cat-file {mode} -z'")
+            self._process = subprocess.Popen(['git', 'cat-file', mode, '-z'],
+                                             cwd=self.root,
+                                             stdin=subprocess.PIPE,
+                                             stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL)
+            atexit.register(self.close)
+
+        return self._process
+
+    def close(self) -> None:
+        r"""Shut down the ``git cat-file`` process."""
+
+        if self._process is None:
+            return
+
+        process = self._process
+        self._process = None
+        atexit.unregister(self.close)
+        try:
+            process.stdin.close()  # pyre-ignore[16]
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            process.stdout.close()  # pyre-ignore[16]
+
+    def _read_response(self,
+                       process: subprocess.Popen) -> tuple[str, str, bytes | None] | None:
+        r"""Read the response of a single object from ``process``.
+
+        Returns ``None`` for missing (or ambiguous) objects and otherwise the
+        object ID, the object type, and (unless in check mode) the content.
+        """
+
+        header = process.stdout.readline()  # pyre-ignore[16]
+        if not header:
+            raise RuntimeError("'git cat-file' exited unexpectedly.")
+
+        # '<name> missing' or '<name> ambiguous'; the name may contain spaces
+        if header.endswith((b' missing\n', b' ambiguous\n')):
+            return None
+
+        oid, obj_type, size = header.decode().rstrip('\n').rsplit(' ', 2)
+        content = None
+        if not self.check:
+            content = process.stdout.read(int(size))  # pyre-ignore[16]
+            process.stdout.read(1)  # trailing newline  # pyre-ignore[16]
+
+        return oid, obj_type, content
+
+    def query(self,
+              objects: Iterable[str]) -> Generator[tuple[str, tuple[str, str, bytes | None] | None], None, None]:
+        r"""Yield the response for each object in ``objects``.
+
+        Responses are yielded in the order of ``objects``, as tuples of the
+        requested name and either ``None`` (the object does not exist) or a
+        tuple of object ID, object type and content (``None`` in check mode).
+
+        Parameters
+        ----------
+        objects
+            Object names to look up. Anything accepted by ``git cat-file``
+            (e.g. an object ID or ``HEAD:<path>``).
+        """
+
+        process = self._start()
+        chunk = []
+        chunk_size = 0
+        for name in objects:
+            chunk.append(name)
+            chunk_size += len(name) + 1
+            if chunk_size >= self.CHUNK_SIZE:
+                yield from self._query_chunk(process, chunk)
+                chunk = []
+                chunk_size = 0
+
+        if chunk:
+            yield from self._query_chunk(process, chunk)
+
+    def _query_chunk(self,
+                     process: subprocess.Popen,
+                     chunk: list[str]) -> Generator[tuple[str, tuple[str, str, bytes | None] | None], None, None]:
+        r"""Send a chunk of object names and yield their responses."""
+
+        process.stdin.write(b''.join(n.encode() + b'\0' for n in chunk))  # pyre-ignore[16]
+        process.stdin.flush()  # pyre-ignore[16]
+        # all responses must be consumed, even if the caller stops iterating
+        responses = [(name, self._read_response(process)) for name in chunk]
+        yield from responses
+
 
 class GitRepo(object):
     r"""Representation of a Git repository.
@@ -31,6 +220,9 @@ class GitRepo(object):
     ----------
     root
         The absolute Path of the root of the git repository.
+    cache_epoch
+        Counter that is incremented whenever the cache is cleared. Allows
+        dependent caches to detect that they are outdated.
     """
 
     def __init__(self,
@@ -50,6 +242,10 @@ class GitRepo(object):
 
         self.root = GitRepo.find_root(path) if find_root else path.resolve()
         self._files: list[Path] | None = None
+        self.cache_epoch: int = 0
+        self._git_dir: Path | None = None
+        self._cat_file: GitCatFile | None = None
+        self._cat_file_check: GitCatFile | None = None
 
     @staticmethod
     def find_root(path: Path) -> Path:
@@ -81,7 +277,9 @@ class GitRepo(object):
     def _git(self,
              args: list[str], *,
              cwd: Path | None = None,
-             raise_error: bool = True) -> str:
+             raise_error: bool = True,
+             input: str | None = None,
+             env: dict[str, str] | None = None) -> str:
         r"""Run git commands and return the output.
 
         Parameters
@@ -95,13 +293,20 @@ class GitRepo(object):
         raise_error
             Raise :py:exc:`subprocess.CalledProcessError` if the command returns
             with a non-zero exit code.
+        input
+            String to pass to the command's stdin.
+        env
+            Environment variables to set in addition to the current environment.
         """
 
+        import os
+
         cwd = cwd or self.root
         ui.log_debug(f"Running 'git {' '.join(args)}'")
         ret = subprocess.run(["git"] + args,
                              cwd=cwd, check=raise_error,
-                             capture_output=True, text=True)
+                             capture_output=True, text=True, input=input,
+                             env={**os.environ, **env} if env else None)
 
         return ret.stdout
 
@@ -126,6 +331,7 @@ class GitRepo(object):
         """
 
         self._files = None
+        self.cache_epoch += 1
 
     def get_files(self,
                   paths: Iterable[Path] | None = None) -> list[Path]:
@@ -156,6 +362,215 @@ class GitRepo(object):
         files = [self.root / x for x in tree.split('\0') if x]
         return files
 
+    def get_changes(self,
+                    base: str,
+                    target: str = 'HEAD') -> list[tuple[str, Path]]:
+        r"""Get the files changed between two commits.
+
+        Renames are reported as a deletion and an addition.
+
+        Parameters
+        ----------
+        base
+            The commit-ish to compare from.
+        target
+            The commit-ish to compare to.
+
+        Returns
+        -------
+        list
+            Tuples of the status letter (e.g. ``'A'``, ``'D'``, ``'M'``) and the
+            absolute Path of each changed file.
+        """
+
+        output = self._git(['diff-tree', '-r', '--no-renames', '--name-status', '-z', base, target])
+        fields = output.split('\0')
+        return [(status, self.root / path)
+                for status, path in zip(fields[0::2], fields[1::2])
+                if status]
+
+    def get_blob_ids(self,
+                     commitish: str = 'HEAD') -> dict[Path, str]:
+        r"""Get the blob object IDs of all files of a commit.
+
+        Parameters
+        ----------
+        commitish
+            The commit-ish to list the files of.
+
+        Returns
+        -------
+        dict
+            Mapping of the absolute Path of each file to its blob's object ID.
+        """
+
+        output = self._git(['ls-tree', '-r', '--full-tree', '-z', commitish])
+        blobs = {}
+        for entry in output.split('\0'):
+            if not entry:
+                continue
+            info, path = entry.split('\t', 1)
+            _, obj_type, oid = info.split()
+            if obj_type == 'blob':
+                blobs[self.root / path] = oid
+
+        return blobs
+
+    def get_blob_changes(self,
+                         base: str,
+                         target: str = 'HEAD') -> list[tuple[Path, str | None]]:
+        r"""Get the files changed between two commits, along with their new blob object IDs.
+
+        Renames are reported as a deletion and an addition.
+
+        Parameters
+        ----------
+        base
+            The commit-ish to compare from.
+        target
+            The commit-ish to compare to.
+
+        Returns
+        -------
+        list
+            Tuples of the absolute Path of each changed file and the object ID
+            of its blob in ``target`` (``None`` if it was deleted).
+        """
+
+        output = self._git(['diff-tree', '-r', '--no-renames', '-z', base, target])
+        fields = output.split('\0')
+        changes = []
+        for info, path in zip(fields[0::2], fields[1::2]):
+            if not info:
+                continue
+            # ':<old mode> <new mode> <old oid> <new oid> <status>'
+            _, _, _, oid, status = info.split()
+            changes.append((self.root / path, None if status == 'D' else oid))
+
+        return changes
+
+    def get_commit_files(self,
+                         commits: list[str]) -> dict[str, list[Path]]:
+        r"""Get the files changed by each of several commits.
+
+        All commits are compared to their first parent in a single call of
+        ``git diff-tree``. Renames are reported as a deletion and an addition.
+        Merge commits are reported without changes.
+
+        Parameters
+        ----------
+        commits
+            The hexshas of the commits.
+
+        Returns
+        -------
+        dict
+            Mapping of each hexsha to the absolute Paths of the files it changed.
+        """
+
+        files = {c: [] for c in commits}
+        if not commits:
+            return files
+
+        output = self._git(['diff-tree', '--stdin', '-r', '--root', '--no-renames', '--name-only', '-z'],
+                           input='\n'.join(commits) + '\n')
+        # each commit's hexsha is followed by the paths it changed
+        current = None
+        for field in output.split('\0'):
+            if field in files:
+                current = field
+            elif field and current:
+                files[current].append(self.root / field)
+
+        return files
+
+    def close(self) -> None:
+        r"""Shut down any long-lived ``git`` processes owned by this instance.
+
+        They are restarted on demand, so the object remains usable afterwards.
+        """
+
+        for cat_file in (self._cat_file, self._cat_file_check):
+            if cat_file:
+                cat_file.close()
+
+    def read_objects(self,
+                     objects: Iterable[str]) -> Generator[tuple[str, bytes | None], None, None]:
+        r"""Yield the content of git objects.
+
+        All objects are streamed through a single, persistent
+        ``git cat-file --batch`` process.
+
+        Parameters
+        ----------
+        objects
+            Object names (e.g. an object ID or ``HEAD:<path>``) to read.
+
+        Returns
+        -------
+        Generator
+            Tuples of the requested name and the object's content, or ``None``
+            if the object does not exist. In the order of ``objects``.
+        """
+
+        if self._cat_file is None:
+            self._cat_file = GitCatFile(self.root)
+
+        for name, response in self._cat_file.query(objects):
+            yield name, response[2] if response else None
+
+    def get_object_ids(self,
+                       objects: Iterable[str]) -> Generator[tuple[str, str | None], None, None]:
+        r"""Yield the object IDs of git objects.
+
+        All objects are resolved through a single, persistent
+        ``git cat-file --batch-check`` process.
+
+        Parameters
+        ----------
+        objects
+            Object names (e.g. ``HEAD:<path>``) to resolve.
+
+        Returns
+        -------
+        Generator
+            Tuples of the requested name and the object ID, or ``None`` if the
+            object does not exist. In the order of ``objects``.
+        """
+
+        if self._cat_file_check is None:
+            self._cat_file_check = GitCatFile(self.root, check=True)
+
+        for name, response in self._cat_file_check.query(objects):
+            yield name, response[0] if response else None
+
+    def read_files(self,
+                   paths: Iterable[Path],
+                   commitish: str = 'HEAD') -> Generator[tuple[Path, str | None], None, None]:
+        r"""Yield the committed content of files.
+
+        Reads the blobs from the object store rather than the worktree. Use
+        :py:func:`is_clean_worktree` to determine whether they are the same.
+
+        Parameters
+        ----------
+        paths
+            Absolute Paths of files to read.
+        commitish
+            The commit to read the files from.
+
+        Returns
+        -------
+        Generator
+            Tuples of the Path and its decoded content, or ``None`` if the file
+            is not tracked in ``commitish``. In the order of ``paths``.
+        """
+
+        paths = list(paths)
+        names = (f"{commitish}:{p.relative_to(self.root).as_posix()}" for p in paths)
+        for path, (_, content) in zip(paths, self.read_objects(names)):
+            yield path, content.decode() if content is not None else None
+
     def is_clean_worktree(self) -> bool:
         r"""Whether the git worktree is clean."""
 
@@ -175,15 +590,27 @@ class GitRepo(object):
 
     def commit(self,
                paths: Iterable[Path] | Path,
-               message: str) -> None:
+               message: str,
+               engine: Literal['porcelain', 'plumbing'] = 'porcelain') -> None:
         r"""Stage and commit changes in git.
 
         Parameters
         ----------
         paths
-            Paths to commit.
+            Paths to commit. Directories include all files underneath them.
         message
             The git commit message.
+        engine
+            ``'porcelain'`` uses ``git add`` and ``git commit``. ``'plumbing'``
+            writes the commit without matching pathspecs against the entire
+            index (see :py:func:`_commit_plumbing`).
+
+        Raises
+        ------
+        ValueError
+            ``engine`` is invalid.
+        subprocess.CalledProcessError
+            Committing failed. This includes that there is nothing to commit.
         """
 
         from onyo.lib.utils import get_temp_file
@@ -191,6 +618,13 @@ class GitRepo(object):
         if isinstance(paths, Path):
             paths = [paths]
 
+        if engine == 'plumbing':
+            self._commit_plumbing(list(paths), message)
+            self.clear_cache()
+            return
+        if engine != 'porcelain':
+            raise ValueError(f"Invalid commit engine '{engine}'. Valid options are: porcelain, plumbing")
+
         # Pass paths and message as files to avoid exceeding the OS's maximum
         # command and argument length.
         # Detecting this accurately cross-platform is buggy and complicated for
@@ -211,6 +645,215 @@ class GitRepo(object):
         tmpfile_message.unlink()
         self.clear_cache()
 
+    def _commit_plumbing(self,
+                         paths: list[Path],
+                         message: str) -> None:
+        r"""Commit ``paths`` with git's plumbing commands.
+
+        Only the given paths are looked at. Files are hashed with
+        ``git hash-object -w`` (in batches), and the tree is written from a
+        temporary index that is read from ``HEAD`` and updated with
+        ``git update-index --index-info``. The commit is created with
+        ``git commit-tree`` and ``HEAD`` is moved with ``git update-ref``.
+        Finally, the same entries are applied to the actual index.
+
+        Directories (and paths that no longer exist) are expanded with a
+        single ``git ls-files`` call to the tracked and new (but not ignored)
+        files underneath them.
+
+        Just like ``git commit <paths>``, other changes that are staged in
+        the index are neither committed nor unstaged. Unlike ``git commit``,
+        no hooks are run and commits are not signed.
+
+        Parameters
+        ----------
+        paths
+            Paths to commit.
+        message
+            The git commit message.
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            Committing failed. This includes that there is nothing to commit.
+        """
+
+        import os
+        from onyo.lib.utils import get_temp_file
+
+        head = self.get_hexsha()
+
+        # relative POSIX paths of the files to commit
+        files = set()
+        pathspecs = []
+        for p in paths:
+            relative = (self.root / p).relative_to(self.root).as_posix()
+            if os.path.islink(self.root / p) or os.path.isfile(self.root / p):
+                files.add(relative)
+            else:
+                pathspecs.append(f":(literal){relative}")
+        for i in range(0, len(pathspecs), 1000):
+            output = self._git(['ls-files', '-z', '--cached', '--others', '--exclude-standard', '--',
+                                *pathspecs[i:i + 1000]])
+            files.update(f for f in output.split('\0') if f)
+
+        existing = sorted(f for f in files if os.path.lexists(self.root / f))
+        removed = sorted(files.difference(existing))
+
+        # write the blobs
+        regular = [f for f in existing if not os.path.islink(self.root / f)]
+        # paths are passed as arguments, since --stdin-paths can't take paths with a newline
+        oids = []
+        for i in range(0, len(regular), 1000):
+            oids += self._git(['hash-object', '-w', '--', *regular[i:i + 1000]]).split()
+        entries = dict()
+        for f, oid in zip(regular, oids):
+            entries[f] = ('100755' if os.access(self.root / f, os.X_OK) else '100644', oid)
+        for f in existing:
+            if f not in entries:
+                # a symlink's blob is its target
+                entries[f] = ('120000', self._git(['hash-object', '-w', '--stdin'],
+                                                  input=os.readlink(self.root / f)).strip())
+
+        null_oid = '0' * len(head or next(iter(oids), '') or '0' * 40)
+        # removals go first, so that a file can be replaced by a directory (and vice versa)
+        index_info = ''.join(f"0 {null_oid}\t{f}\0" for f in removed) + \
+            ''.join(f"{mode} {oid}\t{f}\0" for f, (mode, oid) in entries.items())
+
+        # write the tree from a temporary index, so that nothing else that is staged is committed
+        index = get_temp_file(suffix='.index')
+        index.unlink()
+        env = {'GIT_INDEX_FILE': str(index)}
+        try:
+            self._git(['read-tree', head] if head else ['read-tree', '--empty'], env=env)
+            self._git(['update-index', '-z', '--index-info'], input=index_info, env=env)
+            tree = self._git(['write-tree'], env=env).strip()
+        finally:
+            index.unlink(missing_ok=True)
+
+        if head and tree == self._git(['rev-parse', f'{head}^{{tree}}']).strip():
+            raise subprocess.CalledProcessError(1, ['git', 'commit-tree'], output="nothing to commit")
+
+        message = _cleanup_message(message)
+        commit = self._git(['commit-tree', tree] + (['-p', head] if head else []), input=message).strip()
+        subject = message.split('\n', 1)[0]
+        self._git(['update-ref', '-m', f"commit{'' if head else ' (initial)'}: {subject}",
+                   'HEAD', commit] + ([head] if head else []))
+        self._git(['update-index', '-z', '--index-info'], input=index_info)
+
+    def fast_import(self,
+                    changes: Iterable[fast_import_change_t],
+                    message: str) -> None:
+        r"""Commit changes to the tree of ``HEAD`` via ``git fast-import``.
+
+        The changes are streamed into ``git fast-import`` as a single commit on
+        top of ``HEAD``, without writing any file to the worktree. Afterwards,
+        the index and the worktree are updated to the new commit with
+        ``git read-tree -m -u`` (which only touches the changed paths).
+
+        The index and worktree must not have changes of the affected paths.
+        The commit message is cleaned up like ``git commit`` does, but unlike
+        ``git commit``, no hooks (e.g. ``pre-commit`` or ``commit-msg``) are
+        run.
+
+        Written files keep the mode of the file in the worktree (i.e. the
+        executable bit). Writing to a symlink writes to the file it points to,
+        just like writing to it in the worktree does. Renamed files keep their
+        mode.
+
+        Parameters
+        ----------
+        changes
+            Changes to apply in order, as tuples of:
+
+            - ``('M', path, content)``: write ``content`` (``bytes``) to the
+              file at ``path``
+            - ``('D', path)``: delete the file or directory at ``path``
+            - ``('R', source, destination)``: rename a file or directory
+
+            Paths are absolute.
+        message
+            The git commit message.
+
+        Raises
+        ------
+        ValueError
+            ``HEAD`` is not a branch with commits, or a symlink to write to
+            points outside of the repository.
+        subprocess.CalledProcessError
+            Committing failed. This includes that there is nothing to commit.
+        """
+
+        import os
+
+        head = self.get_hexsha()
+        try:
+            branch = self._git(['symbolic-ref', '--quiet', 'HEAD']).strip()
+        except subprocess.CalledProcessError:
+            branch = None
+        if not head or not branch:
+            raise ValueError("Bulk commits require HEAD to be a branch with commits.")
+
+        def relative(path: Path) -> bytes:
+            return _quote_path(path.relative_to(self.root).as_posix())
+
+        def write_target(path: Path) -> tuple[Path, bytes]:
+            # the file that writing to `path` in the worktree would write to, and its mode
+            if path.is_symlink():
+                resolved = Path(os.path.realpath(path))
+                if not resolved.is_relative_to(os.path.realpath(self.root)):
+                    raise ValueError(f"Cannot write to {path}: It links to outside of the repository.")
+                path = self.root / resolved.relative_to(os.path.realpath(self.root))
+            return path, b'100755' if path.is_file() and os.access(path, os.X_OK) else b'100644'
+
+        author = self._git(['var', 'GIT_AUTHOR_IDENT']).strip().encode()
+        committer = self._git(['var', 'GIT_COMMITTER_IDENT']).strip().encode()
+        message_bytes = _cleanup_message(message).encode()
+
+        ui.log_debug("Running 'git fast-import'")
+        process = subprocess.Popen(['git', 'fast-import', '--quiet'],
+                                   cwd=self.root,
+                                   stdin=subprocess.PIPE,
+                                   stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE)
+        stdin: IO[bytes] = process.stdin  # pyre-ignore[9]
+        try:
+            # without the final 'done', fast-import fails rather than committing a partial stream
+            stdin.write(b"feature done\n")
+            stdin.write(b"commit %s\nauthor %s\ncommitter %s\n" % (branch.encode(), author, committer))
+            stdin.write(b"data %d\n%s\nfrom %s\n" % (len(message_bytes), message_bytes, head.encode()))
+            for change in changes:
+                match change:
+                    case ('M', path, content):
+                        path, mode = write_target(path)
+                        stdin.write(b"M %s inline %s\ndata %d\n%s\n" % (mode, relative(path), len(content), content))
+                    case ('D', path):
+                        stdin.write(b"D %s\n" % relative(path))
+                    case ('R', source, destination):
+                        stdin.write(b"R %s %s\n" % (relative(source), relative(destination)))
+                    case _:
+                        raise ValueError(f"Invalid change for 'git fast-import': {change}")
+            stdin.write(b"\ndone\n")
+        except BrokenPipeError:
+            # fast-import failed; its error is reported below
+            pass
+        finally:
+            _, stderr = process.communicate()
+
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, ['git', 'fast-import'], stderr=stderr.decode())
+
+        commit = self._git(['rev-parse', branch]).strip()
+        if self._git(['rev-parse', f'{commit}^{{tree}}']).strip() == \
+                self._git(['rev-parse', f'{head}^{{tree}}']).strip():
+            # don't leave an empty commit behind
+            self._git(['update-ref', branch, head, commit])
+            raise subprocess.CalledProcessError(1, ['git', 'fast-import'], output="nothing to commit")
+
+        # bring index and worktree up-to-date, touching only what changed
+        self._git(['read-tree', '-m', '-u', head, commit])
+        self.clear_cache()
+
     @staticmethod
     def is_git_path(path: Path) -> bool:
         r"""Whether ``path`` is a git file or directory.
@@ -267,6 +910,60 @@ class GitRepo(object):
 
         return value
 
+    def get_config_list(self,
+                        path: Path | None = None) -> dict[str, str]:
+        r"""Get all configuration keys and their values with a single call of ``git-config``.
+
+        If no ``path`` is given, the values are those in effect according to
+        ``git-config``'s order of precedence (worktree, local, global, system).
+        As with ``git config --get``, the last value of a multi-valued key wins.
+
+        Section and key names are lower case (see :py:func:`normalize_config_key`).
+
+        Parameters
+        ----------
+        path
+            Path of a config file, rather than Git's default locations. If it
+            does not exist, no keys are returned.
+        """
+
+        try:
+            output = self._git(['config', '--list', '-z'] + (['--file', str(path)] if path else []))
+        except subprocess.CalledProcessError:
+            ui.log_debug(f"config could not be read from {path}")
+            return dict()
+
+        config = dict()
+        # records are NUL-terminated; key and value are separated by a newline
+        # (which is missing for a key without a value)
+        for record in output.split('\0'):
+            if record:
+                key, _, value = record.partition('\n')
+                config[key] = value.strip()
+
+        ui.log_debug(f"config acquired {len(config)} keys from {path or 'git config'}")
+        return config
+
+    @staticmethod
+    def normalize_config_key(key: str) -> str:
+        r"""Get the canonical form of a configuration key.
+
+        Section and key names are case-insensitive, and are thus lower cased.
+        Subsection names are case-sensitive (e.g. ``Section.SubSection.Key``
+        becomes ``section.SubSection.key``).
+
+        Parameters
+        ----------
+        key
+            Name of the configuration key.
+        """
+
+        section, _, rest = key.partition('.')
+        if not rest:
+            return key.lower()
+        subsection, dot, name = rest.rpartition('.')
+        return f"{section.lower()}.{subsection}{dot}{name.lower()}"
+
     def set_config(self,
                    key: str,
                    value: str,
@@ -343,6 +1040,79 @@ class GitRepo(object):
                 return None
             raise ValueError("Unknown commit identifier: %s" % commitish)
 
+    def is_ancestor(self,
+                    ancestor: str,
+                    commitish: str = 'HEAD') -> bool:
+        r"""Whether ``ancestor`` is an ancestor of (or identical to) ``commitish``.
+
+        Parameters
+        ----------
+        ancestor
+            The commit-ish to check.
+        commitish
+            The commit-ish whose history to search.
+        """
+
+        ret = subprocess.run(['git', 'merge-base', '--is-ancestor', ancestor, commitish],
+                             cwd=self.root, capture_output=True)
+        return ret.returncode == 0
+
+    def count_commits(self,
+                      revision: str = 'HEAD') -> int:
+        r"""Count the commits of a revision (range).
+
+        Parameters
+        ----------
+        revision
+            Revision (range) to count the commits of (e.g. ``'<sha>..HEAD'``).
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            ``revision`` is invalid.
+        """
+
+        return int(self._git(['rev-list', '--count', revision]))
+
+    def count_objects(self) -> dict[str, int]:
+        r"""Get the statistics of the object store from ``git count-objects -v``.
+
+        Sizes are in KiB. Keys are ``'count'`` and ``'size'`` (of loose
+        objects), ``'in-pack'``, ``'packs'``, ``'size-pack'``,
+        ``'prune-packable'``, ``'garbage'``, and ``'size-garbage'``.
+        """
+
+        output = self._git(['count-objects', '-v'])
+        return {k: int(v) for k, v in (line.split(': ', 1) for line in output.splitlines())}
+
+    def write_commit_graph(self) -> None:
+        r"""Write the commit-graph of all reachable commits with changed-path Bloom filters.
+
+        The commit-graph speeds up walking the history, and its Bloom filters
+        speed up limiting it to paths (e.g. ``git log --follow -- <path>``).
+        It is only valid for the commits that exist when it is written. Newer
+        commits are read from the object store as usual.
+        """
+
+        self._git(['commit-graph', 'write', '--reachable', '--changed-paths'])
+
+    def repack(self) -> None:
+        r"""Pack all objects into a single pack with a reachability bitmap.
+
+        Loose objects and redundant packs are removed afterwards.
+        """
+
+        self._git(['repack', '-a', '-d', '-q', '--write-bitmap-index'])
+
+    @property
+    def git_dir(self) -> Path:
+        r"""The absolute Path of the repository's ``.git`` directory."""
+
+        if self._git_dir is None:
+            self._git_dir = Path(self._git(['rev-parse', '--absolute-git-dir']).strip())
+
+        return self._git_dir
+
     def get_commit_msg(self,
                        commitish: str | None = None) -> str:
         r"""Return the full commit message of a commit-ish.
@@ -388,65 +1158,46 @@ class GitRepo(object):
 
         return ignored
 
-    def _parse_log_output(self,
-                          lines: list[str]) -> dict:
-        """Produce a commit dict (of one commit) from the output of ``git log``.
+    @staticmethod
+    def _parse_log_record(record: bytes) -> dict:
+        r"""Produce a commit dict (of one commit) from a record of :py:data:`_LOG_FORMAT`.
 
         A helper for :py:func:`history`.
 
         Parameters
         ----------
-        lines
-            List of text lines from ``git log`` for a single commit.
+        record
+            The output of ``git log`` for a single commit.
         """
 
         import datetime
-        import re
-
-        regex_author = re.compile(r"Author:\s+(?P<name>\b.*\b)\s+<(?P<email>[^\s]+)>$")
-        regex_committer = re.compile(r"Commit:\s+(?P<name>\b.*\b)\s+<(?P<email>[^\s]+)>$")
-        commit = dict()
-        for line in lines:
-            if line.startswith('commit '):
-                commit['hexsha'] = line.split()[1]
-                continue
-            elif line.startswith('Author:'):
-                try:
-                    commit['author'] = re.match(regex_author, line).groupdict()  # pyre-ignore [16] AttributeError is caught
-                except AttributeError as e:
-                    if str(e).endswith("'groupdict'"):
-                        raise RuntimeError(f"Unable to parse author-line:\n{line}") from e
-                    raise
-                continue
-            elif line.startswith('AuthorDate:'):
-                continue
-            elif line.startswith('Commit:'):
-                try:
-                    commit['committer'] = re.match(regex_committer, line).groupdict()
-                except AttributeError as e:
-                    if str(e).endswith("'groupdict'"):
-                        raise RuntimeError(f"Unable to parse committer-line:\n{line}") from e
-                    raise
-                continue
-            elif line.startswith('CommitDate:'):
-                commit['time'] = datetime.datetime.fromisoformat(line.split(maxsplit=1)[1])
-                continue
-            else:
-                # This line is part of the message.
-                if 'message' not in commit:
-                    commit['message'] = [line]
-                else:
-                    commit['message'].append(line)
 
-        return commit
+        try:
+            hexsha, author_name, author_email, committer_name, committer_email, time, message = \
+                record.decode().split(_LOG_FIELD_SEPARATOR, 6)
+        except ValueError as e:
+            raise RuntimeError(f"Unable to parse git-log record:\n{record!r}") from e
+
+        return {'hexsha': hexsha,
+                'author': {'name': author_name, 'email': author_email},
+                'committer': {'name': committer_name, 'email': committer_email},
+                'time': datetime.datetime.fromisoformat(time),
+                'message': message.splitlines()}
 
     def history(self,
                 path: Path | None = None,
-                n: int | None = None) -> Generator[dict, None, None]:
-        """Yield commit dicts representing the history of ``path``.
+                n: int | None = None,
+                revision: str | None = None) -> Generator[dict, None, None]:
+        r"""Yield commit dicts representing the history of ``path``.
 
         The history is acquired via ``git log`` (``git log --follow`` if a
-        ``path`` is given).
+        ``path`` is given). Its output is streamed and each commit is parsed
+        as soon as it arrives, so stopping early does not wait for (or keep) the
+        rest of the history.
+
+        A commit dict has the keys ``'hexsha'``, ``'author'`` and
+        ``'committer'`` (each a dict of ``'name'`` and ``'email'``), ``'time'``
+        (the commit date), and ``'message'`` (list of lines).
 
         Parameters
         ----------
@@ -454,33 +1205,49 @@ class GitRepo(object):
             The Path to get the history of. Defaults to the repo root.
         n
             Limit history to ``n`` commits. ``None`` for no limit (default).
+        revision
+            Revision (range) to get the history of (e.g. ``'<sha>..HEAD'``).
+            Defaults to ``HEAD``.
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            ``git log`` failed.
         """
 
-        # TODO: Formatting the output with `--pretty` may simplify handling
-        #       multi-line strings in git-log's output (rather than splitting
-        #       lines and iterating), parsing git's metadata and Onyo's
-        #       operations record, and remove the leading spaces for the commit
-        #       message.
-        # --pretty='format:commit: %H%nAuthor: %an (%ae)%nCommitter: %cn (%ce)%nCommitDate: %cI%nMessage:%n%B'
         limit = [f'-n{n}'] if n is not None else []
+        rev = [revision] if revision else []
         pathspec = ['--follow', '--', str(path)] if path else []
-        cmd = ['log', '--date=iso-strict', '--pretty=fuller'] + limit + pathspec
-        output = self._git(cmd)
-
-        # yield output on a per-commit-basis
-        commit_output = []
-        for line in output.splitlines():
-            if line.startswith('commit '):
-                # This is the first line of a new commit.
-                # 1. store previous commit output
-                if commit_output:
-                    # we just finished the previous commit.
-                    yield self._parse_log_output(commit_output)
-                # 2. start new commit output
-                commit_output = [line]
-            else:
-                # add to current commit output
-                commit_output.append(line)
-
-        if commit_output:
-            yield self._parse_log_output(commit_output)
+        cmd = ['log', '-z', f'--pretty=format:{_LOG_FORMAT}'] + limit + rev + pathspec
+
+        import tempfile
+
+        ui.log_debug(f"Running 'git {' '.join(cmd)}'")
+        # stderr goes to a file, so that git can't block on a full pipe while stdout is read
+        stderr = tempfile.TemporaryFile()
+        process = subprocess.Popen(['git'] + cmd,
+                                   cwd=self.root,
+                                   stdout=subprocess.PIPE,
+                                   stderr=stderr)
+        stdout: IO[bytes] = process.stdout  # pyre-ignore[9]
+        try:
+            # commits are separated by NUL (-z)
+            buffer = b''
+            while chunk := stdout.read1(_LOG_READ_SIZE):  # pyre-ignore[16]
+                *records, buffer = (buffer + chunk).split(b'\0')
+                for record in records:
+                    yield self._parse_log_record(record)
+            if buffer:
+                yield self._parse_log_record(buffer)
+
+            if process.wait():
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(process.returncode, ['git'] + cmd,
+                                                    stderr=stderr.read().decode())
+        finally:
+            # the caller may stop iterating before git is done
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            stdout.close()
+            stderr.close()
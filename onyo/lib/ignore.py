@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import pathspec
+
+from onyo.lib.ui import ui
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Iterable
+
+    from onyo.lib.git import GitRepo
+
+log: logging.Logger = logging.getLogger('onyo.ignore')
+
+
+class IgnoreMatcher(object):
+    r"""Match paths against all committed ignore files of a repository.
+
+    Each ignore file applies to the subtree it is placed in, and its patterns
+    are matched against paths relative to that directory (in the style of
+    ``.gitignore``).
+
+    Patterns are compiled once per blob, keyed by the blob's object ID, and
+    reused when loading a new commit in which the ignore file did not change.
+    Results are cached per path until the next :py:func:`load`.
+
+    Attributes
+    ----------
+    root
+        The absolute Path of the root of the repository.
+    head
+        The commit the ignore files were loaded from.
+    """
+
+    def __init__(self,
+                 root: Path) -> None:
+        r"""Instantiate an ``IgnoreMatcher`` without any ignore files.
+
+        Parameters
+        ----------
+        root
+            The absolute Path of the root of the repository.
+        """
+
+        self.root: Path = root
+        self.head: str | None = None
+        self._compiled: dict[str, pathspec.GitIgnoreSpec] = {}
+        self._specs: dict[Path, pathspec.GitIgnoreSpec] = {}
+        self._results: dict[Path, bool] = {}
+
+    def load(self,
+             git: GitRepo,
+             ignore_files: Iterable[Path],
+             head: str | None) -> None:
+        r"""Load the ignore files as committed in ``head``.
+
+        Parameters
+        ----------
+        git
+            The GitRepo to read the ignore files from.
+        ignore_files
+            Absolute Paths of the ignore files tracked in ``head``.
+        head
+            The commit to load the ignore files from. ``None`` for an empty
+            repository.
+        """
+
+        self.head = head
+        self._specs = {}
+        self._results = {}
+        if head is None:
+            return
+
+        ignore_files = list(ignore_files)
+        oids = dict(zip(ignore_files,
+                        (oid for _, oid in git.get_object_ids(
+                            f"{head}:{f.relative_to(self.root).as_posix()}" for f in ignore_files))))
+
+        # compile only the blobs that are not already known
+        current = {oid for oid in oids.values() if oid}
+        for oid, content in git.read_objects(current.difference(self._compiled)):
+            text = content.decode() if content is not None else ''
+            self._compiled[oid] = pathspec.GitIgnoreSpec.from_lines(text.splitlines())
+        self._compiled = {oid: spec for oid, spec in self._compiled.items() if oid in current}
+
+        self._specs = {f.parent: self._compiled[oid] for f, oid in oids.items() if oid}
+        ui.log_debug(f"Loaded {len(self._specs)} ignore files of {head}")
+
+    def match(self,
+              paths: Iterable[Path]) -> set[Path]:
+        r"""Get the subset of ``paths`` that are ignored.
+
+        Paths are grouped by the ignore files that apply to them, so that each
+        compiled spec is matched against its whole group in a single pass.
+
+        Parameters
+        ----------
+        paths
+            Absolute Paths to check.
+
+        Raises
+        ------
+        ValueError
+            A path is outside of the repository.
+        """
+
+        paths = set(paths)
+        groups: dict[Path, dict[str, Path]] = {}
+        for p in paths.difference(self._results):
+            if p != self.root and self.root not in p.parents:
+                raise ValueError(f"{str(p)} is not under {str(self.root)}")
+            self._results[p] = False
+            for d in p.parents:
+                if d in self._specs:
+                    groups.setdefault(d, {})[p.relative_to(d).as_posix()] = p
+                if d == self.root:
+                    break
+
+        for d, group in groups.items():
+            for matched in self._specs[d].match_files(group.keys()):
+                self._results[group[matched]] = True
+
+        return {p for p in paths if self._results[p]}
+
+    def is_ignored(self,
+                   path: Path) -> bool:
+        r"""Whether ``path`` is ignored.
+
+        Parameters
+        ----------
+        path
+            Absolute Path to check.
+
+        Raises
+        ------
+        ValueError
+            ``path`` is outside of the repository.
+        """
+
+        if path not in self._results:
+            self.match([path])
+
+        return self._results[path]
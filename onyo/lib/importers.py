@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from onyo.lib.consts import (
+    ANCHOR_FILE_NAME,
+    ASSET_DIR_FILE_NAME,
+)
+from onyo.lib.onyo import OnyoRepo
+from onyo.lib.items import Item
+
+if TYPE_CHECKING:
+    from onyo.lib.git import fast_import_change_t
+
+
+def _write_asset(asset: Item) -> fast_import_change_t:
+    r"""Helper for ``{modify,new}_asset()`` importers.
+
+    Mirrors :py:func:`onyo.lib.onyo.OnyoRepo.write_asset`.
+
+    Parameters
+    ----------
+    asset
+        The asset Item to write.
+    """
+
+    path = asset.get('onyo.path.absolute')
+    if asset.get('onyo.is.directory') and path.name != ASSET_DIR_FILE_NAME:
+        path = path / ASSET_DIR_FILE_NAME
+
+    return 'M', path, asset.yaml().encode()
+
+
+def _anchors(repo: OnyoRepo,
+             path: Path) -> list[fast_import_change_t]:
+    r"""Helper to write the anchors of a directory and its parents.
+
+    Mirrors :py:func:`onyo.lib.onyo.OnyoRepo.mk_inventory_dirs`.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    path
+        Absolute Path of the directory.
+    """
+
+    return [('M', d / ANCHOR_FILE_NAME, b'')
+            for d in [path] + list(path.parents)
+            if d.is_relative_to(repo.git.root) and d != repo.git.root]
+
+
+def import_modify_asset(repo: OnyoRepo,
+                        operands: tuple[Item, Item]
+                        ) -> list[fast_import_change_t]:
+    r"""Importer for the 'modify_assets' operation.
+
+    Not intended for direct use. It is called from an Operator, which is assumed
+    to have validated all input passed to this (trusting) importer.
+
+    Returns the changes to the tree that executing the operation would make.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    operands
+        Items of the original and updated asset.
+    """
+
+    return [_write_asset(operands[1])]
+
+
+def import_move(repo: OnyoRepo,
+                operands: tuple[Path, Path]
+                ) -> list[fast_import_change_t]:
+    r"""Importer for the 'move_assets' and 'move_directories' operations.
+
+    Not intended for direct use. It is called from an Operator, which is assumed
+    to have validated all input passed to this (trusting) importer.
+
+    Returns the changes to the tree that executing the operation would make.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    operands
+        Absolute Paths of the source and destination parent.
+    """
+
+    return [('R', operands[0], operands[1] / operands[0].name)]
+
+
+def import_new_asset(repo: OnyoRepo,
+                     operands: tuple[Item]
+                     ) -> list[fast_import_change_t]:
+    r"""Importer for the 'new_assets' operation.
+
+    Not intended for direct use. It is called from an Operator, which is assumed
+    to have validated all input passed to this (trusting) importer.
+
+    Returns the changes to the tree that executing the operation would make.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    operands
+        Asset to create.
+    """
+
+    return [_write_asset(operands[0])]
+
+
+def import_new_directory(repo: OnyoRepo,
+                         operands: tuple[Path]
+                         ) -> list[fast_import_change_t]:
+    r"""Importer for the 'new_directories' operation.
+
+    Not intended for direct use. It is called from an Operator, which is assumed
+    to have validated all input passed to this (trusting) importer.
+
+    Returns the changes to the tree that executing the operation would make.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    operands
+        Absolute Path of directory to create.
+    """
+
+    p: Path = operands[0]
+    # This may be an asset file that needs to be turned into an asset dir.
+    # The file needs to be deleted before anything is written below its path.
+    if p.is_file() and repo.is_asset_path(p):
+        asset = Item(p, repo=repo)
+        asset['onyo.is.directory'] = True
+        return [('D', p)] + _anchors(repo, p) + [_write_asset(asset)]
+
+    return _anchors(repo, p)
+
+
+def import_remove_asset(repo: OnyoRepo,
+                        operands: tuple[Item]
+                        ) -> list[fast_import_change_t]:
+    r"""Importer for the 'remove_assets' operation.
+
+    Not intended for direct use. It is called from an Operator, which is assumed
+    to have validated all input passed to this (trusting) importer.
+
+    Returns the changes to the tree that executing the operation would make.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    operands
+        Asset to remove.
+    """
+
+    p: Path = operands[0].get('onyo.path.absolute')
+
+    return [('D', p / ASSET_DIR_FILE_NAME if p.is_dir() else p)]
+
+
+def import_remove_directory(repo: OnyoRepo,
+                            operands: tuple[Item]
+                            ) -> list[fast_import_change_t]:
+    r"""Importer for the 'remove_directories' operation.
+
+    Not intended for direct use. It is called from an Operator, which is assumed
+    to have validated all input passed to this (trusting) importer.
+
+    Returns the changes to the tree that executing the operation would make.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    operands
+        Directory to remove.
+    """
+
+    p: Path = operands[0]['onyo.path.absolute']
+    changes: list[fast_import_change_t] = [('D', p / ANCHOR_FILE_NAME)]
+
+    if (p / ASSET_DIR_FILE_NAME).exists():
+        # an asset dir becomes an asset file
+        asset = Item(p, repo=repo)
+        asset['onyo.is.directory'] = False
+        changes.append(('D', p / ASSET_DIR_FILE_NAME))
+        changes.append(_write_asset(asset))
+
+    return changes
+
+
+def import_remove_generic_file(repo: OnyoRepo,
+                               operands: tuple[Path]
+                               ) -> list[fast_import_change_t]:
+    r"""Importer for the 'remove_generic_file' operation.
+
+    Not intended for direct use. It is called from an Operator, which is assumed
+    to have validated all input passed to this (trusting) importer.
+
+    Returns the changes to the tree that executing the operation would make.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    operands
+        Absolute Path of the file to remove.
+    """
+
+    return [('D', operands[0])]
+
+
+def import_rename(repo: OnyoRepo,
+                  operands: tuple[Path, Path]
+                  ) -> list[fast_import_change_t]:
+    r"""Importer for the 'rename_assets' and 'rename_directories' operations.
+
+    Not intended for direct use. It is called from an Operator, which is assumed
+    to have validated all input passed to this (trusting) importer.
+
+    Returns the changes to the tree that executing the operation would make.
+
+    Parameters
+    ----------
+    repo
+        Onyo repository to operate on.
+    operands
+        Absolute Paths of the source and destination.
+    """
+
+    return [('R', operands[0], operands[1])]
@@ -11,6 +11,7 @@ from typing import (
 from onyo.lib.consts import (
     ANCHOR_FILE_NAME,
     ASSET_DIR_FILE_NAME,
+    SORT_DESCENDING,
 )
 from onyo.lib.differs import (
     differ_modify_asset,
@@ -42,8 +43,19 @@ from onyo.lib.executors import (
     exec_rename_directory,
     generic_executor,
 )
+from onyo.lib.importers import (
+    import_modify_asset,
+    import_move,
+    import_new_asset,
+    import_new_directory,
+    import_remove_asset,
+    import_remove_directory,
+    import_remove_generic_file,
+    import_rename,
+)
 from onyo.lib.items import Item
 from onyo.lib.onyo import OnyoRepo
+from onyo.lib.planner import QueryPlan
 from onyo.lib.pseudokeys import PSEUDO_KEYS
 from onyo.lib.recorders import (
     record_modify_asset,
@@ -58,6 +70,7 @@ from onyo.lib.recorders import (
 )
 from onyo.lib.utils import (
     deduplicate,
+    natsort_key,
 )
 from onyo.lib.ui import ui
 
@@ -69,12 +82,17 @@ if TYPE_CHECKING:
     )
     from collections import UserDict
 
+    from onyo.lib.consts import sort_t
+    from onyo.lib.git import fast_import_change_t
+
 
 @dataclass
 class InventoryOperator:
     r"""Representation of a type of Inventory Operation.
 
-    Groups together the Callables to execute, diff, and record an operation.
+    Groups together the Callables to execute, diff, and record an operation,
+    and to get the changes it makes to the tree without executing it (for bulk
+    commits via ``git fast-import``).
 
     See :py:data:`OPERATIONS_MAPPING`.
     """
@@ -82,6 +100,7 @@ class InventoryOperator:
     executor: Callable
     differ: Callable
     recorder: Callable
+    importer: Callable
 
 
 @dataclass
@@ -106,62 +125,229 @@ class InventoryOperation(object):
 
         return self.operator.executor(repo=self.repo, operands=self.operands)
 
+    def changes(self) -> list[fast_import_change_t]:
+        r"""Get the changes to the tree that executing the operation would make.
+
+        See :py:func:`onyo.lib.git.GitRepo.fast_import`.
+        """
+
+        return self.operator.importer(repo=self.repo, operands=self.operands)
+
 
 OPERATIONS_MAPPING: dict = {
     'modify_assets': InventoryOperator(
         executor=exec_modify_asset,
         differ=differ_modify_asset,
         recorder=record_modify_asset,
+        importer=import_modify_asset,
     ),
     'move_assets': InventoryOperator(
         executor=exec_move_asset,
         differ=differ_move_asset,
         recorder=record_move_asset,
+        importer=import_move,
     ),
     'move_directories': InventoryOperator(
         executor=exec_move_directory,
         differ=differ_move_directory,
         recorder=record_move_directory,
+        importer=import_move,
     ),
     'new_assets': InventoryOperator(
         executor=exec_new_asset,
         differ=differ_new_asset,
         recorder=record_new_asset,
+        importer=import_new_asset,
     ),
     'new_directories': InventoryOperator(
         executor=exec_new_directory,
         differ=differ_new_directory,
         recorder=record_new_directory,
+        importer=import_new_directory,
     ),
     'remove_assets': InventoryOperator(
         executor=exec_remove_asset,
         differ=differ_remove_asset,
         recorder=record_remove_asset,
+        importer=import_remove_asset,
     ),
     'remove_directories': InventoryOperator(
         executor=exec_remove_directory,
         differ=differ_remove_directory,
         recorder=record_remove_directory,
+        importer=import_remove_directory,
     ),
     'remove_generic_file': InventoryOperator(
         executor=partial(generic_executor, lambda x: x[0].unlink()),
         differ=differ_remove_asset,
-        recorder=lambda x: dict()  # no operations record for this, not an inventory item
+        recorder=lambda x: dict(),  # no operations record for this, not an inventory item
+        importer=import_remove_generic_file,
     ),
     'rename_assets': InventoryOperator(
         executor=exec_rename_asset,
         differ=differ_rename_asset,
         recorder=record_rename_asset,
+        importer=import_rename,
     ),
     'rename_directories': InventoryOperator(
         executor=exec_rename_directory,
         differ=differ_rename_directory,
         recorder=record_rename_directory,
+        importer=import_rename,
     ),
 }
 r"""Mapping of Inventory Operation types with the appropriate operators."""
 
 
+class OperationQueue(list):
+    r"""List of pending Inventory Operations, indexed by the paths they affect.
+
+    The indexes are updated as operations are appended, so that pending
+    creations, removals, moves, and renames can be looked up by path in
+    constant time. Any other modification of the list rebuilds them.
+
+    Attributes
+    ----------
+    new_assets
+        Paths of assets that are to be created (or moved or renamed to).
+    new_dirs
+        Paths of directories that are to be created (or moved or renamed to).
+    removed_assets
+        Paths of assets that are to be removed.
+    removed_dirs
+        Paths of directories that are to be removed.
+    removed_files
+        Paths of other files that are to be removed.
+    moves
+        Destination Paths of assets and directories that are to be moved, by
+        their current Path.
+    renames
+        Destination Paths of assets and directories that are to be renamed, by
+        their current Path.
+    """
+
+    def __init__(self,
+                 operations: Iterable[InventoryOperation] = ()) -> None:
+        r"""Instantiate a queue of ``operations``.
+
+        Parameters
+        ----------
+        operations
+            Inventory Operations to queue.
+        """
+
+        super().__init__(operations)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        r"""Rebuild all indexes from scratch."""
+
+        self.new_assets: set[Path] = set()
+        self.new_dirs: set[Path] = set()
+        self.removed_assets: set[Path] = set()
+        self.removed_dirs: set[Path] = set()
+        self.removed_files: set[Path] = set()
+        self.moves: dict[Path, Path] = dict()
+        self.renames: dict[Path, Path] = dict()
+        for op in self:
+            self._index(op)
+
+    def _index(self,
+               op: InventoryOperation) -> None:
+        r"""Add an operation to the indexes."""
+
+        operands = op.operands
+        match _OPERATOR_NAMES.get(id(op.operator)):
+            case 'new_assets':
+                self.new_assets.add(operands[0].get('onyo.path.absolute'))  # TODO: onyo.path.file?
+            case 'rename_assets':
+                self.new_assets.add(operands[1])
+                self.renames[operands[0]] = operands[1]
+            case 'new_directories':
+                self.new_dirs.add(operands[0])
+            case 'move_directories':
+                self.new_dirs.add(operands[1] / operands[0].name)
+                self.moves[operands[0]] = operands[1] / operands[0].name
+            case 'move_assets':
+                self.new_assets.add(operands[1] / operands[0].name)
+                self.moves[operands[0]] = operands[1] / operands[0].name
+            case 'rename_directories':
+                self.new_dirs.add(operands[1])
+                self.renames[operands[0]] = operands[1]
+            case 'remove_assets':
+                self.removed_assets.add(operands[0]['onyo.path.absolute'])
+            case 'remove_directories':
+                self.removed_dirs.add(operands[0]['onyo.path.absolute'])
+            case 'remove_generic_file':
+                self.removed_files.add(operands[0])
+
+    def append(self,
+               op: InventoryOperation) -> None:
+        r"""Append an operation and add it to the indexes."""
+
+        super().append(op)
+        self._index(op)
+
+    def extend(self,
+               operations: Iterable[InventoryOperation]) -> None:
+        r"""Append operations and add them to the indexes."""
+
+        for op in operations:
+            self.append(op)
+
+    def __iadd__(self,
+                 operations: Iterable[InventoryOperation]) -> OperationQueue:
+        r"""Append operations (``+=``) and add them to the indexes."""
+
+        self.extend(operations)
+        return self
+
+    def __setitem__(self, index, value) -> None:
+        r"""Replace operations and rebuild the indexes."""
+
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index) -> None:
+        r"""Delete operations and rebuild the indexes."""
+
+        super().__delitem__(index)
+        self._reindex()
+
+    def insert(self,
+               index: int,
+               op: InventoryOperation) -> None:
+        r"""Insert an operation and rebuild the indexes."""
+
+        super().insert(index, op)
+        self._reindex()
+
+    def pop(self,
+            index: int = -1) -> InventoryOperation:
+        r"""Remove and return an operation and rebuild the indexes."""
+
+        op = super().pop(index)
+        self._reindex()
+        return op
+
+    def remove(self,
+               op: InventoryOperation) -> None:
+        r"""Remove an operation and rebuild the indexes."""
+
+        super().remove(op)
+        self._reindex()
+
+    def clear(self) -> None:
+        r"""Remove all operations and clear the indexes."""
+
+        super().clear()
+        self._reindex()
+
+
+_OPERATOR_NAMES: dict[int, str] = {id(operator): name for name, operator in OPERATIONS_MAPPING.items()}
+r"""Names of the operators of :py:data:`OPERATIONS_MAPPING`, by their ``id()``."""
+
+
 # TODO: Conflict w/ existing operations?
 #       operations: raise InvalidInventoryOperationError on conflicts with pending operations,
 #       like removing something that is to be created. -> reset() or commit()
@@ -175,11 +361,14 @@ class Inventory(object):
     Attributes
     ----------
     operations
-        List of all pending InventoryOperations.
+        Queue of all pending InventoryOperations.
     repo
         The OnyoRepo this Inventory represents.
     """
 
+    READ_BATCH_SIZE: int = 1000
+    r"""Number of assets read from the object store at once by :py:func:`get_items`."""
+
     def __init__(self,
                  repo: OnyoRepo) -> None:
         r"""Instantiate an ``Inventory`` object based on ``repo``.
@@ -191,8 +380,9 @@ class Inventory(object):
         """
 
         self.repo: OnyoRepo = repo
-        self.operations: list[InventoryOperation] = []
+        self._operations: OperationQueue = OperationQueue()
         self._ignore_for_commit: list[Path] = []
+        self._faux_serials: set[str] | None = None
 
     @property
     def root(self):
@@ -200,14 +390,41 @@ class Inventory(object):
 
         return self.repo.git.root
 
+    @property
+    def operations(self) -> OperationQueue:
+        r"""Queue of all pending InventoryOperations."""
+
+        return self._operations
+
+    @operations.setter
+    def operations(self,
+                   operations: Iterable[InventoryOperation]) -> None:
+        self._operations = operations if isinstance(operations, OperationQueue) else OperationQueue(operations)
+
     def reset(self) -> None:
         r"""Discard pending operations."""
 
-        self.operations = []
+        self.operations = OperationQueue()
+        self._faux_serials = None
 
     def commit(self,
-               message: str | None) -> None:
-        r"""Execute pending operations and commit the results."""
+               message: str | None,
+               bulk: bool = False) -> None:
+        r"""Execute pending operations and commit the results.
+
+        Parameters
+        ----------
+        message
+            The commit message. The operations record is appended to it.
+        bulk
+            Rather than executing the operations in the worktree and committing
+            the resulting files, stream the changes they make straight into
+            ``git fast-import`` and update the worktree afterwards (see
+            :py:func:`onyo.lib.git.GitRepo.fast_import`). This is faster for
+            many operations, but git's commit hooks (e.g. ``pre-commit``) are
+            not run. The changes of all operations are determined from the
+            worktree before any of them is applied.
+        """
 
         # get user message + generate appendix from operations
         # does order matter for execution? Prob.
@@ -221,6 +438,11 @@ class Inventory(object):
         commit_msg = message + "\n\n"
 
         try:
+            if bulk:
+                changes = [c for operation in self.operations for c in operation.changes()]
+                self.repo.fast_import(changes, commit_msg + self.operations_summary())
+                return
+
             for operation in self.operations:
                 to_commit, to_stage = operation.execute()
                 paths_to_commit.extend(to_commit)
@@ -267,44 +489,33 @@ class Inventory(object):
         # Note: Seems superfluous now (operations is a list rather than dict of lists)
         return bool(self.operations)
 
-    def _get_pending_assets(self) -> list[str]:
+    def _get_pending_assets(self) -> set[Path]:
         r"""Get Paths of assets that are to be created by pending operations."""
 
         # TODO: Inventory methods should check this in addition to Path.exists().
-        #       The differs/executors/recorders already generate this
-        #       information. Find a way to query that w/o executing in a
-        #       structured way. Ideally, we should also account for paths that
-        #       are being removed by pending operations and therefore are "free
-        #       to use" for operations added to the queue. See issue #546.
-        assets = []
-        for op in self.operations:
-            if op.operator == OPERATIONS_MAPPING['new_assets']:
-                assets.append(op.operands[0].get('onyo.path.absolute'))  # TODO: onyo.path.file?
-            elif op.operator == OPERATIONS_MAPPING['rename_assets']:
-                assets.append(op.operands[1])
-
-        return assets
-
-    def _get_pending_dirs(self) -> list[Path]:
+        #       Ideally, we should also account for paths that are being removed
+        #       by pending operations and therefore are "free to use" for
+        #       operations added to the queue. See issue #546.
+        return self.operations.new_assets
+
+    def _get_pending_dirs(self) -> set[Path]:
         r"""Get Paths of directories that are to be created by pending operations."""
 
         # TODO: Currently used within `rename_directory` to allow for
-        #       move+rename. This needs enhancement/generalization (check for
-        #       removed ones as well, etc.). See issue #546.
+        #       move+rename. This needs generalization (check for removed ones
+        #       as well, etc.). See issue #546.
+        return self.operations.new_dirs
 
-        dirs = []
-        for op in self.operations:
-            if op.operator == OPERATIONS_MAPPING['new_directories']:
-                dirs.append(op.operands[0])
-            elif op.operator == OPERATIONS_MAPPING['move_directories']:
-                dirs.append(op.operands[1] / op.operands[0].name)
+    def _is_pending_relocation(self,
+                               path: Path) -> bool:
+        r"""Whether ``path`` is to be moved or renamed by pending operations."""
 
-        return dirs
+        return path in self.operations.moves or path in self.operations.renames
 
     def _get_pending_removals(self,
                               mode: Literal['assets', 'dirs', 'all'] = 'all'
-                              ) -> list[Item]:
-        r"""Get Items that are to be removed by pending operations.
+                              ) -> set[Path]:
+        r"""Get Paths that are to be removed by pending operations.
 
         Parameters
         ----------
@@ -312,23 +523,13 @@ class Inventory(object):
             Which pending removals to consider.
         """
 
-        # TODO: Just like `_get_pending_assets` and `_get_pending_dirs`, this
-        #       needs to be replaced by a more structured way of assessing
-        #       what's in the queue. See issue #546.
-
-        paths = []
-        operators = []
-        if mode in ['assets', 'all']:
-            operators.append(OPERATIONS_MAPPING['remove_assets'])
-        if mode in ['dirs', 'all']:
-            operators.append(OPERATIONS_MAPPING['remove_directories'])
-        if mode == 'all':
-            operators.append(OPERATIONS_MAPPING['remove_generic_file'])
-        for op in self.operations:
-            if op.operator in operators:
-                paths.append(op.operands[0])
+        match mode:
+            case 'assets':
+                return self.operations.removed_assets
+            case 'dirs':
+                return self.operations.removed_dirs
 
-        return paths
+        return self.operations.removed_assets | self.operations.removed_dirs | self.operations.removed_files
 
     #
     # Operations
@@ -370,8 +571,6 @@ class Inventory(object):
         self.raise_empty_keys(asset)
         # ### generate stuff - TODO: function - reuse in modify_asset
         if asset.get('serial') == 'faux':
-            # TODO: RF this into something that gets a faux serial at a time. This needs to be done
-            #       accounting for pending operations in the Inventory.
             asset['serial'] = self.get_faux_serials(num=1).pop()
         self.raise_required_key_empty_value(asset)
 
@@ -475,7 +674,7 @@ class Inventory(object):
         """
 
         path = asset.get('onyo.path.absolute')
-        if path in [a['onyo.path.absolute'] for a in self._get_pending_removals(mode='assets')]:
+        if path in self._get_pending_removals(mode='assets'):
             ui.log_debug(f"{path} already queued for removal.")
             # TODO: Consider NoopError when addressing #546.
             return []
@@ -504,8 +703,9 @@ class Inventory(object):
         NotAnAssetError
             ``asset`` is not an asset.
         ValueError
-            ``dst`` is the same parent, the target already exists, or
-            ``dst`` would be an invalid location.
+            ``dst`` is the same parent, the target already exists (or is
+            pending to be created), ``src`` is already pending to be moved or
+            renamed, or ``dst`` would be an invalid location.
         """
 
         if not src['onyo.is.asset']:
@@ -517,9 +717,13 @@ class Inventory(object):
         if not dst['onyo.is.directory'] and dst['onyo.path.absolute'] not in self._get_pending_dirs():
             raise ValueError(f"Cannot move {src['onyo.path.absolute']}: "
                              f"Destination {dst['onyo.path.absolute']} is not an inventory directory.")
+        if self._is_pending_relocation(src['onyo.path.absolute']):
+            raise ValueError(f"Cannot move {src['onyo.path.absolute']}: It is already pending to be moved or renamed.")
         target = dst['onyo.path.absolute'] / src['onyo.path.name']
         if target.exists():
             raise ValueError(f"Target {str(target)} already exists.")
+        if target in self._get_pending_assets():
+            raise ValueError(f"Asset '{target}' is already pending to be created. Multiple assets cannot be stored at the same path.")
 
         return [self._add_operation('move_assets', (src['onyo.path.absolute'], dst['onyo.path.absolute']))]
 
@@ -543,8 +747,9 @@ class Inventory(object):
         NoopError
             Rename would result in the same name.
         ValueError
-            ``asset`` is not an asset, the destination already exists, or the
-            destination is already pending to be created.
+            ``asset`` is not an asset, the destination already exists, the
+            destination is already pending to be created, or ``asset`` is
+            already pending to be moved or renamed.
         """
 
         path = asset.get('onyo.path.absolute')
@@ -554,6 +759,8 @@ class Inventory(object):
         generated_name = self.generate_asset_name(asset)
         if path.name == generated_name:
             raise NoopError(f"Cannot rename asset {path.name}: This is already its name.")
+        if self._is_pending_relocation(path):
+            raise ValueError(f"Cannot rename asset {path.name}: It is already pending to be moved or renamed.")
 
         destination = path.parent / generated_name
         if destination in self._get_pending_assets():
@@ -599,8 +806,6 @@ class Inventory(object):
         self.raise_empty_keys(new_asset)
         # ### generate stuff - TODO: function - reuse in add_asset
         if new_asset.get('serial') == 'faux':
-            # TODO: RF this into something that gets a faux serial at a time. This needs to be done
-            #       accounting for pending operations in the Inventory.
             new_asset['serial'] = self.get_faux_serials(num=1).pop()
         self.raise_required_key_empty_value(new_asset)
 
@@ -659,7 +864,7 @@ class Inventory(object):
             ``item['onyo.path.absolute']`` is already an Asset File.
         """
 
-        if item['onyo.path.absolute'] in [d['onyo.path.absolute'] for d in self._get_pending_removals(mode='dirs')]:
+        if item['onyo.path.absolute'] in self._get_pending_removals(mode='dirs'):
             ui.log_debug(f"{item['onyo.path.absolute']} already queued for removal")
             # TODO: Consider NoopError when addressing #546.
             return []
@@ -707,8 +912,9 @@ class Inventory(object):
         InvalidInventoryOperationError
             ``src`` and ``dst`` share the same parent.
         ValueError
-            ``src`` is not an inventory directory, the target already exists, or
-            ``dst`` would be an invalid location.
+            ``src`` is not an inventory directory, the target already exists (or
+            is pending to be created), ``src`` is already pending to be moved or
+            renamed, or ``dst`` would be an invalid location.
         """
 
         if not src['onyo.is.directory']:
@@ -719,8 +925,11 @@ class Inventory(object):
             raise InvalidInventoryOperationError(
                 f"Cannot move {src['onyo.path.absolute']} -> {dst['onyo.path.absolute']}. Consider renaming instead."
             )
-        if (dst['onyo.path.absolute'] / src['onyo.path.name']).exists():
-            raise ValueError(f"Target {dst['onyo.path.absolute'] / src['onyo.path.name']} already exists.")
+        if self._is_pending_relocation(src['onyo.path.absolute']):
+            raise ValueError(f"Cannot move {src['onyo.path.absolute']}: It is already pending to be moved or renamed.")
+        target = dst['onyo.path.absolute'] / src['onyo.path.name']
+        if target.exists() or target in self._get_pending_dirs():
+            raise ValueError(f"Target {target} already exists.")
 
         return [self._add_operation('move_directories', (src['onyo.path.absolute'], dst['onyo.path.absolute']))]
 
@@ -750,8 +959,9 @@ class Inventory(object):
         NoopError
             Rename would result in the same name.
         ValueError
-            ``src`` is not an inventory directory, ``dst`` already exists, or
-            ``dst`` would be an invalid location.
+            ``src`` is not an inventory directory, ``dst`` already exists (or is
+            pending to be created), ``src`` is already pending to be moved or
+            renamed, or ``dst`` would be an invalid location.
         """
 
         if isinstance(dst, str):
@@ -772,8 +982,11 @@ class Inventory(object):
         # can't rename to self
         if src['onyo.path.name'] == dst.name:
             raise NoopError(f"Cannot rename directory {src['onyo.path.absolute']}. This is already its name.")
+        # the source must not be relocated already
+        if self._is_pending_relocation(src['onyo.path.absolute']):
+            raise ValueError(f"Cannot rename {src['onyo.path.absolute']}: It is already pending to be moved or renamed.")
         # destination must be available
-        if dst.exists():
+        if dst.exists() or dst in self._get_pending_dirs():
             raise ValueError(f"{dst} already exists.")
 
         return [self._add_operation('rename_directories', (src['onyo.path.absolute'], dst))]
@@ -782,16 +995,83 @@ class Inventory(object):
     # non-operation methods
     #
     def get_item(self,
-                 path: Path) -> Item:
+                 path: Path,
+                 content: dict | str | None = None,
+                 readonly: bool = False,
+                 lazy: bool = False) -> Item:
         r"""Get the ``Item`` of ``path``.
 
         Parameters
         ----------
         path
             Path to get as an Item.
+        content
+            YAML content of the asset at ``path``, if already read. Otherwise
+            it is read from disk. A dictionary is content that was already
+            loaded read-only (see
+            :py:func:`onyo.lib.onyo.OnyoRepo.get_asset_content`).
+        readonly
+            Load the content without comments, if possible. This is faster.
+            See :py:func:`onyo.lib.items.Item.update_from_path`.
+        lazy
+            Defer loading the content until a key other than a pseudo-key is
+            accessed. See :py:func:`onyo.lib.items.Item.update_from_path`.
+        """
+
+        if content is None and not readonly and not lazy:
+            return Item(path, self.repo)
+
+        item = Item(repo=self.repo)
+        item.update_from_path(path, content=content, readonly=readonly, lazy=lazy)
+        return item
+
+    def _read_committed_assets(self,
+                               paths: list[Path],
+                               readonly: bool = False) -> dict[Path, dict | str | None]:
+        r"""Read the committed content of asset ``paths`` in a single batch.
+
+        Non-asset paths are skipped. The content of Asset Directories is read
+        from their :py:data:`onyo.lib.consts.ASSET_DIR_FILE_NAME`.
+
+        Content is returned as YAML, so that it is parsed (and any error
+        reported) when loading the Item.
+
+        Parameters
+        ----------
+        paths
+            Paths of Items to read.
+        readonly
+            Serve contents from (and add them to) the
+            :py:attr:`onyo.lib.onyo.OnyoRepo.asset_cache`. Only blobs that are
+            not cached yet are read from git. Cached content is returned as the
+            dictionary :py:func:`onyo.lib.utils.load_readonly` loads, if the
+            cache holds it in parsed form.
         """
 
-        return Item(path, self.repo)
+        files = {(p / ASSET_DIR_FILE_NAME) if self.repo.is_inventory_dir(p) else p: p
+                 for p in paths if self.repo.is_asset_path(p)}
+        contents = {}
+        cache = self.repo.asset_cache if readonly else None
+        if cache is not None:
+            root = self.repo.git.root
+            cached = cache.get_contents(f.relative_to(root) for f in files)
+            missing = cache.get_object_ids(f.relative_to(root) for f in files
+                                           if f.relative_to(root) not in cached)
+            if missing:
+                read = []
+                for oid, blob in self.repo.git.read_objects(set(missing.values())):
+                    try:
+                        read.append((oid, blob.decode()))  # pyre-ignore[16]
+                    except UnicodeDecodeError:
+                        continue
+                cache.add_contents(read)
+                cached.update(cache.get_contents(missing.keys()))
+            contents = {files[root / f]: content for f, content in cached.items()}
+
+        uncached = [f for f, p in files.items() if p not in contents]
+        if uncached:
+            contents.update({files[f]: content for f, content in self.repo.git.read_files(uncached)})
+        return contents
 
     def get_items(self,
                   include: Iterable[Path] | None = None,
@@ -799,7 +1079,10 @@ class Inventory(object):
                   depth: int | None = 0,
                   match: list[Callable[[Item], bool]] | list[list[Callable[[Item], bool]]] | None = None,
                   types: list[Literal['assets', 'directories']] | None = None,
-                  intermediates: bool = True
+                  intermediates: bool = True,
+                  readonly: bool = False,
+                  lazy: bool = False,
+                  path_order: sort_t | None = None
                   ) -> Generator[Item, None, None] | filter:
         r"""Yield all Items matching paths and filters.
 
@@ -831,6 +1114,11 @@ class Inventory(object):
             match. When multiple lists are passed, only one list of Callables
             must match for an Item to match (e.g. each list of Callables is
             connected with a logical ``or``).
+
+            The ``match`` methods of :py:class:`onyo.lib.filters.Filter` are
+            evaluated in order of cost (see :py:class:`onyo.lib.planner.QueryPlan`).
+            Items ruled out by their path or the key index
+            (see :py:attr:`onyo.lib.onyo.OnyoRepo.key_index`) are never read.
         types
             Types of inventory items to consider. Equivalent to
             ``onyo.is.asset=True`` and ``onyo.is.directory=True``.
@@ -840,27 +1128,81 @@ class Inventory(object):
         intermediates
             Return intermediate directory items. If ``False``, the only directories
             explicitly contained in the returned list are leaves.
+        readonly
+            Load Items for reading only. See :py:func:`get_item`.
+        lazy
+            Defer loading the content of Items until a key other than a
+            pseudo-key is accessed. Queries and filters that only involve
+            pseudo-keys then do not read any asset. Errors of loading are
+            raised on access, rather than being reported while collecting Items.
+        path_order
+            Yield Items in natural order of ``onyo.path.relative`` (see
+            :py:func:`onyo.lib.command_utils.natural_sort`), either
+            :py:data:`onyo.lib.consts.SORT_ASCENDING` or
+            :py:data:`onyo.lib.consts.SORT_DESCENDING`. Only the paths are
+            sorted, so Items are still yielded as soon as they are read.
+            Default is the order of :py:func:`onyo.lib.onyo.OnyoRepo.get_item_paths`.
         """
 
         depth = 0 if depth is None else depth
 
         match = [[]] if match is None else match
         match = [match] if isinstance(match[0], Callable) else match  # pyre-ignore [9]
-
-        for p in self.repo.get_item_paths(include=include,
-                                          exclude=exclude,
-                                          depth=depth,
-                                          types=types,
-                                          intermediates=intermediates):
-            try:
-                item = self.get_item(p)
-                # check against filters
-                if any([all([f(item) for f in m]) for m in match]):  # pyre-ignore [16]
-                    yield item
-
-            except NotAnAssetError as e:
-                # report the error, and proceed
-                ui.error(e)
+        # The key index reflects HEAD, and thus can only be used with a clean
+        # worktree.
+        clean = None
+        key_index = None
+        if self.repo.get_index_keys():
+            clean = self.repo.git.is_clean_worktree()
+            key_index = self.repo.key_index if clean else None
+        plan = QueryPlan(match, key_index=key_index, root=self.root)  # pyre-ignore [6]
+
+        paths = self.repo.get_item_paths(include=include,
+                                         exclude=exclude,
+                                         depth=depth,
+                                         types=types,
+                                         intermediates=intermediates)
+
+        # Rule out (or match) items by their path and the key index before
+        # reading any content.
+        prefiltered = dict()
+        decided = set()
+        if plan.prefilters:
+            for p in paths:
+                item = self.get_item(p, readonly=readonly, lazy=True)
+                result = plan.prefilter(item)
+                if result is not False:
+                    prefiltered[p] = item
+                if result:
+                    decided.add(p)
+            paths = list(prefiltered)
+
+        if path_order:
+            sort_key = natsort_key('onyo.path.relative')
+            paths = sorted(paths,
+                           key=lambda p: sort_key(p.relative_to(self.root)),
+                           reverse=path_order == SORT_DESCENDING)
+
+        # With a clean worktree, the committed blobs are identical to the files
+        # on disk. Stream them from the object store in batches instead.
+        from_head = bool(paths) and not lazy and \
+            (self.repo.git.is_clean_worktree() if clean is None else clean)
+
+        for i in range(0, len(paths), self.READ_BATCH_SIZE):
+            batch = paths[i:i + self.READ_BATCH_SIZE]
+            contents = self._read_committed_assets(batch, readonly=readonly) if from_head else dict()
+            for p in batch:
+                try:
+                    item = prefiltered.get(p) if lazy else None
+                    if item is None:
+                        item = self.get_item(p, content=contents.get(p), readonly=readonly, lazy=lazy)
+                    # check against filters; cheap ones first
+                    if p in decided or plan(item):
+                        yield item
+
+                except NotAnAssetError as e:
+                    # report the error, and proceed
+                    ui.error(e)
 
     def get_templates(self,
                       template: Path | None,
@@ -896,34 +1238,27 @@ class Inventory(object):
         Raises
         ------
         ValueError
-            The configuration 'onyo.assets.name-format' is missing or ``asset``
-            does not contain all keys/values needed to generate the asset name.
+            The configuration 'onyo.assets.name-format' is missing or invalid, or
+            ``asset`` does not contain all keys/values needed to generate the
+            asset name.
         """
 
-        config_str = self.repo.get_config("onyo.assets.name-format")
-        if not config_str:
+        name_format = self.repo.get_asset_name_format()
+        if not name_format:
             raise ValueError("Missing config 'onyo.assets.name-format'.")
 
-        # Replace key references so that the same dot notation as in CLI works, while actual
-        # format-language features using the dot work as well.
-        # Example: config string: "{some.more:.3}"
-        #          results in : "{asset[some.more]:.3}"
-        for name in self.repo.get_asset_name_keys():
-            config_str = config_str.replace(f"{{{name}", f"{{asset[{name}]")
-
-        try:
-            name = config_str.format(asset=asset)
-        except KeyError as e:
-            raise ValueError(f"Asset missing value for required field {str(e)}.") from e
-
-        return name
+        return name_format.format_name(asset)
 
     def get_faux_serials(self,
                          num: int = 1,
                          length: int = 8) -> set[str]:
         r"""Generate a set of unique faux serials.
 
-        The generated faux serials are unique within the set and repository.
+        The generated faux serials are unique within the set, the repository,
+        and the serials handed out to pending operations. The serials in use are
+        indexed on the first call. Every serial generated afterwards is reserved
+        until the pending operations are committed or discarded (see
+        :py:func:`reset`), so each serial is generated in constant time.
 
         The minimum serial length of 5 offers a serial space of 36^5 (~60.5
         million). That is (arbitrarily) determined to be the highest acceptable
@@ -951,14 +1286,18 @@ class Inventory(object):
         if num < 1:
             raise ValueError('The number of faux serial numbers must be >= 1.')
 
+        if self._faux_serials is None:
+            self._faux_serials = {p.name.rsplit('faux', 1)[1]
+                                  for p in [*self.repo.asset_paths, *self.operations.new_assets]
+                                  if 'faux' in p.name}
+        reserved = self._faux_serials
+
         alphanum = string.ascii_uppercase + string.digits
         faux_serials = set()
-        # TODO: This split actually puts the entire filename in the set if there's no "faux".
-        repo_faux_serials = {str(x.name).split('faux')[-1] for x in self.repo.asset_paths}
-
         while len(faux_serials) < num:
             serial = ''.join(random.choices(alphanum, k=length))
-            if serial not in repo_faux_serials:
+            if serial not in reserved:
+                reserved.add(serial)
                 faux_serials.add(f'faux{serial}')
 
         return faux_serials
@@ -980,9 +1319,10 @@ class Inventory(object):
             A required key has an empty value.
         """
 
+        keys = self.repo.get_asset_name_keys()
         if any(key not in asset or asset[key] is None or not str(asset[key]).strip()
-               for key in self.repo.get_asset_name_keys()):
-            raise ValueError(f"Required asset keys ({', '.join(self.repo.get_asset_name_keys())})"
+               for key in keys):
+            raise ValueError(f"Required asset keys ({', '.join(keys)})"
                              f" must not have empty values.")
 
     def raise_empty_keys(self,
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from collections import UserDict
+from contextlib import contextmanager
 from copy import deepcopy
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -26,7 +28,9 @@ from onyo.lib.utils import (
 if TYPE_CHECKING:
     from typing import (
         Any,
+        Callable,
         Generator,
+        Literal,
         Mapping,
         TypeVar,
     )
@@ -57,6 +61,21 @@ def resolve_alias(key: _KT,
         return key
 
 
+def is_pseudo_key(key: _KT,
+                  alias_map: Mapping[str, str] | None = None) -> bool:
+    r"""Whether a key (or the key it is an alias of) is in the ``onyo`` namespace.
+
+    Parameters
+    ----------
+    key
+        Key name to check.
+    alias_map
+        Dictionary mapping aliases to key names.
+    """
+
+    return isinstance(key, str) and resolve_alias(key, alias_map=alias_map).split('.')[0] == 'onyo'
+
+
 class ItemSpec(UserDict):
     r"""Nested dictionaries of static instructions to create an ``Item``.
 
@@ -366,9 +385,12 @@ class Item(ItemSpec):
         # - sanity check of incoming Path or ItemSpec (specifically
         #   path-related keys)
 
+        # set first; accessing `data` depends on it
+        self._load: Callable[[], None] | None = None
         super().__init__()
         self.repo: OnyoRepo | None = repo
         self._path: Path | None = None
+        self._reload: Callable[[], dict] | None = None
         self._alias_map: Mapping[str, str] = PSEUDOKEY_ALIASES
         self.data = CommentedMap()
         self.update(PSEUDO_KEYS)
@@ -379,6 +401,7 @@ class Item(ItemSpec):
             #            loaded above rather than only updating the ones that are specified in the incoming object.
             case Item():
                 self._path = item._path
+                self._reload = item._reload
                 self.data = deepcopy(item.data)
             case ItemSpec():
                 self.data = deepcopy(item.data)
@@ -392,6 +415,82 @@ class Item(ItemSpec):
         if kwargs:
             self.update(**kwargs)
 
+    def __deepcopy__(self,
+                     memo: dict) -> Item:
+        r"""Deep copy the Item, but share (rather than copy) its repository."""
+
+        memo[id(self.repo)] = self.repo
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        for k, v in self.__dict__.items():
+            setattr(new, k, deepcopy(v, memo))
+
+        return new
+
+    def __copy__(self) -> Item:
+        r"""Shallow copy the Item, loading deferred content first.
+
+        The content is stored in ``_data`` (see :py:attr:`data`), which
+        ``UserDict.__copy__`` does not know about.
+        """
+
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.__dict__['_data'] = self.data.copy()
+        new.__dict__['_load'] = None
+        return new
+
+    @property
+    def data(self) -> dict:
+        r"""The underlying dictionary.
+
+        Content whose loading was deferred (see :py:func:`update_from_path`)
+        is loaded first.
+        """
+
+        if self._load is not None:
+            load, self._load = self._load, None
+            load()
+
+        return self._data
+
+    @data.setter
+    def data(self,
+             value: dict) -> None:
+        self._load = None
+        self._data = value
+
+    @contextmanager
+    def _deferred_load(self,
+                       key: _KT) -> Generator[None, None, None]:
+        r"""Keep deferring the load of content while accessing a pseudo-key.
+
+        Pseudo-keys are not part of the content, and thus don't require it.
+        """
+
+        load = self._load if is_pseudo_key(key, alias_map=self._alias_map) else None
+        if load is None:
+            yield
+            return
+
+        self._load = None
+        try:
+            yield
+        finally:
+            self._load = load
+
+    def __delitem__(self,
+                    key: _KT) -> None:
+        r"""Remove a ``key`` from self.
+
+        Content that was loaded read-only is reloaded for round-trip first,
+        unless ``key`` is a pseudo-key.
+        """
+
+        self._load_roundtrip(key)
+        with self._deferred_load(key):
+            super().__delitem__(key)
+
     def __getitem__(self,
                     key: _KT) -> Any:
         r"""Get the value of a ``key``.
@@ -404,7 +503,8 @@ class Item(ItemSpec):
         yet evaluated pseudo-key.
         """
 
-        value = super().__getitem__(key)
+        with self._deferred_load(key):
+            value = super().__getitem__(key)
 
         if key in PSEUDO_KEYS and isinstance(value, PseudoKey):
             # Value still is the pseudo-key definition.
@@ -415,6 +515,19 @@ class Item(ItemSpec):
 
         return value
 
+    def __setitem__(self,
+                    key: _KT,
+                    value: _VT) -> None:
+        r"""Set the value of a key.
+
+        Content that was loaded read-only is reloaded for round-trip first,
+        unless ``key`` is a pseudo-key.
+        """
+
+        self._load_roundtrip(key)
+        with self._deferred_load(key):
+            super().__setitem__(key, value)
+
     def _fill_created(self,
                       key: str | None = None) -> str | None:
         r"""Initializer for the ``'onyo.was.created'`` pseudo-keys.
@@ -428,27 +541,7 @@ class Item(ItemSpec):
             Name of pseudo-key to get the value of.
         """
 
-        # TODO: This is based on `git log --follow <path>`. The first appearance
-        #       of 'new_assets'/'new_directories' should be the match. However,
-        #       this is known to be problematic, both due to `git` and if the
-        #       Python interface was used. A more robust solution will involve a
-        #       more involved parsing of Inventory Operation records, and
-        #       tracing history and moves, etc.
-
-        if self['onyo.is.template']:
-            # Templates aren't tracked by inventory operations (only in git).
-            # Thus there are no operations records to be parsed.
-            return None
-
-        if self.repo and self['onyo.path.absolute']:
-            for commit in self.repo.get_history(self['onyo.path.file']):  # pyre-ignore[16]
-                if 'operations' in commit:
-                    if (self['onyo.is.asset'] and commit['operations']['new_assets']) or \
-                            (self['onyo.is.directory'] and commit['operations']['new_directories']):
-                        self['onyo.was.created'] = commit.data
-                        return commit[key] if key else None
-
-            return None
+        return self._fill_was('created', key)
 
     def _fill_modified(self,
                        key: str | None = None) -> str | None:
@@ -463,25 +556,36 @@ class Item(ItemSpec):
             Name of pseudo-key to get the value of.
         """
 
-        # TODO: see `fill_created()` todo.
+        return self._fill_was('modified', key)
+
+    def _fill_was(self,
+                  which: Literal['created', 'modified'],
+                  key: str | None = None) -> str | None:
+        r"""Helper for :py:func:`_fill_created` and :py:func:`_fill_modified`.
+
+        The commits are resolved for all items of the repository at once (see
+        :py:func:`onyo.lib.onyo.OnyoRepo.get_was_commits`).
+
+        Parameters
+        ----------
+        which
+            Whether to fill ``'onyo.was.created'`` or ``'onyo.was.modified'``.
+        key
+            Name of pseudo-key to get the value of.
+        """
 
         if self['onyo.is.template']:
             # Templates aren't tracked by inventory operations (only in git).
             # Thus there are no operations records to be parsed.
             return None
 
-        if self.repo and self['onyo.path.absolute']:
-            for commit in self.repo.get_history(self['onyo.path.file']):  # pyre-ignore[16]
-                if 'operations' in commit:
-                    if (self['onyo.is.asset'] and
-                        (commit['operations']['modify_assets'] or
-                         commit['operations']['new_assets'])) or \
-                       (self['onyo.is.directory'] and
-                        (commit['operations']['new_directories'] or
-                         commit['operations']['move_directories'] or
-                         commit['operations']['rename_directories'])):
-                        self['onyo.was.modified'] = commit.data
-                        return commit[key] if key else None
+        if self.repo and self['onyo.path.absolute'] and \
+                (self['onyo.is.asset'] or self['onyo.is.directory']):
+            commit = self.repo.get_was_commits(self['onyo.path.absolute'])[which]
+            if commit:
+                # copy, since the commit is shared among all items it refers to
+                self[f'onyo.was.{which}'] = deepcopy(commit)
+                return self[f'onyo.was.{which}.{key}'] if key else None
 
         return None
 
@@ -562,8 +666,7 @@ class Item(ItemSpec):
         r"""Initializer for the ``'onyo.is.empty'`` pseudo-key."""
 
         if self['onyo.is.directory'] and self.repo and self._path:
-            # TODO: This likely can be faster when redoing/enhancing caching of repo paths.
-            return not any(p.parent == self._path for p in self.repo.asset_paths)
+            return not any(self.repo.is_asset_path(p) for p in self.repo.path_index.get_children(self._path))
 
         return None
 
@@ -575,8 +678,36 @@ class Item(ItemSpec):
 
         return self._path == self.repo.template_dir or self.repo.template_dir in self._path.parents   # pyre-ignore[16]
 
+    def _load_roundtrip(self,
+                        key: _KT | None = None) -> None:
+        r"""Reload content that was loaded read-only, including comments and formatting.
+
+        Pseudo-keys are kept as they are.
+
+        Parameters
+        ----------
+        key
+            Key about to be modified. Pseudo-keys do not require a reload.
+        """
+
+        if self._reload is None or is_pseudo_key(key, alias_map=self._alias_map):
+            return
+
+        reload, self._reload = self._reload, None
+        map_from_file = reload()
+        pseudo_keys = self.data.get('onyo')
+        self.data = CommentedMap()
+        if pseudo_keys is not None:
+            self.data['onyo'] = pseudo_keys
+        self.update(map_from_file)
+        if hasattr(map_from_file, 'copy_attributes'):
+            map_from_file.copy_attributes(self.data)  # pyre-ignore[16]
+
     def update_from_path(self,
-                         path: Path) -> None:
+                         path: Path,
+                         content: dict | str | None = None,
+                         readonly: bool = False,
+                         lazy: bool = False) -> None:
         r"""Update the internal dictionary with key/values from a YAML file.
 
         YAML comments are preserved on a best-effort basis. There is no
@@ -587,6 +718,18 @@ class Item(ItemSpec):
         ----------
         path
             Path of YAML file to update from.
+        content
+            Content of the asset at ``path``, if already read (YAML, or a
+            dictionary loaded read-only). Only used for asset paths of a
+            repository.
+        readonly
+            Load the content as plain Python objects without comments, if
+            possible. This is faster, and suitable for Items that are only
+            read. The content is reloaded with comments once a (non-pseudo)
+            key is set or deleted, or :py:func:`yaml` is called.
+        lazy
+            Defer loading the content until a key other than a pseudo-key is
+            accessed. Errors of loading are deferred as well.
         """
 
         from onyo.lib.utils import get_asset_content
@@ -594,7 +737,7 @@ class Item(ItemSpec):
         self._path = path
 
         if self.repo and self.repo.is_asset_path(path):
-            loader = self.repo.get_asset_content
+            loader = partial(self.repo.get_asset_content, content=content)
         elif path.is_file():
             loader = get_asset_content
         elif (path / ASSET_DIR_FILE_NAME).is_file():
@@ -607,12 +750,27 @@ class Item(ItemSpec):
         else:
             return
 
-        map_from_file = loader(path)
+        self._load = None
+        self._reload = None
+        if lazy:
+            self._load = partial(self._update_from_loader, loader, path, readonly)
+        else:
+            self._update_from_loader(loader, path, readonly)
+
+    def _update_from_loader(self,
+                            loader: Callable[..., dict],
+                            path: Path,
+                            readonly: bool) -> None:
+        r"""Update the internal dictionary with the content ``loader`` returns for ``path``."""
+
+        map_from_file = loader(path, readonly=readonly)
         self.update(map_from_file)
         if hasattr(map_from_file, 'copy_attributes'):
             # We got a (subclass of) ruamel.yaml.CommentBase.
             # Copy the attributes re comments, format, etc. for roundtrip.
             map_from_file.copy_attributes(self.data)  # pyre-ignore[16]
+        elif readonly:
+            self._reload = partial(loader, path)
 
     def yaml(self,
              exclude: list | None = None) -> str:
@@ -626,6 +784,7 @@ class Item(ItemSpec):
             excluded.
         """
 
+        self._load_roundtrip()
         exclude = exclude or RESERVED_KEYS
         return super().yaml(exclude)
 
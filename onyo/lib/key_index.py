@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from onyo.lib.sqlite_cache import SQLiteCache
+from onyo.lib.ui import ui
+
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Iterable,
+    )
+
+log: logging.Logger = logging.getLogger('onyo.key_index')
+
+_MAX_CHAR = chr(0x10FFFF)
+r"""Upper bound of characters, to look up values by prefix via a range."""
+
+
+def _get_value(content: dict,
+               key: str) -> tuple[bool, Any]:
+    r"""Get the value of a (dot-notation) ``key`` in ``content``.
+
+    Returns
+    -------
+    tuple
+        Whether ``key`` is set, and its value.
+    """
+
+    value = content
+    for part in key.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return False, None
+        value = value[part]
+
+    return True, value
+
+
+class KeyIndex(SQLiteCache):
+    r"""Persistent inverted index of the values of content keys (key → value → paths).
+
+    Only the keys configured via ``onyo.index.keys`` are indexed. The index is
+    built from the files of the commit it was last updated to (:py:attr:`head`).
+    Changes are applied via :py:func:`update`, so that only the files that
+    differ from the previous commit need to be read.
+
+    Scalar values are indexed by their string representation, which is what a
+    :py:class:`onyo.lib.filters.Filter` matches against. A file whose value of
+    a key is a structure (dictionary or list) is indexed as *undecided* for that
+    key, and a file that is not valid YAML as undecided for all keys. Their
+    content must be read to decide whether they match.
+
+    The database is an SQLite file, usually at ``.git/onyo/keys.sqlite``. It is
+    a cache and can be deleted at any time. It is rebuilt if the indexed keys
+    change.
+
+    Attributes
+    ----------
+    path
+        The Path of the database file.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        path TEXT NOT NULL,
+        key TEXT,
+        value TEXT
+    );
+    CREATE INDEX IF NOT EXISTS entries_key_value ON entries (key, value);
+    CREATE INDEX IF NOT EXISTS entries_path ON entries (path);
+    """
+
+    TABLES = ('entries',)
+
+    @property
+    def keys(self) -> list[str]:
+        r"""The indexed keys."""
+
+        keys = self._get_meta('keys')
+        return keys.split(' ') if keys else []
+
+    def clear(self,
+              keys: list[str] | None = None) -> None:
+        r"""Remove all entries from the index.
+
+        Parameters
+        ----------
+        keys
+            The keys to index from now on. Default is to keep the current keys.
+        """
+
+        keys = self.keys if keys is None else keys
+        self._reset({'keys': ' '.join(keys)})
+
+    def update(self,
+               changes: Iterable[tuple[Path, dict | None]],
+               removed: Iterable[Path],
+               head: str) -> None:
+        r"""Apply changed files to the index.
+
+        All changes are applied in a single transaction.
+
+        Parameters
+        ----------
+        changes
+            Tuples of the Path (relative to the root of the repository) of a
+            file and its parsed content. ``None`` if the content is not valid.
+        removed
+            Paths (relative to the root of the repository) of removed files.
+        head
+            The hexsha of the commit the index is up-to-date with afterwards.
+        """
+
+        keys = self.keys
+        paths = []
+        entries = []
+        for path, content in changes:
+            path = path.as_posix()
+            paths.append((path,))
+            if content is None:
+                entries.append((path, None, None))
+                continue
+
+            for key in keys:
+                is_set, value = _get_value(content, key)
+                if is_set:
+                    entries.append((path, key, None if isinstance(value, (dict, list)) else str(value)))
+
+        paths.extend((p.as_posix(),) for p in removed)
+        with self._db:
+            self._db.executemany("DELETE FROM entries WHERE path = ?", paths)
+            self._db.executemany("INSERT INTO entries VALUES (?, ?, ?)", entries)
+            self._set_meta('head', head)
+
+        ui.log_debug(f"Updated key index with {len(paths)} changes at {head}")
+
+    def lookup(self,
+               key: str,
+               value: str,
+               prefix: bool = False) -> tuple[set[Path], set[Path]]:
+        r"""Get the files whose value of ``key`` matches ``value``.
+
+        Parameters
+        ----------
+        key
+            An indexed key.
+        value
+            The string representation of the value to look up.
+        prefix
+            Look up values that start with ``value`` (and have no line break
+            after it), rather than equal it.
+
+        Returns
+        -------
+        tuple
+            The Paths (relative to the root of the repository) of files that
+            match, and of files that are undecided (see :py:class:`KeyIndex`).
+            Other files do not match.
+        """
+
+        if prefix:
+            rows = self._db.execute("SELECT path, value FROM entries "
+                                    "WHERE key = ? AND value >= ? AND value < ?",
+                                    (key, value, value + _MAX_CHAR))
+        else:
+            rows = self._db.execute("SELECT path, value FROM entries WHERE key = ? AND value = ?",
+                                    (key, value))
+
+        matches = set()
+        undecided = set()
+        for path, v in rows:
+            # `.*` does not match line breaks
+            (undecided if prefix and '\n' in v[len(value):] else matches).add(Path(path))
+
+        rows = self._db.execute("SELECT path FROM entries WHERE (key = ? AND value IS NULL) OR key IS NULL",
+                                (key,))
+        undecided.update(Path(path) for path, in rows)
+
+        return matches, undecided
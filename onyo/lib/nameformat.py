@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import logging
+import re
+from string import Formatter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Mapping,
+        Pattern,
+    )
+
+log: logging.Logger = logging.getLogger('onyo.nameformat')
+
+
+_CONVERSIONS = {'s': str, 'r': repr, 'a': ascii}
+r"""Conversions of format fields (e.g. ``{serial!r}``)."""
+
+
+def _get_key(field: str,
+             conversion: str | None) -> str:
+    r"""Get the key a format field references, validating the field.
+
+    Raises
+    ------
+    ValueError
+        The field does not reference a key, or has an unknown conversion.
+    """
+
+    key = re.match(r'[\w.]+', field)
+    if not key:
+        raise ValueError(f"The field '{{{field}}}' of the asset name format does not reference a key.")
+    if conversion and conversion not in _CONVERSIONS:
+        raise ValueError(f"Unknown conversion '!{conversion}' in the asset name format.")
+
+    return key.group()
+
+
+def _as_template_field(field: str,
+                       conversion: str | None,
+                       spec: str | None,
+                       keys: list[str]) -> str:
+    r"""Get a format field that looks up its key (and nested keys) in ``asset``.
+
+    E.g. ``{some.more:{width}}`` becomes ``{asset[some.more]:{asset[width]}}``,
+    so that keys in dot notation can be used, while format-language features
+    using the dot work as well. Nested keys are appended to ``keys``.
+    """
+
+    key = _get_key(field, conversion)
+    nested = ''
+    for literal, f, s, c in Formatter().parse(spec or ''):
+        nested += literal.replace('{', '{{').replace('}', '}}')
+        if f is not None:
+            if (k := _get_key(f, c)) not in keys:
+                keys.append(k)
+            nested += _as_template_field(f, c, s, keys)
+
+    return f"{{asset[{key}]{field[len(key):]}{'!' + conversion if conversion else ''}" \
+           f"{':' + nested if nested else ''}}}"
+
+
+class AssetNameFormat(object):
+    r"""An asset name format (``onyo.assets.name-format``), compiled once.
+
+    The format is validated and split into its literal text and fields when it
+    is compiled, so that generating an asset name (see :py:func:`format`) only
+    needs to look up and format the values of its keys.
+
+    Asset names can be parsed back into the values of the keys they were
+    generated from. A name is only parsed if the result is unambiguous (e.g.
+    the name ``a_b_c.d`` is ambiguous for the format ``{type}_{make}.{serial}``).
+    Keys with format specifications or conversions (e.g. ``{model.name:.3}``)
+    cannot be recovered, and are thus not among the parsed keys.
+
+    Attributes
+    ----------
+    format
+        The format string.
+    required_keys
+        The keys needed to generate an asset name.
+    keys
+        The keys that can be parsed from an asset name.
+    """
+
+    def __init__(self,
+                 format_str: str) -> None:
+        r"""Compile an asset name format.
+
+        Parameters
+        ----------
+        format_str
+            The asset name format (see ``onyo.assets.name-format``).
+
+        Raises
+        ------
+        ValueError
+            ``format_str`` is not a valid format string, or has a field that
+            does not reference a key.
+        """
+
+        self.format: str = format_str
+        self.required_keys: list[str] = []
+        self.keys: list[str] = []
+        self._groups: dict[str, list[str]] = {}
+        # literal text and fields (key, conversion, format specification) to generate names from
+        self._fields: list[tuple[str, str | None, str | None, str]] = []
+        # `str.format` template for fields that index into a value (e.g. `{key[0]}`)
+        # or have nested fields in their format specification
+        template = ''
+        simple = True
+
+        lazy = greedy = ''
+        for i, (literal, field, spec, conversion) in enumerate(Formatter().parse(format_str)):
+            lazy += re.escape(literal)
+            greedy += re.escape(literal)
+            template += literal.replace('{', '{{').replace('}', '}}')
+            if field is None:
+                self._fields.append((literal, None, None, ''))
+                continue
+
+            key = _get_key(field, conversion)
+            if key not in self.required_keys:
+                self.required_keys.append(key)
+            self._fields.append((literal, key, conversion, spec or ''))
+            template += _as_template_field(field, conversion, spec, self.required_keys)
+            simple = simple and key == field and '{' not in (spec or '')
+
+            group = f'g{i}'
+            lazy += f'(?P<{group}>.+?)'
+            greedy += f'(?P<{group}>.+)'
+            if spec or conversion or not re.fullmatch(r'[\w.]+', field):
+                # the value cannot be recovered from the name
+                continue
+
+            if field not in self._groups:
+                self.keys.append(field)
+            self._groups.setdefault(field, []).append(group)
+
+        self._lazy: Pattern = re.compile(lazy, flags=re.DOTALL)
+        self._greedy: Pattern = re.compile(greedy, flags=re.DOTALL)
+        self._template: str | None = None if simple else template
+
+    def format_name(self,
+                    asset: Mapping[str, Any]) -> str:
+        r"""Generate the name of ``asset``.
+
+        Parameters
+        ----------
+        asset
+            Asset to generate the name for. Keys are looked up in dot notation
+            (e.g. ``model.name``), just like with an :py:class:`onyo.lib.items.Item`.
+
+        Raises
+        ------
+        ValueError
+            ``asset`` does not contain all keys needed to generate the name.
+        """
+
+        try:
+            if self._template is not None:
+                return self._template.format(asset=asset)
+
+            name = ''
+            for literal, key, conversion, spec in self._fields:
+                name += literal
+                if key is not None:
+                    value = asset[key]
+                    if conversion:
+                        value = _CONVERSIONS[conversion](value)
+                    name += format(value, spec)
+        except KeyError as e:
+            raise ValueError(f"Asset missing value for required field {str(e)}.") from e
+
+        return name
+
+    def parse(self,
+              name: str) -> dict[str, str] | None:
+        r"""Get the values of :py:attr:`keys` that ``name`` was generated from.
+
+        The lazy and the greedy match of the format agree only if there is a
+        single way to match ``name``. Otherwise, the name is ambiguous.
+
+        Parameters
+        ----------
+        name
+            Asset name to parse.
+
+        Returns
+        -------
+        dict[str, str] | None
+            The values of the keys by key name. ``None`` if ``name`` does not
+            match the format or is ambiguous.
+        """
+
+        lazy = self._lazy.fullmatch(name)
+        if not lazy:
+            return None
+
+        greedy = self._greedy.fullmatch(name)
+        if not greedy or lazy.groupdict() != greedy.groupdict():
+            return None
+
+        values = dict()
+        for key, groups in self._groups.items():
+            found = {lazy.group(g) for g in groups}
+            if len(found) != 1:
+                # the same key can't have different values
+                return None
+            values[key] = found.pop()
+
+        return values
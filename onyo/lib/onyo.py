@@ -2,15 +2,20 @@ from __future__ import annotations
 
 import logging
 import shutil
+import sqlite3
 import subprocess
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from onyo.lib.asset_cache import AssetCache
 from onyo.lib.consts import (
     ANCHOR_FILE_NAME,
     ASSET_DIR_FILE_NAME,
+    GIT_CACHE_DIR,
     IGNORE_FILE_NAME,
     KNOWN_REPO_VERSIONS,
+    MAINTENANCE_AUTO_TASKS,
+    MAINTENANCE_TASKS,
     ONYO_CONFIG,
     ONYO_DIR,
     TEMPLATE_DIR,
@@ -21,10 +26,17 @@ from onyo.lib.exceptions import (
     OnyoProtectedPathError
 )
 from onyo.lib.git import GitRepo
+from onyo.lib.ignore import IgnoreMatcher
 from onyo.lib.items import (
     Item,
     ItemSpec,
+    is_pseudo_key,
 )
+from onyo.lib.key_index import KeyIndex
+from onyo.lib.nameformat import AssetNameFormat
+from onyo.lib.operations_index import OperationsIndex
+from onyo.lib.pathindex import PathIndex
+from onyo.lib.pseudokeys import PSEUDOKEY_ALIASES
 from onyo.lib.ui import ui
 from onyo.lib.utils import (
     get_asset_content,
@@ -39,6 +51,8 @@ if TYPE_CHECKING:
         Literal,
     )
 
+    from onyo.lib.git import fast_import_change_t
+
 log: logging.Logger = logging.getLogger('onyo.onyo')
 
 
@@ -88,6 +102,22 @@ class OnyoRepo(object):
         self.template_dir = self.git.root / TEMPLATE_DIR
         self.onyo_config = self.git.root / ONYO_CONFIG
 
+        # caches
+        self._asset_paths: list[Path] | None = None
+        self._path_index: PathIndex | None = None
+        self._path_index_epoch: int = -1
+        self._path_index_head: str | None = None
+        self._ignore_matcher: IgnoreMatcher | None = None
+        self._was_commits: dict[Path, dict[str, dict | None]] = {}
+        self._was_commits_head: str | None = None
+        self._operations_index: OperationsIndex | None = None
+        self._asset_cache: AssetCache | None = None
+        self._key_index: KeyIndex | None = None
+        # config snapshot, loaded per layer ('git' and 'onyo') on first use
+        self._config_cache: dict[str, dict[str, str]] = dict()
+        self._name_format: AssetNameFormat | None = None
+        self.version: str | None = None
+
         if init:
             if find_root:
                 raise ValueError("`find_root=True` must not be used with `init=True`")
@@ -96,13 +126,9 @@ class OnyoRepo(object):
         else:
             self.validate_onyo_repo()
 
-        self.version = self.git.get_config('onyo.repo.version', self.onyo_config)
+        self.version = self._get_config_layer('onyo').get('onyo.repo.version')
         ui.log_debug(f"Onyo repo (version {self.version}) found at '{self.git.root}'")
 
-        # caches
-        self._asset_paths: list[Path] | None = None
-        self._config_cache: dict[str, dict[str, str]] = {'git': {}, 'onyo': {}}
-
     def set_config(self,
                    key: str,
                    value: str,
@@ -131,12 +157,36 @@ class OnyoRepo(object):
         if self.version == '1' and key == 'onyo.assets.name-format':
             key = 'onyo.assets.filename'
 
-        # clear the config cache
-        self._config_cache = {'git': {}, 'onyo': {}}
-
         # set
         loc = ONYO_CONFIG if location == 'onyo' else location
-        return self.git.set_config(key=key, value=value, location=loc)
+        self.git.set_config(key=key, value=value, location=loc)
+        self.clear_config_cache()
+
+    def clear_config_cache(self) -> None:
+        r"""Clear the config snapshot, so that it is reloaded on next access.
+
+        This is done automatically by :py:func:`set_config`, and by
+        :py:func:`commit` if it commits :py:data:`onyo.lib.consts.ONYO_CONFIG`.
+        """
+
+        self._config_cache = dict()
+
+    def _get_config_layer(self,
+                          layer: Literal['git', 'onyo']) -> dict[str, str]:
+        r"""Get all keys and values of a config layer, loading it if necessary.
+
+        Parameters
+        ----------
+        layer
+            ``'git'`` for git's normal git-config locations (with their order of
+            precedence already applied), or ``'onyo'`` for
+            :py:data:`onyo.lib.consts.ONYO_CONFIG`.
+        """
+
+        if layer not in self._config_cache:
+            self._config_cache[layer] = self.git.get_config_list(self.onyo_config if layer == 'onyo' else None)
+
+        return self._config_cache[layer]
 
     def get_config(self,
                    key: str) -> str | None:
@@ -145,11 +195,13 @@ class OnyoRepo(object):
         This first checks git's normal git-config locations and then
         :py:data:`onyo.lib.consts.ONYO_CONFIG` as a fallback.
 
-        The results are cached, which are cleared automatically by
-        :py:func:`commit` and :py:func:`set_config`.
+        All keys of both are loaded into a snapshot with one call of
+        ``git config --list`` each, on first access. The snapshot is cleared
+        automatically by :py:func:`set_config`, and by :py:func:`commit` if it
+        commits :py:data:`onyo.lib.consts.ONYO_CONFIG`.
 
-        If changes are made by other means, use :py:func:`clear_cache` to reset
-        the cache.
+        If changes are made by other means, use :py:func:`clear_config_cache`
+        (or :py:func:`clear_cache`) to reset the snapshot.
 
         Parameters
         ----------
@@ -161,55 +213,16 @@ class OnyoRepo(object):
                   KEY = VALUE
         """
 
-        value = None
-
         # repo version shim
         if self.version == '1' and key == 'onyo.assets.name-format':
             key = 'onyo.assets.filename'
 
-        #
-        # check cache
-        #
-        cache_hit = False
-
-        try:
-            # git
-            value = self._config_cache['git'][key]
-            ui.log_debug(f"config '{key}' acquired from cache of git config: '{value}'")
-            cache_hit = True
-        except KeyError:
-            cache_hit = False
-            pass
-
+        key = self.git.normalize_config_key(key)
+        value = self._get_config_layer('git').get(key)
         if value is None:
-            # onyo
-            try:
-                value = self._config_cache['onyo'][key]
-                ui.log_debug(f"config '{key}' acquired from cache of onyo config: '{value}'")
-                cache_hit = True
-            except KeyError:
-                cache_hit = False
-                pass
-
-        if cache_hit:
-            return value
-
-        #
-        # query actual config files
-        #
-        ui.log_debug(f"config '{key}' cache miss")
-
-        # query the full git config stack
-        value = self.git.get_config(key)
-        self._config_cache['git'][key] = value  # pyre-ignore[6]
-
-        if value is not None:
-            return value
-
-        # query .onyo/config
-        value = self.git.get_config(key, self.onyo_config)
-        self._config_cache['onyo'][key] = value  # pyre-ignore[6]
+            value = self._get_config_layer('onyo').get(key)
 
+        ui.log_debug(f"config '{key}' acquired from config snapshot: '{value}'")
         return value
 
     @property
@@ -230,33 +243,95 @@ class OnyoRepo(object):
         # default - applies if config isn't set or has an invalid value
         return True
 
+    @property
+    def commit_engine(self) -> Literal['porcelain', 'plumbing']:
+        r"""The configured value of ``onyo.commit.engine``."""
+
+        raw = self.get_config("onyo.commit.engine")
+        if raw:
+            from_cfg = raw.strip().lower()
+            if from_cfg in ["porcelain", "plumbing"]:
+                return from_cfg  # pyre-ignore[7]
+
+            ui.log(f"Invalid config value \"{raw}\" for 'onyo.commit.engine'. Using default \"porcelain\".",
+                   level=logging.WARNING)
+
+        # default - applies if config isn't set or has an invalid value
+        return 'porcelain'
+
+    @property
+    def maintenance_auto(self) -> int:
+        r"""The configured value of ``onyo.maintenance.auto``.
+
+        ``0`` disables automatic maintenance.
+        """
+
+        raw = self.get_config("onyo.maintenance.auto")
+        if raw:
+            try:
+                value = int(raw)
+                if value >= 0:
+                    return value
+            except ValueError:
+                pass
+
+            ui.log(f"Invalid config value \"{raw}\" for 'onyo.maintenance.auto'. Using default \"0\".",
+                   level=logging.WARNING)
+
+        # default - applies if config isn't set or has an invalid value
+        return 0
+
     def get_asset_name_keys(self) -> list[str]:
         r"""Get a list of keys used to generate asset names.
 
         Key names are extracted from the format string specified in the config
-        ``onyo.assets.name-format``.
+        ``onyo.assets.name-format`` (see :py:func:`get_asset_name_format`).
+        Keys must be given in dot notation (e.g. ``model.name``), as nested
+        dictionaries cannot be referenced by the format.
+
+        Raises
+        ------
+        ValueError
+            The config is not a valid format string.
         """
 
-        import re
+        name_format = self.get_asset_name_format()
+        return list(name_format.required_keys) if name_format else []
+
+    def get_asset_name_format(self) -> AssetNameFormat | None:
+        r"""Get the compiled asset name format of the config ``onyo.assets.name-format``.
+
+        The format is compiled once and recompiled only if the config changes.
+        ``None`` if the config is not set.
+
+        Raises
+        ------
+        ValueError
+            The config is not a valid format string.
+        """
 
-        # Notes regarding the regex:
-        # The extraction relies on a '{', followed by a key name, which is then
-        # either closed directly via '}' or followed by formatting options
-        # (e.g. '[', '.', '!', etc).
-        # The use of '\w' to match the key name is important, as it includes
-        # alphanumeric characters as well as underscores. This matches Python's
-        # variable name restrictions), which is necessary because we pass the
-        # asset dict to a format call on the configured string:
-        # `config_str.format(**yaml_dict)`
-        # Thus, keys need to be able to be python variables.
-        #
-        # This limits somewhat the formatting that can be used in the config.
-        # Nested dictionaries are (for example) not possible.
-        # Instead, dotnotation should be used (e.g. model.name).
-        search_regex = r"\{([\w\.]+)"  # TODO: temp. fix to include `.`. Revert with full dict support
         config_str = self.get_config("onyo.assets.name-format")
+        if not config_str:
+            return None
 
-        return re.findall(search_regex, config_str) if config_str else []
+        if self._name_format is None or self._name_format.format != config_str:
+            self._name_format = AssetNameFormat(config_str)
+
+        return self._name_format
+
+    def get_index_keys(self) -> list[str]:
+        r"""Get the content keys to index, as configured by ``onyo.index.keys``.
+
+        Keys are separated by whitespace or commas. Pseudo-keys are not indexed
+        (and skipped).
+        """
+
+        import re
+
+        config_str = self.get_config("onyo.index.keys")
+        keys = [k for k in re.split(r'[\s,]+', config_str.strip()) if k] if config_str else []
+
+        return [k for k in keys if not is_pseudo_key(k, alias_map=PSEUDOKEY_ALIASES)]
 
     def get_editor(self) -> str:
         r"""Return the editor to use.
@@ -306,7 +381,11 @@ class OnyoRepo(object):
         """
 
         self._asset_paths = None
-        self._config_cache = {'git': {}, 'onyo': {}}
+        self._path_index = None
+        self._ignore_matcher = None
+        self._was_commits = {}
+        self._was_commits_head = None
+        self.clear_config_cache()
         self.git.clear_cache()
 
     @staticmethod
@@ -370,6 +449,355 @@ class OnyoRepo(object):
 
         return self._asset_paths
 
+    @property
+    def path_index(self) -> PathIndex:
+        r"""Get the :py:class:`onyo.lib.pathindex.PathIndex` of the committed files.
+
+        The index is built on first access. Afterwards, it is updated in place
+        with the changes of new commits. This is triggered by :py:func:`commit`,
+        :py:func:`onyo.lib.git.GitRepo.commit`, and :py:func:`get_item_paths`.
+
+        Use :py:func:`clear_cache` to rebuild the index from scratch.
+        """
+
+        if self._path_index is None:
+            self._path_index_head = self.git.get_hexsha()
+            self._path_index_epoch = self.git.cache_epoch
+            files = self.git.files
+            # load the ignore files of this commit and match all paths that
+            # are about to be classified in one pass
+            if self._ignore_matcher is None:
+                self._ignore_matcher = IgnoreMatcher(self.git.root)
+            self._ignore_matcher.load(self.git,
+                                      [f for f in files if f.name == IGNORE_FILE_NAME],
+                                      self._path_index_head)
+            self._ignore_matcher.match(files + [f.parent for f in files if f.name == ANCHOR_FILE_NAME])
+            self._path_index = PathIndex(self.git.root, self.template_dir)
+            self._path_index.add_files(files, self.is_item_path)
+        elif self._path_index_epoch != self.git.cache_epoch:
+            self._update_path_index()
+
+        return self._path_index  # pyre-ignore[7]
+
+    def _update_path_index(self) -> None:
+        r"""Update the path index in place with the changes up to ``HEAD``.
+
+        Changes to an ignore file (:py:data:`onyo.lib.consts.IGNORE_FILE_NAME`)
+        can affect any path, and reset the index instead.
+        """
+
+        index = self._path_index
+        base = self._path_index_head
+        head = self.git.get_hexsha()
+        self._path_index_epoch = self.git.cache_epoch
+        if index is None or head == base:
+            return
+
+        changes = self.git.get_changes(base, head) if base and head else []
+        if not base or not head or any(p.name == IGNORE_FILE_NAME for _, p in changes):
+            self._path_index = None
+            return
+
+        ui.log_debug(f"Updating path index with {len(changes)} changes")
+        self._path_index_head = head
+        # no ignore file changed; the loaded rules remain valid
+        self._ignore_matcher.head = head  # pyre-ignore[16]
+        index.remove_files([p for status, p in changes if status == 'D'])
+        index.add_files([p for status, p in changes if status == 'A'], self.is_item_path)
+
+    @property
+    def operations_index(self) -> OperationsIndex | None:
+        r"""Get the :py:class:`onyo.lib.operations_index.OperationsIndex` of the history.
+
+        The index is persisted in the ``.git`` directory
+        (:py:data:`onyo.lib.consts.GIT_CACHE_DIR`), and brought up-to-date with
+        ``HEAD`` on every access. Only commits that are new since the last
+        update are read and parsed. If the history was rewritten, the index is
+        rebuilt.
+
+        ``None`` if the index cannot be used (e.g. the database is not
+        writable).
+        """
+
+        try:
+            if self._operations_index is None:
+                self._operations_index = OperationsIndex(
+                    self.git.git_dir / GIT_CACHE_DIR / 'operations.sqlite')
+            self._update_operations_index()
+        except (sqlite3.Error, OSError) as e:
+            ui.log_debug(f"Operations index is not available: {e}")
+            self._operations_index = None
+
+        return self._operations_index
+
+    def _update_operations_index(self) -> None:
+        r"""Add the commits up to ``HEAD`` to the operations index."""
+
+        index = self._operations_index
+        base = index.head  # pyre-ignore[16]
+        head = self.git.get_hexsha()
+        if head == base:
+            return
+
+        revision = head
+        if base and head and self.git.is_ancestor(base, head):
+            revision = f"{base}..{head}"
+        else:
+            ui.log_debug("Rebuilding operations index")
+            index.clear()  # pyre-ignore[16]
+            if not head:
+                return
+
+        commits = [self._parse_operations(c) for c in self.git.history(revision=revision)]
+        index.add_commits(reversed(commits), head)  # pyre-ignore[16]
+
+    @property
+    def asset_cache(self) -> AssetCache | None:
+        r"""Get the :py:class:`onyo.lib.asset_cache.AssetCache` of the committed assets.
+
+        The cache is persisted in the ``.git`` directory
+        (:py:data:`onyo.lib.consts.GIT_CACHE_DIR`), and brought up-to-date with
+        ``HEAD`` on every access. Only the files that changed since the last
+        update are looked at (via ``git diff-tree``).
+
+        ``None`` if the cache cannot be used (e.g. the database is not
+        writable).
+        """
+
+        try:
+            if self._asset_cache is None:
+                self._asset_cache = AssetCache(
+                    self.git.git_dir / GIT_CACHE_DIR / 'assets.sqlite')
+            self._update_asset_cache()
+        except (sqlite3.Error, OSError) as e:
+            ui.log_debug(f"Asset cache is not available: {e}")
+            self._asset_cache = None
+
+        return self._asset_cache
+
+    def _update_asset_cache(self) -> None:
+        r"""Update the files of the asset cache to ``HEAD``."""
+
+        cache = self._asset_cache
+        base = cache.head  # pyre-ignore[16]
+        head = self.git.get_hexsha()
+        if head == base:
+            return
+
+        changes = None
+        if base and head:
+            try:
+                changes = self.git.get_blob_changes(base, head)
+            except subprocess.CalledProcessError:
+                # the cached commit is gone (e.g. rewritten history)
+                pass
+
+        if not head:
+            cache.clear()  # pyre-ignore[16]
+            return
+
+        reset = changes is None
+        if reset:
+            ui.log_debug("Rebuilding file list of asset cache")
+            changes = self.git.get_blob_ids(head).items()
+
+        cache.update(((p.relative_to(self.git.root), oid) for p, oid in changes),  # pyre-ignore[16]
+                     head, reset=reset)
+
+    @property
+    def key_index(self) -> KeyIndex | None:
+        r"""Get the :py:class:`onyo.lib.key_index.KeyIndex` of the committed assets.
+
+        The index is persisted in the ``.git`` directory
+        (:py:data:`onyo.lib.consts.GIT_CACHE_DIR`), and brought up-to-date with
+        ``HEAD`` on every access. Only the files that changed since the last
+        update are read (via ``git diff-tree``). It is rebuilt if the keys
+        configured by ``onyo.index.keys`` change.
+
+        ``None`` if no keys are configured to be indexed, or if the index cannot
+        be used (e.g. the database is not writable).
+        """
+
+        keys = self.get_index_keys()
+        if not keys:
+            return None
+
+        try:
+            if self._key_index is None:
+                self._key_index = KeyIndex(
+                    self.git.git_dir / GIT_CACHE_DIR / 'keys.sqlite')
+            if self._key_index.keys != keys:
+                ui.log_debug("Rebuilding key index for changed keys")
+                self._key_index.clear(keys)
+            self._update_key_index()
+        except (sqlite3.Error, OSError) as e:
+            ui.log_debug(f"Key index is not available: {e}")
+            self._key_index = None
+
+        return self._key_index
+
+    def _update_key_index(self) -> None:
+        r"""Index the files that changed up to ``HEAD``."""
+
+        index = self._key_index
+        base = index.head  # pyre-ignore[16]
+        head = self.git.get_hexsha()
+        if head == base:
+            return
+
+        changes = None
+        if base and head:
+            try:
+                changes = self.git.get_blob_changes(base, head)
+            except subprocess.CalledProcessError:
+                # the indexed commit is gone (e.g. rewritten history)
+                pass
+
+        if changes is None:
+            ui.log_debug("Rebuilding key index")
+            index.clear()  # pyre-ignore[16]
+            if not head:
+                return
+            changes = self.git.get_blob_ids(head).items()
+
+        root = self.git.root
+        removed = [p.relative_to(root) for p, oid in changes if oid is None]
+        # files that can be items, by blob (identical files share a blob)
+        files = dict()
+        for p, oid in changes:
+            item_path = p.parent if p.name == ASSET_DIR_FILE_NAME else p
+            if oid is not None and p.name != ANCHOR_FILE_NAME and \
+                    (self.is_inventory_path(item_path) or self.is_template_path(item_path)):
+                files.setdefault(oid, []).append(p.relative_to(root))
+        contents = []
+        for oid, blob in self.git.read_objects(files.keys()):
+            try:
+                content = get_asset_content(blob.decode(), readonly=True)  # pyre-ignore[16]
+            except (NotAnAssetError, UnicodeDecodeError, AttributeError):
+                content = None
+            contents.extend((p, content) for p in files[oid])
+
+        index.update(contents, removed, head)  # pyre-ignore[16]
+
+    def _get_cache_size(self) -> int:
+        r"""Get the size (in KiB) of Onyo's caches in the ``.git`` directory."""
+
+        cache_dir = self.git.git_dir / GIT_CACHE_DIR
+        return round(sum(f.stat().st_size for f in cache_dir.glob('*.sqlite')) / 1024) if cache_dir.is_dir() else 0
+
+    def _get_commit_graph_size(self) -> int:
+        r"""Get the size (in KiB) of git's commit-graph."""
+
+        info = self.git.git_dir / 'objects' / 'info'
+        files = [info / 'commit-graph'] + list((info / 'commit-graphs').glob('*'))
+        return round(sum(f.stat().st_size for f in files if f.is_file()) / 1024)
+
+    def maintenance(self,
+                    tasks: list[str] | None = None) -> list[dict]:
+        r"""Optimize the repository and refresh Onyo's caches.
+
+        The following tasks are available (see :py:data:`onyo.lib.consts.MAINTENANCE_TASKS`):
+
+        * ``commit-graph``: write git's commit-graph with changed-path Bloom
+          filters (see :py:func:`onyo.lib.git.GitRepo.write_commit_graph`),
+          which speeds up the history lookups of ``onyo.was.*`` pseudo-keys and
+          ``onyo history``
+        * ``repack``: pack all objects into a single pack with a reachability
+          bitmap (see :py:func:`onyo.lib.git.GitRepo.repack`)
+        * ``caches``: rebuild the path index, and bring the operations index,
+          asset cache, and key index up-to-date with ``HEAD``
+
+        The ``HEAD`` it was run at is recorded, to determine when to run it
+        automatically (see :py:func:`maintenance_due`). Automatic runs are
+        limited to :py:data:`onyo.lib.consts.MAINTENANCE_AUTO_TASKS`.
+
+        Parameters
+        ----------
+        tasks
+            Tasks to run. By default, all tasks are run.
+
+        Returns
+        -------
+        list[dict]
+            For each task run, a dict of its ``'task'``, the ``'time'`` it took
+            (in seconds), and the measurements its effect is judged by
+            ``'before'`` and ``'after'`` it was run (dicts of the same keys).
+
+        Raises
+        ------
+        ValueError
+            A specified task does not exist.
+        """
+
+        import time
+
+        if tasks and any(t not in MAINTENANCE_TASKS for t in tasks):
+            raise ValueError(f"Invalid task requested. Available tasks are: {', '.join(MAINTENANCE_TASKS)}")
+
+        def objects() -> dict[str, int]:
+            stats = self.git.count_objects()
+            return {'loose objects': stats['count'],
+                    'packs': stats['packs'],
+                    'size (KiB)': stats['size'] + stats['size-pack']}
+
+        def refresh_caches() -> None:
+            self.clear_cache()
+            self.path_index
+            self.operations_index
+            self.asset_cache
+            self.key_index
+
+        all_tasks = {
+            'commit-graph': (self.git.write_commit_graph, lambda: {'size (KiB)': self._get_commit_graph_size()}),
+            'repack': (self.git.repack, objects),
+            'caches': (refresh_caches, lambda: {'size (KiB)': self._get_cache_size()}),
+        }
+        head = self.git.get_hexsha()
+        results = []
+        for task in [t for t in MAINTENANCE_TASKS if not tasks or t in tasks]:
+            run, measure = all_tasks[task]
+            if head is None and task != 'caches':
+                # nothing to do for git without commits
+                continue
+            before = measure()
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+            results.append(dict(task=task, time=seconds, before=before, after=measure()))
+            ui.log_debug(f"Maintenance task '{task}' took {seconds:.3f}s")
+
+        if head:
+            state = self.git.git_dir / GIT_CACHE_DIR / 'maintenance'
+            state.parent.mkdir(parents=True, exist_ok=True)
+            state.write_text(head + '\n')
+
+        return results
+
+    def maintenance_due(self) -> bool:
+        r"""Whether :py:func:`maintenance` should run automatically.
+
+        This is the case if ``onyo.maintenance.auto`` is set to ``N`` > 0, and
+        at least ``N`` commits were added since it last ran (or ever, if it
+        never ran).
+        """
+
+        n = self.maintenance_auto
+        head = self.git.get_hexsha() if n else None
+        if not head:
+            return False
+
+        try:
+            last = (self.git.git_dir / GIT_CACHE_DIR / 'maintenance').read_text().strip()
+        except OSError:
+            last = None
+        try:
+            count = self.git.count_commits(f"{last}..{head}" if last else head)
+        except subprocess.CalledProcessError:
+            # the recorded commit is gone (e.g. rewritten history)
+            count = self.git.count_commits(head)
+
+        return count >= n
+
     def validate_onyo_repo(self) -> None:
         r"""Assert whether this a full init-ed onyo repository.
 
@@ -480,7 +908,7 @@ class OnyoRepo(object):
             Path to check.
         """
 
-        return self.is_inventory_dir(path) and self.is_asset_path(path)
+        return self.path_index.is_asset_dir(path)
 
     def is_asset_file(self,
                       path: Path) -> bool:
@@ -504,7 +932,7 @@ class OnyoRepo(object):
             Path to check.
         """
 
-        return path in self.asset_paths
+        return self.path_index.is_asset(path)
 
     def is_inventory_dir(self,
                          path: Path) -> bool:
@@ -518,8 +946,7 @@ class OnyoRepo(object):
             Path to check.
         """
 
-        return path == self.git.root or \
-            (self.is_inventory_path(path) and path / ANCHOR_FILE_NAME in self.git.files)
+        return self.path_index.is_inventory_dir(path)
 
     # TODO: the name of this function is a mismatch with its functionality
     #       compared to the other is_inventory_*() functions. This should be
@@ -569,7 +996,8 @@ class OnyoRepo(object):
         Such a path would not considered to be an inventory item by Onyo, but
         could still be tracked in git.
 
-        ``.onyoignore`` files apply to the subtree they are placed into.
+        ``.onyoignore`` files apply to the subtree they are placed into. Only
+        committed ignore files are considered.
 
         Parameters
         ----------
@@ -578,14 +1006,17 @@ class OnyoRepo(object):
             file (:py:data:`onyo.lib.consts.IGNORE_FILE_NAME`).
         """
 
-        candidates = [self.git.root / p / IGNORE_FILE_NAME
-                      for p in path.relative_to(self.git.root).parents]
-        actual = [f for f in candidates if f in self.git.files]  # committed files only
-        for ignore_file in actual:
-            if path in self.git.check_ignore(ignore_file, [path]):
-                return True
+        return self.ignore_matcher.is_ignored(path)
 
-        return False
+    @property
+    def ignore_matcher(self) -> IgnoreMatcher:
+        r"""Get the :py:class:`onyo.lib.ignore.IgnoreMatcher` of the committed ignore files.
+
+        It is loaded and kept in sync together with :py:attr:`path_index`.
+        """
+
+        self.path_index  # brings the matcher in sync with HEAD
+        return self._ignore_matcher  # pyre-ignore[7]
 
     def get_templates(self,
                       path: Path | None = None,
@@ -683,7 +1114,7 @@ class OnyoRepo(object):
         #       of it. But ultimately, exist vs expected should take the same
         #       subtrees into account. So - not good to code it differently.
         anchors_exist = {x
-                         for x in self.git.files
+                         for x in self.path_index.files
                          if x.name == ANCHOR_FILE_NAME and
                          self.is_inventory_path(x.parent)}
         anchors_expected = {Path(x) / ANCHOR_FILE_NAME
@@ -743,7 +1174,10 @@ class OnyoRepo(object):
             else:
                 exclude = [self.template_dir]
 
-        files = self.git.get_files(include)
+        # pick up commits made by other means (e.g. another process)
+        self._update_path_index()
+        index = self.path_index
+        files = index.get_files(include)
 
         if depth:
             files = [f
@@ -757,30 +1191,37 @@ class OnyoRepo(object):
         # special case root - has no anchor file that would show up in `files`:
         if "directories" in types and self.git.root in include:
             paths.append(self.git.root)
+        seen = set(paths)
 
         for f in files:
             if "assets" in types and f.name == ASSET_DIR_FILE_NAME:
-                if f.parent not in paths:
+                if f.parent not in seen:
                     paths.append(f.parent)
+                    seen.add(f.parent)
                 continue
-            if "assets" in types and f.name != ANCHOR_FILE_NAME and self.is_item_path(f):
+            if "assets" in types and f in index.assets:
                 paths.append(f)
+                seen.add(f)
                 continue
-            if "directories" in types and f.name == ANCHOR_FILE_NAME and self.is_item_path(f.parent):
-                if f.parent not in paths:
+            if "directories" in types and f.name == ANCHOR_FILE_NAME and f.parent in index.directories:
+                if f.parent not in seen:
                     paths.append(f.parent)
+                    seen.add(f.parent)
                 continue
 
         if not intermediates:
             # remove any directory that has children in `paths` and is not an asset dir
-            for p in [p for p in paths if
-                      (p / ASSET_DIR_FILE_NAME not in files) and any(i.parent == p for i in paths)]:
-                paths.remove(p)
+            file_set = set(files)
+            parents = {i.parent for i in paths}
+            paths = [p for p in paths if
+                     (p / ASSET_DIR_FILE_NAME in file_set) or p not in parents]
 
         return paths
 
     def get_asset_content(self,
-                          path: Path) -> dict:
+                          path: Path,
+                          content: dict | str | None = None,
+                          readonly: bool = False) -> dict:
         r"""Get a dictionary representing ``path``'s content.
 
         The content also includes the asset's pseudo-keys.
@@ -791,6 +1232,16 @@ class OnyoRepo(object):
             Path of asset to load. This may be either a YAML file or an
             Asset Directory (:py:data:`onyo.lib.consts.ASSET_DIR_FILE_NAME` is automatically
             appended).
+        content
+            YAML content of the asset, if already read (e.g. via
+            :py:func:`onyo.lib.git.GitRepo.read_files` or from the
+            :py:attr:`asset_cache`). The file is not read from disk in that
+            case. A dictionary is content that was already loaded read-only
+            (e.g. by the :py:attr:`asset_cache`). It is returned as-is if
+            ``readonly``, and ignored otherwise.
+        readonly
+            Load the content as plain Python objects without comments, if
+            possible. See :py:func:`onyo.lib.utils.get_asset_content`.
         """
 
         if not self.is_asset_path(path):
@@ -799,7 +1250,13 @@ class OnyoRepo(object):
         try:
             # TODO: Where do we make sure to distinguish onyo.path.file from onyo.path.relative?
             #       Surely outside, but consider this!
-            a = get_asset_content((path / ASSET_DIR_FILE_NAME) if self.is_inventory_dir(path) else path)
+            if isinstance(content, dict) and readonly:
+                a = content
+            elif isinstance(content, str):
+                a = get_asset_content(content, readonly=readonly)
+            else:
+                a = get_asset_content((path / ASSET_DIR_FILE_NAME) if self.is_inventory_dir(path) else path,
+                                      readonly=readonly)
         except NotAnAssetError as e:
             raise NotAnAssetError(f"{str(e)}\n"
                                   f"If {path} is not meant to be an asset, consider putting it into"
@@ -904,8 +1361,9 @@ class OnyoRepo(object):
                message: str) -> None:
         r"""Commit changes to the repository.
 
-        This is resets the cache and is otherwise just a proxy for
-        :py:func:`onyo.lib.git.GitRepo.commit`.
+        This resets the cache (but updates the path index in place) and is
+        otherwise just a proxy for :py:func:`onyo.lib.git.GitRepo.commit`, using
+        the engine configured by ``onyo.commit.engine``.
 
         Parameters
         ----------
@@ -915,14 +1373,61 @@ class OnyoRepo(object):
             The git commit message.
         """
 
-        self.git.commit(paths=paths, message=message)
-        self.clear_cache()
+        paths = [paths] if isinstance(paths, Path) else list(paths)
+        self.git.commit(paths=paths, message=message, engine=self.commit_engine)
+        self._committed(paths)
+
+    def fast_import(self,
+                    changes: list[fast_import_change_t],
+                    message: str) -> None:
+        r"""Commit changes without writing them to the worktree first.
+
+        This resets the cache (but updates the path index in place) and is
+        otherwise just a proxy for :py:func:`onyo.lib.git.GitRepo.fast_import`.
+
+        Parameters
+        ----------
+        changes
+            Changes to commit. See :py:func:`onyo.lib.git.GitRepo.fast_import`.
+        message
+            The git commit message.
+        """
+
+        self.git.fast_import(changes=changes, message=message)
+        self._committed([p for change in changes for p in change[1:] if isinstance(p, Path)])
+
+    def _committed(self,
+                   paths: list[Path]) -> None:
+        r"""Reset the caches affected by a commit of ``paths``."""
+
+        # the path index is updated lazily on next access
+        self._asset_paths = None
+        if any(p == self.onyo_config or p in self.onyo_config.parents
+               for p in (self.git.root / p for p in paths)):
+            self.clear_config_cache()
+        # keep an existing key index in sync with the commit (reads only its changes)
+        if self._key_index is not None or (self.git.git_dir / GIT_CACHE_DIR / 'keys.sqlite').exists():
+            self.key_index
+        if self.maintenance_due():
+            # only the cheap tasks; repacking can take a while for large repositories
+            ui.log(f"Running maintenance ({', '.join(MAINTENANCE_AUTO_TASKS)}) after {self.maintenance_auto} "
+                   f"or more commits (onyo.maintenance.auto). Run 'onyo maintenance' to also repack.")
+            self.maintenance(MAINTENANCE_AUTO_TASKS)
 
     def get_history(self,
                     path: Path | None = None,
                     n: int | None = None) -> Generator[UserDict, None, None]:
         r"""Yield the history of Inventory Operations for a path.
 
+        The history is served from the :py:attr:`operations_index`. The history
+        of an asset follows its recorded moves and renames (and those of its
+        parent directories), like ``git log --follow`` does. The history of a
+        directory includes the operations on everything beneath it. Commits
+        without an operations record are matched by the files they changed.
+
+        The history of other paths (e.g. templates), or if the index is not
+        available, is acquired via ``git log --follow``.
+
         Parameters
         ----------
         path
@@ -937,18 +1442,226 @@ class OnyoRepo(object):
         #       or have sort of a proxy in OnyoRepo.
         #       -> May be: get_history(Item) in Inventory and get_history(path) in OnyoRepo.
         from onyo.lib.items import ItemSpec
+
+        index = self.operations_index
+        absolute = None if path is None else path if path.is_absolute() else self.git.root / path
+        if absolute is not None and index is not None:
+            paths = self.path_index
+            if paths.is_template(absolute) or absolute not in paths.assets | paths.directories:
+                index = None
+
+        if index is None:
+            commits = (self._parse_operations(c) for c in self.git.history(path, n))
+        elif absolute is None:
+            commits = index.get_commits(n)
+        else:
+            commits = index.get_commits(n, self._get_path_commits(
+                index, absolute.relative_to(self.git.root), descendants=absolute in self.path_index.directories))
+
+        for commit in commits:
+            yield ItemSpec(commit)
+
+    def _get_path_commits(self,
+                          index: OperationsIndex,
+                          path: Path,
+                          descendants: bool) -> list[int]:
+        r"""Get the positions of the commits in the history of a path in the operations index.
+
+        Parameters
+        ----------
+        index
+            The index to query.
+        path
+            Path relative to the root of the repository.
+        descendants
+            Match the operations on everything beneath ``path`` rather than
+            following its moves and renames (like ``git log`` does for a
+            directory).
+
+        Returns
+        -------
+        list
+            The positions of the commits (see
+            :py:func:`onyo.lib.operations_index.OperationsIndex.get_path_operations`),
+            newest first.
+        """
+
+        unrecorded = index.get_unrecorded_commits()
+        changed = self.git.get_commit_files([hexsha for _, hexsha in unrecorded])
+        seqs = set()
+        # walk back in history; `until` is the commit in which `path` got its current name
+        until = None
+        while True:
+            moved = None
+            for seq, operation, target, previous in index.get_path_operations(path, until, descendants):
+                if moved and seq < moved[0]:
+                    break
+                if operation in ('new_assets', 'new_directories', 'modify_assets') and target in path.parents:
+                    # creating or modifying a parent does not affect the path
+                    continue
+                seqs.add(seq)
+                if not descendants and not moved and previous is not None and \
+                        (until is None or seq < until) and (target == path or target in path.parents):
+                    moved = (seq, previous / path.relative_to(target))
+
+            low = moved[0] if moved else 0
+            absolute = self.git.root / path
+            seqs.update(seq for seq, hexsha in unrecorded
+                        if low < seq and (until is None or seq < until) and
+                        any(f == absolute or absolute in f.parents for f in changed[hexsha]))
+            if not moved:
+                break
+            until, path = moved
+
+        return sorted(seqs, reverse=True)
+
+    @staticmethod
+    def _parse_operations(commit: dict) -> dict:
+        r"""Add the parsed operations record of a commit's message as ``'operations'``.
+
+        Parameters
+        ----------
+        commit
+            Commit dict as yielded by :py:func:`onyo.lib.git.GitRepo.history`.
+        """
+
         from onyo.lib.parser import parse_operations_record
 
-        for commit in self.git.history(path, n):
-            record = []
-            start = False
-            for line in commit['message']:
-                if line.strip() == "--- Inventory Operations ---":
-                    start = True
-                if start:
-                    record.append(line)
+        record = []
+        start = False
+        for line in commit.get('message', []):
+            if line.strip() == "--- Inventory Operations ---":
+                start = True
+            if start:
+                record.append(line)
 
-            if record:
-                commit['operations'] = parse_operations_record(record)
+        if record:
+            commit['operations'] = parse_operations_record(record)
 
-            yield ItemSpec(commit)
+        return commit
+
+    def get_was_commits(self,
+                        path: Path) -> dict[str, dict | None]:
+        r"""Get the commits that created and last modified the item at ``path``.
+
+        The first request resolves all assets and directories of the inventory
+        in a single pass over the history (see :py:func:`resolve_was_commits`).
+        The results are cached until ``HEAD`` changes.
+
+        Parameters
+        ----------
+        path
+            Absolute Path of the item.
+
+        Returns
+        -------
+        dict
+            The commit dicts (as yielded by :py:func:`get_history`) under the
+            keys ``'created'`` and ``'modified'``, or ``None`` if there is no
+            such commit.
+        """
+
+        index = self.path_index
+        if self._was_commits_head != self._path_index_head:
+            self._was_commits = {}
+            self._was_commits_head = self._path_index_head
+
+        if path not in self._was_commits:
+            paths = {p for p in index.assets | index.directories
+                     if not index.is_template(p)}.difference(self._was_commits)
+            paths.update([self.git.root, path])
+            self._was_commits.update(self.resolve_was_commits(paths))
+
+        return self._was_commits[path]
+
+    def resolve_was_commits(self,
+                            paths: Iterable[Path]) -> dict[Path, dict[str, dict | None]]:
+        r"""Resolve the commits that created and last modified items.
+
+        Walks the history once (newest first) and parses each Inventory
+        Operations record only once. Items are followed through the recorded
+        moves and renames of themselves and of their parent directories.
+
+        An asset was modified by ``new_assets`` and ``modify_assets``
+        operations, a directory by ``new_directories`` and by moves and renames
+        of itself or a parent. The most recent ``new_assets`` (asset) or
+        ``new_directories`` (directory) operation created it.
+
+        Parameters
+        ----------
+        paths
+            Absolute Paths of the items to resolve.
+
+        Returns
+        -------
+        dict
+            Mapping of each Path to its commits under the keys ``'created'``
+            and ``'modified'`` (``None`` if there is no such commit).
+        """
+
+        results = {}
+        # relative path at the currently walked point in history -> items
+        pending: dict[Path, set[Path]] = {}
+        for p in paths:
+            results[p] = {'created': None, 'modified': None}
+            if p != self.git.root:
+                pending.setdefault(p.relative_to(self.git.root), set()).add(p)
+
+        index = self.path_index
+        is_asset = {p: p in index.assets for p in results}
+        is_directory = {p: p in index.directories for p in results}
+
+        for commit in self.get_history():
+            if not pending:
+                break
+            if 'operations' not in commit:
+                continue
+            ops = commit['operations']
+
+            # follow moves and renames back to the paths before this commit
+            previous = pending
+            dir_moves = ops['move_directories'] + ops['rename_directories']
+            asset_moves = ops['move_assets'] + ops['rename_assets']
+            if dir_moves or asset_moves:
+                previous = {}
+                for rel, items in pending.items():
+                    old = rel
+                    for src, dst in dir_moves:
+                        if rel == dst or dst in rel.parents:
+                            old = src / rel.relative_to(dst)
+                            for p in items:
+                                if is_directory[p] and results[p]['modified'] is None:
+                                    results[p]['modified'] = commit.data
+                            break
+                    else:
+                        for src, dst in asset_moves:
+                            if rel == dst:
+                                old = src
+                                break
+                    previous.setdefault(old, set()).update(items)
+
+            # The order of operations within a commit is not recorded. Thus
+            # match both the paths after and before this commit's moves.
+            def lookup(rel: Path) -> set[Path]:
+                return pending.get(rel, set()) | previous.get(rel, set())
+
+            for rel in ops['modify_assets']:
+                for p in lookup(rel):
+                    if is_asset[p] and results[p]['modified'] is None:
+                        results[p]['modified'] = commit.data
+
+            created = set()
+            for rel in ops['new_assets']:
+                created.update(p for p in lookup(rel) if is_asset[p])
+            for rel in ops['new_directories']:
+                created.update(p for p in lookup(rel) if is_directory[p])
+            for p in created:
+                results[p]['created'] = commit.data
+                if results[p]['modified'] is None:
+                    results[p]['modified'] = commit.data
+
+            # items are done once created
+            pending = {rel: remaining for rel, items in previous.items()
+                       if (remaining := items - created)} if created else previous
+
+        return results
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import datetime
+import itertools
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from onyo.lib.sqlite_cache import SQLiteCache
+from onyo.lib.ui import ui
+
+if TYPE_CHECKING:
+    from typing import (
+        Generator,
+        Iterable,
+    )
+
+log: logging.Logger = logging.getLogger('onyo.operations_index')
+
+
+class OperationsIndex(SQLiteCache):
+    r"""Persistent index of the Inventory Operations records of a repository's history.
+
+    Every commit is stored once, in the order of ``git log`` (commit date
+    order; stored oldest first), along with its parsed operations record.
+    Commits added later come after all previous ones, even if their commit
+    date is older. Each operation is stored as a row of the path it affects
+    and, for moves and renames, the path it was previously at. This allows to
+    get the history of the inventory (or of a path) without running and
+    parsing ``git log``.
+
+    The index remembers the commit it was last updated to (:py:attr:`head`),
+    so that only new commits need to be added via :py:func:`add_commits`. If
+    the history was rewritten, the index must be rebuilt via :py:func:`clear`.
+
+    The database is an SQLite file, usually at ``.git/onyo/operations.sqlite``.
+    It is a cache and can be deleted at any time.
+
+    Attributes
+    ----------
+    path
+        The Path of the database file.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS commits (
+        seq INTEGER PRIMARY KEY,
+        hexsha TEXT UNIQUE NOT NULL,
+        commit_data TEXT NOT NULL,
+        has_record INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS operations (
+        seq INTEGER NOT NULL,
+        pos INTEGER NOT NULL,
+        operation TEXT NOT NULL,
+        path TEXT NOT NULL,
+        previous TEXT
+    );
+    CREATE INDEX IF NOT EXISTS operations_path ON operations (path);
+    CREATE INDEX IF NOT EXISTS operations_previous ON operations (previous);
+    CREATE INDEX IF NOT EXISTS operations_seq ON operations (seq);
+    """
+
+    SCHEMA_VERSION = '2'
+
+    TABLES = ('operations', 'commits')
+
+    def add_commits(self,
+                    commits: Iterable[dict],
+                    head: str) -> int:
+        r"""Append commits to the index.
+
+        All commits are added in a single transaction.
+
+        Parameters
+        ----------
+        commits
+            Commit dicts (as yielded by
+            :py:func:`onyo.lib.git.GitRepo.history`), ordered oldest first. If
+            a commit has an operations record, it is expected as its parsed
+            form (see :py:func:`onyo.lib.parser.parse_operations_record`)
+            under the key ``'operations'``.
+        head
+            The hexsha of the commit the index is up-to-date with afterwards.
+
+        Returns
+        -------
+        int
+            The number of commits added.
+        """
+
+        count = 0
+        with self._db:
+            row = self._db.execute("SELECT MAX(seq) FROM commits").fetchone()
+            seq = row[0] or 0
+            for commit in commits:
+                seq += 1
+                count += 1
+                data = {k: v for k, v in commit.items() if k != 'operations'}
+                if isinstance(data.get('time'), datetime.datetime):
+                    data['time'] = data['time'].isoformat()
+                self._db.execute("INSERT INTO commits VALUES (?, ?, ?, ?)",
+                                 (seq, commit['hexsha'], json.dumps(data), 'operations' in commit))
+                self._db.executemany(
+                    "INSERT INTO operations VALUES (?, ?, ?, ?, ?)",
+                    ((seq, pos, operation, *self._serialize(entry))
+                     for operation, entries in commit.get('operations', {}).items()
+                     for pos, entry in enumerate(entries)))
+            self._set_meta('head', head)
+
+        ui.log_debug(f"Added {count} commits to the operations index at {head}")
+        return count
+
+    @staticmethod
+    def _serialize(entry: Path | tuple[Path, Path]) -> tuple[str, str | None]:
+        r"""Get the ``(path, previous)`` columns of an operation."""
+
+        if isinstance(entry, tuple):
+            return entry[1].as_posix(), entry[0].as_posix()
+        return entry.as_posix(), None
+
+    def get_commits(self,
+                    n: int | None = None,
+                    seqs: Iterable[int] | None = None) -> Generator[dict, None, None]:
+        r"""Yield the indexed commits, newest first.
+
+        The commit dicts are the same as those passed to :py:func:`add_commits`.
+
+        Parameters
+        ----------
+        n
+            Limit to ``n`` commits. ``None`` for no limit (default).
+        seqs
+            Only yield the commits at these positions in the index (see
+            :py:func:`get_path_operations`), in the given order. ``None`` for
+            all commits (default).
+        """
+
+        if seqs is None:
+            rows = self._db.execute("SELECT seq, commit_data, has_record FROM commits "
+                                    "ORDER BY seq DESC LIMIT ?", (-1 if n is None else n,))
+        else:
+            rows = (self._db.execute("SELECT seq, commit_data, has_record FROM commits WHERE seq = ?",
+                                     (seq,)).fetchone()
+                    for seq in itertools.islice(seqs, n))
+        for seq, data, has_record in rows:
+            yield self._get_commit(seq, data, has_record)
+
+    def _get_commit(self,
+                    seq: int,
+                    data: str,
+                    has_record: int) -> dict:
+        r"""Get the commit dict of a row of the ``commits`` table."""
+
+        from onyo.lib.inventory import OPERATIONS_MAPPING
+
+        commit = json.loads(data)
+        commit['time'] = datetime.datetime.fromisoformat(commit['time'])
+        if has_record:
+            operations = {k: [] for k in OPERATIONS_MAPPING.keys()}
+            for operation, path, previous in self._db.execute(
+                    "SELECT operation, path, previous FROM operations "
+                    "WHERE seq = ? ORDER BY operation, pos", (seq,)):
+                operations.setdefault(operation, []).append(
+                    (Path(previous), Path(path)) if previous is not None else Path(path))
+            commit['operations'] = operations
+
+        return commit
+
+    def get_unrecorded_commits(self) -> list[tuple[int, str]]:
+        r"""Get the commits without an Inventory Operations record, newest first.
+
+        Returns
+        -------
+        list
+            Tuples of the position of the commit in the index (see
+            :py:func:`get_path_operations`) and its hexsha.
+        """
+
+        return self._db.execute("SELECT seq, hexsha FROM commits WHERE NOT has_record "
+                                "ORDER BY seq DESC").fetchall()
+
+    def get_path_operations(self,
+                            path: Path,
+                            until: int | None = None,
+                            descendants: bool = False) -> list[tuple[int, str, Path, Path | None]]:
+        r"""Get the recorded operations on ``path`` and its parents, newest first.
+
+        An operation is on a path if it resulted in the path or, for moves and
+        renames, if the path was its source.
+
+        Parameters
+        ----------
+        path
+            Path relative to the root of the repository.
+        until
+            Only get the operations of commits up to (and including) this
+            position in the index. ``None`` for all commits (default).
+        descendants
+            Also get the operations on paths beneath ``path``.
+
+        Returns
+        -------
+        list
+            Tuples of the position of the commit in the index (commits are
+            numbered from ``1``, oldest first), the name of the operation (see
+            :py:data:`onyo.lib.inventory.OPERATIONS_MAPPING`), the path it
+            resulted in, and the previous path of a move or rename (``None``
+            otherwise).
+        """
+
+        paths = [p.as_posix() for p in [path, *path.parents] if p != Path('.')]
+        match = f"IN ({', '.join('?' * len(paths))})"
+        conditions = [f"path {match}", f"previous {match}"]
+        params = paths + paths
+        if descendants:
+            # '0' is the character after '/'
+            prefix = path.as_posix()
+            conditions += ["(path > ? AND path < ?)", "(previous > ? AND previous < ?)"]
+            params += [prefix + '/', prefix + '0'] * 2
+
+        where = f"({' OR '.join(conditions)})"
+        if until is not None:
+            where += " AND seq <= ?"
+            params.append(until)
+
+        rows = self._db.execute(f"SELECT seq, operation, path, previous FROM operations "
+                                f"WHERE {where} ORDER BY seq DESC, operation, pos", params)
+        return [(seq, operation, Path(p), Path(previous) if previous is not None else None)
+                for seq, operation, p, previous in rows]
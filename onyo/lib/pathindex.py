@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from onyo.lib.consts import (
+    ANCHOR_FILE_NAME,
+    ASSET_DIR_FILE_NAME,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import (
+        Callable,
+        Iterable,
+    )
+
+log: logging.Logger = logging.getLogger('onyo.pathindex')
+
+
+class PathIndex(object):
+    r"""Index of the tracked files of an Onyo repository and the items they form.
+
+    The tracked files are stored in a set, and in a trie of directories mapping
+    each directory to its direct children. Items are classified once, when
+    their files are added, so that lookups are ``O(1)`` (or ``O(depth)``)
+    rather than scans of the list of tracked files.
+
+    The index is updated in place via :py:func:`add_files` and
+    :py:func:`remove_files`.
+
+    Attributes
+    ----------
+    root
+        The absolute Path of the root of the repository.
+    template_dir
+        The absolute Path of the template directory.
+    files
+        The absolute Paths of all indexed files.
+    assets
+        The absolute Paths of all asset files and Asset Directories (including
+        templates).
+    directories
+        The absolute Paths of all directories with an anchor file (including
+        templates). The root is not included.
+    """
+
+    def __init__(self,
+                 root: Path,
+                 template_dir: Path) -> None:
+        r"""Instantiate an empty ``PathIndex``.
+
+        Parameters
+        ----------
+        root
+            The absolute Path of the root of the repository.
+        template_dir
+            The absolute Path of the template directory.
+        """
+
+        self.root: Path = root
+        self.template_dir: Path = template_dir
+        self.files: set[Path] = set()
+        self.assets: set[Path] = set()
+        self.directories: set[Path] = set()
+        self._children: dict[Path, set[Path]] = {root: set()}
+
+    def add_files(self,
+                  files: Iterable[Path],
+                  is_item_path: Callable[[Path], bool]) -> None:
+        r"""Add tracked files to the index.
+
+        All files are added to the directory trie before any are classified, so
+        ``is_item_path`` can already rely on :py:attr:`files`.
+
+        Parameters
+        ----------
+        files
+            Absolute Paths of the files to add.
+        is_item_path
+            Callable that determines whether a Path is a valid item path (see
+            :py:func:`onyo.lib.onyo.OnyoRepo.is_item_path`).
+        """
+
+        files = [f for f in files if f not in self.files]
+        for f in files:
+            self.files.add(f)
+            child = f
+            for parent in f.parents:
+                known = parent in self._children
+                self._children.setdefault(parent, set()).add(child)
+                if known or parent == self.root:
+                    break
+                child = parent
+
+        for f in files:
+            if f.name == ASSET_DIR_FILE_NAME:
+                self.assets.add(f.parent)
+            elif f.name == ANCHOR_FILE_NAME:
+                if is_item_path(f.parent):
+                    self.directories.add(f.parent)
+            elif is_item_path(f):
+                self.assets.add(f)
+
+    def remove_files(self,
+                     files: Iterable[Path]) -> None:
+        r"""Remove tracked files from the index.
+
+        Directories that are left without any files are pruned from the trie.
+
+        Parameters
+        ----------
+        files
+            Absolute Paths of the files to remove.
+        """
+
+        for f in files:
+            if f not in self.files:
+                continue
+
+            self.files.remove(f)
+            if f.name == ASSET_DIR_FILE_NAME:
+                self.assets.discard(f.parent)
+            elif f.name == ANCHOR_FILE_NAME:
+                self.directories.discard(f.parent)
+            else:
+                self.assets.discard(f)
+
+            child = f
+            for parent in f.parents:
+                siblings = self._children[parent]
+                siblings.discard(child)
+                if siblings or parent == self.root:
+                    break
+                del self._children[parent]
+                child = parent
+
+    def is_template(self,
+                    path: Path) -> bool:
+        r"""Whether ``path`` is a template (an item in the template directory).
+
+        Parameters
+        ----------
+        path
+            Path to check.
+        """
+
+        return (path in self.assets or path in self.directories) and \
+            (path == self.template_dir or self.template_dir in path.parents)
+
+    def is_asset(self,
+                 path: Path) -> bool:
+        r"""Whether ``path`` is an asset (file or directory) of the inventory.
+
+        Parameters
+        ----------
+        path
+            Path to check.
+        """
+
+        return path in self.assets and \
+            path != self.template_dir and self.template_dir not in path.parents
+
+    def is_inventory_dir(self,
+                         path: Path) -> bool:
+        r"""Whether ``path`` is an inventory directory.
+
+        Parameters
+        ----------
+        path
+            Path to check.
+        """
+
+        return path == self.root or \
+            (path in self.directories and
+             path != self.template_dir and self.template_dir not in path.parents)
+
+    def is_asset_dir(self,
+                     path: Path) -> bool:
+        r"""Whether ``path`` is an Asset Directory.
+
+        Parameters
+        ----------
+        path
+            Path to check.
+        """
+
+        return self.is_inventory_dir(path) and self.is_asset(path)
+
+    def get_children(self,
+                     path: Path) -> set[Path]:
+        r"""Get the tracked files and directories directly underneath ``path``.
+
+        Parameters
+        ----------
+        path
+            Path of the directory to get the children of.
+        """
+
+        return set(self._children.get(path, set()))
+
+    def get_files(self,
+                  paths: Iterable[Path] | None = None) -> list[Path]:
+        r"""Get the absolute Paths of all tracked files under ``paths``.
+
+        The order is the same as that of ``git ls-tree -r``.
+
+        Parameters
+        ----------
+        paths
+            Paths to limit the scope to. The entire repo by default.
+        """
+
+        paths = [self.root] if paths is None else paths
+        files = set()
+        for p in paths:
+            if p in self.files:
+                files.add(p)
+                continue
+
+            stack = [p] if p in self._children else []
+            while stack:
+                for child in self._children[stack.pop()]:
+                    if child in self._children:
+                        stack.append(child)
+                    else:
+                        files.add(child)
+
+        # git sorts trees by byte-wise comparison of the (full) paths
+        return sorted(files, key=lambda f: f.relative_to(self.root).as_posix())
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from onyo.lib.consts import (
+    ASSET_DIR_FILE_NAME,
+    TAG_EMPTY,
+    TAG_MAP_TYPES,
+    TAG_MAP_VALUES,
+    TAG_UNSET,
+)
+from onyo.lib.items import resolve_alias
+from onyo.lib.pseudokeys import PSEUDOKEY_ALIASES
+from onyo.lib.query import (
+    AndQuery,
+    FilterQuery,
+    OrQuery,
+    as_query,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Callable
+
+    from onyo.lib.items import Item
+    from onyo.lib.key_index import KeyIndex
+    from onyo.lib.query import Query
+
+log: logging.Logger = logging.getLogger('onyo.planner')
+
+COST_PATH = 0
+r"""Cost of a query that only needs the path of an Item."""
+
+COST_INDEX = 1
+r"""Cost of a query on a key of the key index."""
+
+COST_CONTENT = 2
+r"""Cost of a query that needs the content of an Item."""
+
+COST_HISTORY = 3
+r"""Cost of a query that needs the history of an Item."""
+
+_REGEX_CHARS = set('.^$*+?{}[]\\|()')
+r"""Characters with a special meaning in a regular expression."""
+
+
+class QueryPlan(object):
+    r"""Evaluate a query in the order of what its parts need.
+
+    The match callables of :py:func:`onyo.lib.inventory.Inventory.get_items`
+    are a list of lists. Within a list, all must return ``True`` for an Item to
+    match. Only one of the lists must match for an Item to match. They are
+    combined into a predicate tree (see :py:mod:`onyo.lib.query`), whose
+    sub-queries are ordered by their cost:
+
+    - Filters on ``onyo.path.*`` and ``onyo.is.*`` only need the path of an
+      Item, and thus neither its content nor its history.
+    - Filters (``=``) with a literal value or a literal prefix (``VALUE.*``) on
+      keys of the key index (see :py:class:`onyo.lib.key_index.KeyIndex`) are
+      looked up in the index. Unless the index is undecided for an asset, this
+      decides whether it matches without reading its content.
+    - Filters on other keys and any other callables need the content.
+    - Filters on ``onyo.was.*`` need the history and are evaluated last.
+
+    The cost of a node is that of its most expensive sub-query.
+
+    Asset names are not used to decide filters on the keys of the asset name
+    format. Existing assets are not renamed when ``onyo.assets.name-format``
+    changes, so their names do not necessarily reflect their content.
+
+    :py:func:`prefilter` rules out Items before their content is read.
+
+    Attributes
+    ----------
+    query
+        The predicate tree, ordered by cost.
+    key_index
+        The key index to look up filters in.
+    """
+
+    def __init__(self,
+                 match: list[list[Callable[[Item], bool]]],
+                 key_index: KeyIndex | None = None,
+                 root: Path | None = None) -> None:
+        r"""Plan the evaluation of match callables.
+
+        Parameters
+        ----------
+        match
+            Lists of match callables. See :py:func:`onyo.lib.inventory.Inventory.get_items`.
+            They can be (or contain) :py:class:`onyo.lib.query.Query` trees.
+        key_index
+            The key index to look up filters in. It must be in sync with the
+            worktree. If ``None``, no filters are looked up.
+        root
+            The root of the repository, which the paths of ``key_index`` are
+            relative to. Required with ``key_index``.
+        """
+
+        self.key_index: KeyIndex | None = key_index
+        self._index_keys: list[str] = key_index.keys if key_index else []
+        self._root: Path | None = root
+        self._lookup_values: dict[Query, tuple[str, bool] | None] = dict()
+        self._lookups: dict[Query, tuple[set[Path], set[Path]]] = dict()
+        self._costs: dict[Query, int] = dict()
+        self.query: Query = OrQuery([AndQuery([as_query(f) for f in m]) for m in match]).ordered(self.cost)
+
+    def cost(self,
+             query: Query) -> int:
+        r"""Get the estimated cost of evaluating a query.
+
+        Parameters
+        ----------
+        query
+            Query to get the cost of.
+        """
+
+        if query not in self._costs:
+            self._costs[query] = self._get_cost(query)
+
+        return self._costs[query]
+
+    def _get_cost(self,
+                  query: Query) -> int:
+        r"""Estimate the cost of evaluating a query.
+
+        Parameters
+        ----------
+        query
+            Query to get the cost of.
+        """
+
+        if not query.is_leaf:
+            return max((self.cost(c) for c in query.children), default=COST_PATH)
+
+        if not isinstance(query, FilterQuery):
+            return COST_CONTENT
+
+        key = resolve_alias(query.filter.key, alias_map=PSEUDOKEY_ALIASES)
+        if key.startswith(('onyo.path.', 'onyo.is.')):
+            return COST_PATH
+        if key.startswith('onyo.was.'):
+            return COST_HISTORY
+        if self._index_lookup_value(query) is not None:
+            return COST_INDEX
+
+        return COST_CONTENT
+
+    def _index_lookup_value(self,
+                            query: Query) -> tuple[str, bool] | None:
+        r"""Get the value to look up a query leaf by in the key index, if possible.
+
+        Only equality with a literal value (e.g. ``serial=ABC123``) or a literal
+        prefix (e.g. ``serial=ABC.*``) is considered.
+
+        Parameters
+        ----------
+        query
+            Query leaf.
+
+        Returns
+        -------
+        tuple[str, bool] | None
+            The value, and whether it is a prefix. ``None`` if ``query`` cannot
+            be looked up.
+        """
+
+        if query not in self._lookup_values:
+            self._lookup_values[query] = self._get_index_lookup_value(query)
+
+        return self._lookup_values[query]
+
+    def _get_index_lookup_value(self,
+                                query: Query) -> tuple[str, bool] | None:
+        r"""Get the value to look up a query leaf by in the key index, if possible.
+
+        Parameters
+        ----------
+        query
+            Query leaf.
+        """
+
+        if not isinstance(query, FilterQuery) or query.filter.operator != '=' or \
+                query.filter.key not in self._index_keys:
+            return None
+
+        value = query.filter.value
+        if value in [*TAG_MAP_TYPES, *TAG_MAP_VALUES, TAG_EMPTY, TAG_UNSET, '[]', '{}', '""', "''"]:
+            return None
+
+        prefix = value.endswith('.*')
+        if prefix:
+            value = value[:-2]
+        if any(c in value for c in _REGEX_CHARS):
+            return None
+
+        return value, prefix
+
+    def _lookup(self,
+                query: Query) -> tuple[set[Path], set[Path]]:
+        r"""Look up a query leaf in the key index.
+
+        Returns
+        -------
+        tuple
+            The absolute Paths of Items that match, and of Items that are
+            undecided (see :py:func:`onyo.lib.key_index.KeyIndex.lookup`).
+        """
+
+        if query not in self._lookups:
+            value, prefix = self._index_lookup_value(query)  # pyre-ignore[23]
+            results = self.key_index.lookup(query.filter.key, value, prefix=prefix)  # pyre-ignore[16]
+            self._lookups[query] = tuple(  # pyre-ignore[6]
+                {self._root / (p.parent if p.name == ASSET_DIR_FILE_NAME else p)  # pyre-ignore[58]
+                 for p in paths}
+                for paths in results)
+
+        return self._lookups[query]
+
+    @property
+    def prefilters(self) -> bool:
+        r"""Whether :py:func:`prefilter` can decide any part of the query."""
+
+        return any(self.cost(q) == COST_PATH or self._index_lookup_value(q) is not None
+                   for q in self.query.leaves())
+
+    def _prefilter_leaf(self,
+                        query: Query,
+                        item: Item) -> bool | None:
+        r"""Decide a query leaf for ``item`` without its content, if possible.
+
+        Parameters
+        ----------
+        query
+            Query leaf.
+        item
+            Item to match against.
+        """
+
+        if self.cost(query) == COST_PATH:
+            return query(item)
+
+        if self._index_lookup_value(query) is not None and item['onyo.is.asset']:
+            matches, undecided = self._lookup(query)
+            path = item['onyo.path.absolute']
+            return True if path in matches else None if path in undecided else False
+
+        return None
+
+    def prefilter(self,
+                  item: Item) -> bool | None:
+        r"""Whether ``item`` matches, judging only from its path and the key index.
+
+        The content of ``item`` is not accessed, so it should be loaded lazily
+        (see :py:func:`onyo.lib.items.Item.update_from_path`).
+
+        Parameters
+        ----------
+        item
+            Item to check.
+
+        Returns
+        -------
+        bool | None
+            ``None`` if it cannot be decided without the content of ``item``.
+        """
+
+        return self.query.prefilter(item, self._prefilter_leaf)
+
+    def __call__(self,
+                 item: Item) -> bool:
+        r"""Whether ``item`` matches.
+
+        Parameters
+        ----------
+        item
+            Item to check.
+        """
+
+        return self.query(item)
@@ -98,7 +98,7 @@ PSEUDO_KEYS: Dict[str, PseudoKey] = {
     ),
     'onyo.was.modified.author.name': PseudoKey(
         description="Name of the author of the most recent commit that modified the item.",
-        implementation=partial(delegate, attribute='_fill_modified', key='author.time')
+        implementation=partial(delegate, attribute='_fill_modified', key='author.name')
     ),
     'onyo.was.modified.author.email': PseudoKey(
         description="Email of the author of the most recent commit that modified the item.",
@@ -122,7 +122,7 @@ PSEUDO_KEYS: Dict[str, PseudoKey] = {
     ),
     'onyo.was.created.author.name': PseudoKey(
         description="Name of the author of the commit that created the item.",
-        implementation=partial(delegate, attribute='_fill_created', key='author.time')
+        implementation=partial(delegate, attribute='_fill_created', key='author.name')
     ),
     'onyo.was.created.author.email': PseudoKey(
         description="Email of the author of the commit that created the item.",
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import logging
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from typing import TYPE_CHECKING
+
+from onyo.lib.exceptions import OnyoInvalidFilterError
+from onyo.lib.filters import Filter
+
+if TYPE_CHECKING:
+    from typing import (
+        Callable,
+        Iterable,
+    )
+
+    from onyo.lib.items import Item
+
+log: logging.Logger = logging.getLogger('onyo.query')
+
+KEYWORDS = ('and', 'or', 'not', 'in', 'exists', '(', ')')
+r"""Tokens with a meaning in the query language (see :py:func:`parse_query`).
+
+Keywords are case-insensitive.
+"""
+
+
+class Query(ABC):
+    r"""A node of a predicate tree.
+
+    A ``Query`` is a callable suited for use with builtin :py:func:`filter`.
+    It is passed an :py:class:`onyo.lib.items.Item` and returns a ``bool``.
+    Subclasses must implement :py:func:`__call__`.
+
+    Attributes
+    ----------
+    children
+        The sub-queries of this node. Empty for leaves.
+    is_leaf
+        Whether this node is a leaf (rather than combining sub-queries).
+    """
+
+    children: list[Query] = []
+    is_leaf: bool = True
+
+    @abstractmethod
+    def __call__(self,
+                 item: Item) -> bool:
+        r"""Whether ``item`` matches.
+
+        Parameters
+        ----------
+        item
+            Item to match against.
+        """
+
+    def prefilter(self,
+                  item: Item,
+                  leaf: Callable[[Query, Item], bool | None]) -> bool | None:
+        r"""Whether ``item`` matches, as far as it can be determined by ``leaf``.
+
+        The result is three-valued: ``None`` means that it cannot be decided
+        (e.g. because it needs the content of ``item``).
+
+        Parameters
+        ----------
+        item
+            Item to match against.
+        leaf
+            Callable deciding a leaf for ``item``, if possible.
+        """
+
+        return leaf(self, item)
+
+    def ordered(self,
+                cost: Callable[[Query], int]) -> Query:
+        r"""Get this query with the sub-queries of each node ordered by ``cost``.
+
+        Parameters
+        ----------
+        cost
+            Callable returning the estimated cost of evaluating a query.
+        """
+
+        return self
+
+    def leaves(self) -> Iterable[Query]:
+        r"""Get all leaves of this query."""
+
+        if self.is_leaf:
+            yield self
+            return
+
+        for c in self.children:
+            yield from c.leaves()
+
+
+class FilterQuery(Query):
+    r"""Leaf evaluating a :py:class:`onyo.lib.filters.Filter`."""
+
+    def __init__(self,
+                 filter_: Filter) -> None:
+        r"""Instantiate a leaf for ``filter_``.
+
+        Parameters
+        ----------
+        filter_
+            The ``Filter`` to evaluate.
+        """
+
+        self.filter: Filter = filter_
+
+    def __call__(self,
+                 item: Item) -> bool:
+        r"""Whether ``item`` matches the Filter."""
+
+        return self.filter.match(item)
+
+    def __repr__(self) -> str:
+        r"""Represent the leaf by its Filter."""
+
+        return f"FilterQuery({self.filter.key}{self.filter.operator}{self.filter.value})"
+
+
+class CallableQuery(Query):
+    r"""Leaf evaluating an arbitrary match callable."""
+
+    def __init__(self,
+                 f: Callable[[Item], bool]) -> None:
+        r"""Instantiate a leaf for the match callable ``f``.
+
+        Parameters
+        ----------
+        f
+            Callable that is passed an Item and returns a ``bool``.
+        """
+
+        self.f: Callable[[Item], bool] = f
+
+    def __call__(self,
+                 item: Item) -> bool:
+        r"""Whether the match callable returns ``True`` for ``item``."""
+
+        return self.f(item)
+
+    def __repr__(self) -> str:
+        r"""Represent the leaf by its match callable."""
+
+        return f"CallableQuery({self.f!r})"
+
+
+class AndQuery(Query):
+    r"""Node that matches if all of its sub-queries match."""
+
+    is_leaf = False
+
+    def __init__(self,
+                 children: list[Query]) -> None:
+        r"""Instantiate a conjunction of ``children``.
+
+        Parameters
+        ----------
+        children
+            The sub-queries. If empty, everything matches.
+        """
+
+        self.children: list[Query] = children
+
+    def __call__(self,
+                 item: Item) -> bool:
+        r"""Whether ``item`` matches all sub-queries."""
+
+        return all(c(item) for c in self.children)
+
+    def prefilter(self,
+                  item: Item,
+                  leaf: Callable[[Query, Item], bool | None]) -> bool | None:
+        r"""``False`` if any sub-query is ``False``, ``None`` if any is undecided, ``True`` otherwise."""
+
+        result = True
+        for c in self.children:
+            r = c.prefilter(item, leaf)
+            if r is False:
+                return False
+            if r is None:
+                result = None
+
+        return result
+
+    def ordered(self,
+                cost: Callable[[Query], int]) -> Query:
+        r"""Get the conjunction of the ordered sub-queries, cheapest first."""
+
+        return AndQuery(sorted((c.ordered(cost) for c in self.children), key=cost))
+
+    def __repr__(self) -> str:
+        r"""Represent the node by its sub-queries."""
+
+        return f"AndQuery({self.children!r})"
+
+
+class OrQuery(Query):
+    r"""Node that matches if any of its sub-queries match."""
+
+    is_leaf = False
+
+    def __init__(self,
+                 children: list[Query]) -> None:
+        r"""Instantiate a disjunction of ``children``.
+
+        Parameters
+        ----------
+        children
+            The sub-queries. If empty, nothing matches.
+        """
+
+        self.children: list[Query] = children
+
+    def __call__(self,
+                 item: Item) -> bool:
+        r"""Whether ``item`` matches any sub-query."""
+
+        return any(c(item) for c in self.children)
+
+    def prefilter(self,
+                  item: Item,
+                  leaf: Callable[[Query, Item], bool | None]) -> bool | None:
+        r"""``True`` if any sub-query is ``True``, ``None`` if any is undecided, ``False`` otherwise."""
+
+        result = False
+        for c in self.children:
+            r = c.prefilter(item, leaf)
+            if r is True:
+                return True
+            if r is None:
+                result = None
+
+        return result
+
+    def ordered(self,
+                cost: Callable[[Query], int]) -> Query:
+        r"""Get the disjunction of the ordered sub-queries, cheapest first."""
+
+        return OrQuery(sorted((c.ordered(cost) for c in self.children), key=cost))
+
+    def __repr__(self) -> str:
+        r"""Represent the node by its sub-queries."""
+
+        return f"OrQuery({self.children!r})"
+
+
+class NotQuery(Query):
+    r"""Node that matches if its sub-query does not match."""
+
+    is_leaf = False
+
+    def __init__(self,
+                 child: Query) -> None:
+        r"""Instantiate the negation of ``child``.
+
+        Parameters
+        ----------
+        child
+            The sub-query to negate.
+        """
+
+        self.children: list[Query] = [child]
+
+    def __call__(self,
+                 item: Item) -> bool:
+        r"""Whether ``item`` does not match the sub-query."""
+
+        return not self.children[0](item)
+
+    def prefilter(self,
+                  item: Item,
+                  leaf: Callable[[Query, Item], bool | None]) -> bool | None:
+        r"""The negated result of the sub-query, or ``None`` if it is undecided."""
+
+        r = self.children[0].prefilter(item, leaf)
+        return None if r is None else not r
+
+    def ordered(self,
+                cost: Callable[[Query], int]) -> Query:
+        r"""Get the negation of the ordered sub-query."""
+
+        return NotQuery(self.children[0].ordered(cost))
+
+    def __repr__(self) -> str:
+        r"""Represent the node by its sub-query."""
+
+        return f"NotQuery({self.children[0]!r})"
+
+
+def as_query(f: Callable[[Item], bool]) -> Query:
+    r"""Get a match callable as a ``Query``.
+
+    The ``match`` methods of :py:class:`onyo.lib.filters.Filter` become a
+    :py:class:`FilterQuery`, so that their key can be considered when
+    evaluating a query.
+
+    Parameters
+    ----------
+    f
+        Match callable.
+    """
+
+    if isinstance(f, Query):
+        return f
+
+    obj = getattr(f, '__self__', None)
+    if isinstance(obj, Filter) and getattr(f, '__func__', None) is Filter.match:
+        return FilterQuery(obj)
+
+    return CallableQuery(f)
+
+
+def parse_query(tokens: list[str]) -> Query:
+    r"""Compile a query expression into a predicate tree.
+
+    The grammar is::
+
+        query     := or_expr
+        or_expr   := and_expr ('or' and_expr)*
+        and_expr  := not_expr (['and'] not_expr)*
+        not_expr  := 'not' not_expr | atom
+        atom      := '(' or_expr ')' | 'exists' KEY | KEY 'in' VALUES | FILTER
+
+    - ``FILTER`` is a ``KEY=VALUE`` statement (see :py:class:`onyo.lib.filters.Filter`)
+    - ``KEY in VALUES`` matches if one of the comma-separated ``VALUES``
+      matches (i.e. ``KEY=VALUE``)
+    - ``exists KEY`` matches if ``KEY`` is set (i.e. ``KEY!=<unset>``)
+
+    Statements that are not connected with ``or`` are connected with ``and``.
+    Thus a list of ``FILTER`` statements is matched as before this query
+    language existed. Keywords are case-insensitive and must be separate tokens.
+
+    Parameters
+    ----------
+    tokens
+        Tokens of the query expression (e.g. the arguments of one ``--match``).
+
+    Raises
+    ------
+    OnyoInvalidFilterError
+        The query expression is invalid.
+    """
+
+    pos = 0
+
+    def peek() -> str | None:
+        return tokens[pos].lower() if pos < len(tokens) and tokens[pos].lower() in KEYWORDS else None
+
+    def take() -> str:
+        nonlocal pos
+        if pos >= len(tokens):
+            raise OnyoInvalidFilterError("Unexpected end of query.")
+        pos += 1
+        return tokens[pos - 1]
+
+    def or_expr() -> Query:
+        children = [and_expr()]
+        while peek() == 'or':
+            take()
+            children.append(and_expr())
+
+        return children[0] if len(children) == 1 else OrQuery(children)
+
+    def and_expr() -> Query:
+        children = [not_expr()]
+        while pos < len(tokens) and peek() not in ('or', ')'):
+            if peek() == 'and':
+                take()
+            children.append(not_expr())
+
+        return children[0] if len(children) == 1 else AndQuery(children)
+
+    def not_expr() -> Query:
+        if peek() == 'not':
+            take()
+            return NotQuery(not_expr())
+
+        return atom()
+
+    def atom() -> Query:
+        keyword = peek()
+        token = take()
+        match keyword:
+            case '(':
+                query = or_expr()
+                if peek() != ')':
+                    raise OnyoInvalidFilterError("Missing closing parenthesis in query.")
+                take()
+                return query
+            case 'exists':
+                return FilterQuery(Filter(f"{take()}!=<unset>"))
+            case None if pos < len(tokens) and tokens[pos].lower() == 'in':
+                take()
+                values = take().split(',')
+                return OrQuery([FilterQuery(Filter(f"{token}={v}")) for v in values])
+            case None:
+                return FilterQuery(Filter(token))
+
+        raise OnyoInvalidFilterError(f"Unexpected '{token}' in query.")
+
+    if not tokens:
+        raise OnyoInvalidFilterError("Query is empty.")
+
+    query = or_expr()
+    if pos < len(tokens):
+        raise OnyoInvalidFilterError(f"Unexpected '{tokens[pos]}' in query.")
+
+    return query
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+from pathlib import Path
+
+from onyo.lib.ui import ui
+
+log: logging.Logger = logging.getLogger('onyo.sqlite_cache')
+
+_META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SQLiteCache(object):
+    r"""Base class of Onyo's persistent caches of a repository's commits.
+
+    A cache is an SQLite database, usually in ``.git/onyo/``. It can be deleted
+    at any time. Besides the tables of a subclass (:py:attr:`SCHEMA`), it has a
+    ``meta`` table of key-value pairs, which records the version of the
+    database layout and the commit the cache was last updated to
+    (:py:attr:`head`).
+
+    A database with a different layout (:py:attr:`SCHEMA_VERSION`) is rebuilt
+    when opened: its tables are dropped and created anew.
+
+    Attributes
+    ----------
+    path
+        The Path of the database file.
+    """
+
+    SCHEMA: str = ""
+    r"""SQL script creating the tables and indexes of the cache (other than ``meta``)."""
+
+    SCHEMA_VERSION: str = '1'
+    r"""Version of the database layout. A database with a different version is rebuilt."""
+
+    TABLES: tuple[str, ...] = ()
+    r"""Tables created by :py:attr:`SCHEMA`. They are emptied by :py:func:`clear`."""
+
+    def __init__(self,
+                 path: Path) -> None:
+        r"""Open (or create) the cache at ``path``.
+
+        Parameters
+        ----------
+        path
+            The Path of the database file. Parent directories are created as
+            needed.
+
+        Raises
+        ------
+        sqlite3.Error
+            The database cannot be opened.
+        """
+
+        self.path: Path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db: sqlite3.Connection = sqlite3.connect(path)
+        self._db.executescript(_META_SCHEMA)
+        if self._get_meta('schema') != self.SCHEMA_VERSION:
+            self._rebuild()
+        else:
+            self._db.executescript(self.SCHEMA)
+
+    def _rebuild(self) -> None:
+        r"""Drop all :py:attr:`TABLES` (and their indexes), and create them anew from :py:attr:`SCHEMA`."""
+
+        ui.log_debug(f"Rebuilding {self.path} for schema version {self.SCHEMA_VERSION}")
+        self._db.executescript(''.join(f"DROP TABLE IF EXISTS {table};\n" for table in self.TABLES)
+                               + self.SCHEMA)
+        self.clear()
+
+    def close(self) -> None:
+        r"""Close the database connection."""
+
+        self._db.close()
+
+    def _get_meta(self,
+                  key: str) -> str | None:
+        r"""Get the value of ``key`` in the ``meta`` table (``None`` if it is not set)."""
+
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self,
+                  key: str,
+                  value: str) -> None:
+        r"""Set the value of ``key`` in the ``meta`` table.
+
+        This is not committed. It is meant to be called within a transaction
+        of the caller.
+        """
+
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    @property
+    def head(self) -> str | None:
+        r"""The hexsha of the commit the cache was last updated to."""
+
+        return self._get_meta('head')
+
+    def clear(self) -> None:
+        r"""Remove all content from the cache."""
+
+        self._reset()
+
+    def _reset(self,
+               meta: dict[str, str] | None = None) -> None:
+        r"""Empty all :py:attr:`TABLES` and the ``meta`` table in a single transaction.
+
+        Parameters
+        ----------
+        meta
+            Key-value pairs to set in the ``meta`` table afterwards, in
+            addition to the schema version.
+        """
+
+        with self._db:
+            for table in self.TABLES:
+                self._db.execute(f"DELETE FROM {table}")
+            self._db.execute("DELETE FROM meta")
+            self._set_meta('schema', self.SCHEMA_VERSION)
+            for key, value in (meta or {}).items():
+                self._set_meta(key, value)
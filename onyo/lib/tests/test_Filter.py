@@ -1289,3 +1289,28 @@ def test_filter_format() -> None:
     assert Filter._format('key<=<==>') == ('key', '<=', '<==>')
     assert Filter._format('key=>==<') == ('key', '=', '>==<')
     assert Filter._format('key!!=!==<') == ('key!', '!=', '!==<')
+
+
+def test_filter_compiled(monkeypatch) -> None:
+    """Patterns and sort keys of the value are computed once, not per Item."""
+
+    import re
+
+    items = [Item(key=f'value{i}') for i in range(20)]
+
+    f = Filter('key=value1.*')
+    compile_calls = []
+    monkeypatch.setattr(re, 'compile', lambda *args, **kwargs: compile_calls.append(args))
+    assert [i['key'] for i in items if f.match(i)] == ['value1'] + [f'value{i}' for i in range(10, 20)]
+    assert compile_calls == []
+    monkeypatch.undo()
+
+    f = Filter('key>value9')
+    assert [i['key'] for i in items if f.match(i)] == [f'value{i}' for i in range(10, 20)]
+    f = Filter('key<=value9')
+    assert [i['key'] for i in items if f.match(i)] == [f'value{i}' for i in range(10)]
+
+    # an invalid pattern can still match literally
+    f = Filter('key=value[')
+    assert f.match(Item(key='value['))
+    assert not f.match(Item(key='value'))
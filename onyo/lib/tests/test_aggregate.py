@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from onyo.lib.aggregate import Aggregation
+from onyo.lib.consts import TAG_UNSET
+from onyo.lib.items import Item
+
+items = [
+    {'type': 'laptop', 'room': '101', 'price': 1000, 'user': 'alice'},
+    {'type': 'laptop', 'room': '101', 'price': 1500, 'user': 'bob'},
+    {'type': 'laptop', 'room': '102', 'price': 500.5, 'user': 'alice'},
+    {'type': 'display', 'room': '101', 'price': 'unknown'},
+    {'type': 'display', 'room': '9', 'price': 200, 'user': 'alice', 'specs': {'size': 27}},
+]
+
+
+def test_aggregation_errors() -> None:
+    r"""Unknown functions and missing keys are rejected."""
+
+    pytest.raises(ValueError, Aggregation, aggregates=[('avg', 'price')])
+    pytest.raises(ValueError, Aggregation, aggregates=[('sum', None)])
+
+
+def test_aggregation() -> None:
+    r"""Groups are aggregated in order of their first item."""
+
+    aggregation = Aggregation(group_by=['type'],
+                              aggregates=[('count', None), ('distinct', 'user'), ('min', 'room'),
+                                          ('max', 'room'), ('sum', 'price')])
+    assert aggregation.columns == ['type', 'count', 'distinct(user)', 'min(room)', 'max(room)', 'sum(price)']
+    assert aggregation([Item(i) for i in items]) == [
+        {'type': 'laptop', 'count': 3, 'distinct(user)': 2, 'min(room)': '101', 'max(room)': '102',
+         'sum(price)': 3000.5},
+        # non-numeric values aren't summed; rooms are compared naturally
+        {'type': 'display', 'count': 2, 'distinct(user)': 1, 'min(room)': '9', 'max(room)': '101',
+         'sum(price)': 200},
+    ]
+
+
+def test_aggregation_groups() -> None:
+    r"""Group by several keys, unset keys, and structures."""
+
+    # default is to count
+    assert Aggregation(group_by=['type', 'user'])(items) == [
+        {'type': 'laptop', 'user': 'alice', 'count': 2},
+        {'type': 'laptop', 'user': 'bob', 'count': 1},
+        {'type': 'display', 'user': TAG_UNSET, 'count': 1},
+        {'type': 'display', 'user': 'alice', 'count': 1},
+    ]
+    assert Aggregation(group_by=['specs'])(items) == [
+        {'specs': TAG_UNSET, 'count': 4},
+        {'specs': '<dict>', 'count': 1},
+    ]
+
+    # a single group without group_by; none without items
+    assert Aggregation(aggregates=[('max', 'price'), ('min', 'user')])(items) == [
+        {'max(price)': 'unknown', 'min(user)': 'alice'},
+    ]
+    assert Aggregation()([]) == []
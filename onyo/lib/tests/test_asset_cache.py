@@ -0,0 +1,100 @@
+"""Tests for onyo's asset_cache module."""
+import sqlite3
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from onyo.lib.asset_cache import AssetCache
+from onyo.lib.commands import (
+    onyo_new,
+    onyo_set,
+)
+from onyo.lib.consts import GIT_CACHE_DIR
+from onyo.lib.inventory import Inventory
+from onyo.lib.onyo import OnyoRepo
+
+
+@pytest.mark.ui({'yes': True})
+def test_AssetCache(repo, monkeypatch) -> None:
+    inventory = Inventory(repo)
+    root = inventory.root
+    spec = dict(type="TYPE", make="MAKER", model=dict(name="MODEL"))
+    onyo_new(inventory, directory=root, keys=[dict(serial=str(i), **spec) for i in range(3)])
+    (root / "TYPE_MAKER_MODEL.0").write_text("---\n# comment\ntype: TYPE # inline\nmake: MAKER\n"
+                                             "model:\n  name: MODEL\nserial: '0'\n")
+    repo.git.commit(root / "TYPE_MAKER_MODEL.0", "add comments")
+    expected = {i['onyo.path.relative']: (i.data, i.yaml()) for i in
+                [inventory.get_item(p) for p in repo.asset_paths]}
+
+    # items are read from git once and then served from the cache
+    cache = repo.asset_cache
+    assert cache.path == repo.git.git_dir / GIT_CACHE_DIR / 'assets.sqlite'
+    assert cache.head == repo.git.get_hexsha()
+    assert cache.get_contents(expected.keys()) == {}
+    assert {i['onyo.path.relative']: (i.data, i.yaml()) for i in inventory.get_items(readonly=True)} == expected
+    assert set(cache.get_contents(expected.keys())) == set(expected.keys())
+
+    read = []
+    read_objects = repo.git.read_objects
+    monkeypatch.setattr(repo.git, "read_objects",
+                        lambda objects: read.extend(objects := list(objects)) or read_objects(objects))
+    fresh = Inventory(OnyoRepo(root))
+    monkeypatch.setattr(fresh.repo.git, "read_objects", repo.git.read_objects)
+    assert {i['onyo.path.relative']: (i.data, i.yaml()) for i in fresh.get_items(readonly=True)} == expected
+    assert read == []
+
+    # only changed blobs are read again
+    onyo_set(inventory, assets=[root / "TYPE_MAKER_MODEL.1"], keys={"key": "value"})
+    items = {i['onyo.path.relative']: i for i in fresh.get_items(readonly=True)}
+    assert items[Path("TYPE_MAKER_MODEL.1")]["key"] == "value"
+    assert read == [cache.get_object_ids([Path("TYPE_MAKER_MODEL.1")])[Path("TYPE_MAKER_MODEL.1")]]
+
+    # every item gets its own copy of the content
+    items[Path("TYPE_MAKER_MODEL.2")]["key"] = "other"
+    assert "key" not in list(fresh.get_items(include=[root / "TYPE_MAKER_MODEL.2"], readonly=True))[0]
+
+    # rewritten history replaces the file list, but keeps the parsed contents
+    modified = cache.get_object_ids([Path("TYPE_MAKER_MODEL.1")])
+    subprocess.run(['git', 'reset', '--hard', 'HEAD~1'], cwd=root, check=True)
+    subprocess.run(['git', 'reflog', 'expire', '--expire=now', '--all'], cwd=root, check=True)
+    subprocess.run(['git', 'gc', '--prune=now', '--quiet'], cwd=root, check=True)
+    repo.clear_cache()
+    assert repo.asset_cache.head == repo.git.get_hexsha()
+    assert cache.get_object_ids([Path("TYPE_MAKER_MODEL.1")]) != modified
+    # the previous content of TYPE_MAKER_MODEL.1 was dropped, once unreferenced
+    assert set(cache.get_contents(expected.keys())) == set(expected.keys()) - {Path("TYPE_MAKER_MODEL.1")}
+
+    # contents are stored parsed and built into items without parsing YAML again
+    assert len(list(inventory.get_items(readonly=True))) == 3
+    assert cache.get_contents([Path("TYPE_MAKER_MODEL.0")]) == \
+        {Path("TYPE_MAKER_MODEL.0"): dict(type="TYPE", make="MAKER", model=dict(name="MODEL"), serial="0")}
+    monkeypatch.setattr("onyo.lib.utils.load_readonly", lambda *args, **kwargs: pytest.fail("YAML parsed"))
+    monkeypatch.setattr("onyo.lib.utils.yaml_to_dict_multi", lambda *args, **kwargs: pytest.fail("YAML parsed"))
+    items = {i['onyo.path.relative']: i for i in inventory.get_items(readonly=True)}
+    assert items[Path("TYPE_MAKER_MODEL.0")]["model.name"] == "MODEL"
+    monkeypatch.undo()
+    # ... but are reloaded with comments when needed
+    assert items[Path("TYPE_MAKER_MODEL.0")].yaml() == expected[Path("TYPE_MAKER_MODEL.0")][1]
+
+    # content the read-only loader (or JSON) can't represent is stored as YAML;
+    # invalid YAML is reported when loading the item
+    (root / "TYPE_MAKER_MODEL.0").write_text("type: TYPE  # not parsed read-only!\nmake: MAKER\n")
+    (root / "TYPE_MAKER_MODEL.1").write_text("type: TYPE\ntrue: key\n")
+    (root / "TYPE_MAKER_MODEL.2").write_text("key: [invalid\n")
+    repo.git.commit([root / f"TYPE_MAKER_MODEL.{i}" for i in range(3)], "change assets")
+    items = {i['onyo.path.relative']: i for i in inventory.get_items(readonly=True)}
+    assert items[Path("TYPE_MAKER_MODEL.0")]["type"] == "TYPE"
+    assert items[Path("TYPE_MAKER_MODEL.1")][True] == "key"
+    assert Path("TYPE_MAKER_MODEL.2") not in items
+    assert repo.asset_cache.get_contents(items.keys() | {Path("TYPE_MAKER_MODEL.2")}) == \
+        {Path("TYPE_MAKER_MODEL.0"): "type: TYPE  # not parsed read-only!\nmake: MAKER\n",
+         Path("TYPE_MAKER_MODEL.1"): "type: TYPE\ntrue: key\n",
+         Path("TYPE_MAKER_MODEL.2"): "key: [invalid\n"}
+
+    # a database of another schema is discarded
+    cache.close()
+    repo._asset_cache = None
+    with sqlite3.connect(cache.path) as db:
+        db.execute("UPDATE meta SET value = '0' WHERE key = 'schema'")
+    assert AssetCache(cache.path).head is None
@@ -8,11 +8,13 @@ import pytest
 from onyo.lib.consts import (
     ANCHOR_FILE_NAME,
     SORT_ASCENDING,
+    SORT_DESCENDING,
     TEMPLATE_DIR,
 )
 from onyo.lib.filters import Filter
 from onyo.lib.inventory import Inventory
 from onyo.lib.items import Item
+from onyo.lib.ui import ui
 from ..commands import onyo_get
 
 if TYPE_CHECKING:
@@ -669,3 +671,73 @@ def test_onyo_get_items(inventory: Inventory, capsys) -> None:
     assert len(output_lines) == 2
     assert "somewhere\n" in output_lines
     assert "somewhere/nested\n" in output_lines
+
+
+@pytest.mark.repo_contents(
+    ["one_that_exists.test", "type: one\nmake: that\nmodel:\n  name: exists\nserial: test\nsome_key: value"])
+@pytest.mark.ui({'yes': True})
+def test_onyo_get_pseudo_keys_only(inventory: Inventory,
+                                   monkeypatch,
+                                   capsys) -> None:
+    r"""Asset contents are not read when only pseudo-keys are involved."""
+
+    loaded = []
+    get_asset_content = inventory.repo.get_asset_content
+    monkeypatch.setattr(inventory.repo, "get_asset_content",
+                        lambda path, **kwargs: loaded.append(path) or get_asset_content(path, **kwargs))
+
+    results = onyo_get(inventory,
+                       keys=["path", "onyo.path.name"],
+                       match=[Filter("onyo.path.parent=somewhere/nested").match],  # pyre-ignore[6]
+                       sort={"onyo.path.name": SORT_ASCENDING},
+                       machine_readable=True)
+    assert [r["path"].name for r in results] == ["TYPE_MAKER_MODEL.SERIAL"]
+    assert "somewhere/nested/TYPE_MAKER_MODEL.SERIAL" in capsys.readouterr().out
+    assert loaded == []
+
+    # filters on content keys load the content
+    assert onyo_get(inventory,
+                    keys=["path"],
+                    match=[Filter("some_key=value").match],  # pyre-ignore[6]
+                    machine_readable=True) == 1
+    assert capsys.readouterr().out.strip() == "one_that_exists.test"
+    assert inventory.root / "one_that_exists.test" in loaded
+
+
+@pytest.mark.repo_contents(
+    ["laptop_apple_pro.10", "type: laptop\nmake: apple\nmodel:\n  name: pro\nserial: 10"],
+    ["laptop_apple_pro.9", "type: laptop\nmake: apple\nmodel:\n  name: pro\nserial: 9"],
+    ["a/display_eizo_ev.1", "type: display\nmake: eizo\nmodel:\n  name: ev\nserial: 1"])
+@pytest.mark.ui({'yes': True})
+@pytest.mark.parametrize('sort', [None,
+                                  {'path': SORT_ASCENDING},
+                                  {'onyo.path.relative': SORT_DESCENDING, 'type': SORT_ASCENDING}])
+def test_onyo_get_streaming(inventory: Inventory,
+                            monkeypatch,
+                            sort: dict | None) -> None:
+    r"""Machine-readable output sorted by path is printed as items are read."""
+
+    # the order is the same as when sorting all results
+    expected = onyo_get(inventory, keys=["path", "type"], sort=sort, machine_readable=False)
+    assert len(expected) > 1
+    lines = [f"{r['path']}\t{r['type']}" for r in expected]
+    printed = []
+    monkeypatch.setattr(ui, "print", lambda line, **kwargs: printed.append(line))
+    # the rows are not kept; only their number is returned
+    assert onyo_get(inventory, keys=["path", "type"], sort=sort, machine_readable=True) == len(expected)
+    assert printed == lines
+    printed.clear()
+    assert onyo_get(inventory, keys=["path", "type"], sort=sort, machine_readable=True, limit=1) == 1
+    assert printed == lines[:1]
+    printed.clear()
+    assert onyo_get(inventory, keys=["path", "type"], sort=sort, machine_readable=True,
+                    match=[Filter("type=none").match]) == 0  # pyre-ignore[6]
+    assert printed == []
+
+    events = []
+    get_item = inventory.get_item
+    monkeypatch.setattr(inventory, "get_item",
+                        lambda *args, **kwargs: events.append('read') or get_item(*args, **kwargs))
+    monkeypatch.setattr(ui, "print", lambda *args, **kwargs: events.append('print'))
+    onyo_get(inventory, keys=["path", "type"], sort=sort, machine_readable=True)
+    assert events == ['read', 'print'] * len(expected)
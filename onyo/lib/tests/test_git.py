@@ -232,6 +232,82 @@ def test_GitRepo_get_files(gitrepo) -> None:
         assert expected == tree
 
 
+@pytest.mark.gitrepo_contents((Path('some.file'),
+                               "some content"),
+                              (Path('top') / 'mid' / "another.txt",
+                               ""),
+                              (Path('with space') / "ünicöde\nnewline",
+                               "key: value\n")
+                              )
+def test_GitRepo_read_files(gitrepo) -> None:
+    files = gitrepo.test_annotation['files']
+    missing = gitrepo.root / 'not' / 'tracked'
+
+    # committed content is returned in order; untracked files yield None
+    result = list(gitrepo.read_files(files + [missing]))
+    assert [p for p, _ in result] == files + [missing]
+    for p, content in result[:-1]:
+        assert content == p.read_text()
+    assert result[-1] == (missing, None)
+    assert list(gitrepo.read_files([gitrepo.root / 'not tracked'])) == [(gitrepo.root / 'not tracked', None)]
+
+    # reads HEAD, not the worktree
+    files[0].write_text("modified")
+    assert next(gitrepo.read_files([files[0]]))[1] == "some content"
+
+    # object IDs resolve through the same kind of persistent process
+    oids = dict(gitrepo.get_object_ids([f"HEAD:{p.relative_to(gitrepo.root).as_posix()}" for p in files]
+                                       + ["HEAD:not/tracked", "HEAD:not tracked", "HEAD:not a file"]))
+    # missing names with spaces are recognized as missing
+    assert oids.pop("HEAD:not/tracked") is None
+    assert oids.pop("HEAD:not tracked") is None
+    assert oids.pop("HEAD:not a file") is None
+    assert all(len(oid) == 40 for oid in oids.values())
+    assert dict(gitrepo.read_objects(oids.values())) == \
+        {oid: p.read_bytes() if p != files[0] else b"some content"
+         for oid, p in zip(oids.values(), files)}
+
+    # many objects (more than one chunk) are streamed by a single process
+    process = gitrepo._cat_file._process
+    assert len(list(gitrepo.read_files(files * 2000))) == len(files) * 2000
+    assert gitrepo._cat_file._process is process
+
+    # closing shuts the process down; it is restarted on demand
+    gitrepo.close()
+    assert process.poll() is not None
+    assert gitrepo._cat_file._process is None
+    assert next(gitrepo.read_files([files[1]]))[1] == ""
+
+
+@pytest.mark.gitrepo_contents((Path('some.file'),
+                               "some content"),
+                              (Path('top') / 'mid' / "another.txt",
+                               ""),
+                              (Path('with space') / "ünicöde\nnewline",
+                               "key: value\n")
+                              )
+def test_GitRepo_get_blob_changes(gitrepo) -> None:
+    files = gitrepo.test_annotation['files']
+    base = gitrepo.get_hexsha()
+
+    # all blobs of a commit
+    blobs = gitrepo.get_blob_ids()
+    assert set(blobs.keys()) == set(gitrepo.files)
+    assert dict(gitrepo.get_object_ids([f"HEAD:{files[0].relative_to(gitrepo.root).as_posix()}"])) == \
+        {f"HEAD:{files[0].relative_to(gitrepo.root).as_posix()}": blobs[files[0]]}
+
+    # modified, added and removed files
+    files[0].write_text("modified")
+    new = gitrepo.root / 'new_file'
+    new.write_text("new")
+    files[1].unlink()
+    gitrepo.commit([files[0], files[1], new], "change files")
+    changes = dict(gitrepo.get_blob_changes(base))
+    blobs = gitrepo.get_blob_ids()
+    assert changes == {files[0]: blobs[files[0]], new: blobs[new], files[1]: None}
+    assert gitrepo.get_blob_changes(base, base) == []
+
+
 def test_GitRepo_get_hexsha(gitrepo) -> None:
     import string
 
@@ -363,6 +439,53 @@ def test_GitRepo_commit_long_paths(gitrepo,
     assert message == gitrepo.get_commit_msg()
 
 
+def test_GitRepo_commit_engines(tmp_path: Path) -> None:
+    r"""Both commit engines commit the same trees and leave the same index."""
+
+    def run(engine: str) -> list[tuple[str, str]]:
+        repo = GitRepo(tmp_path / engine)
+        repo.init_without_reinit()
+        root = repo.root
+        (root / '.gitignore').write_text("*.log\n")
+        (root / 'dir' / 'sub').mkdir(parents=True)
+        (root / 'dir' / 'a').write_text("a\n")
+        (root / 'dir' / 'sub' / 'b').write_text("b\n")
+        (root / 'dir' / 'new\nline').write_text("newline\n")
+        (root / '-dash').write_text("dash\n")
+        (root / 'dir' / 'ignored.log').write_text("ignored\n")
+        (root / 'script').write_text("#!/bin/sh\n")
+        (root / 'script').chmod(0o755)
+        (root / 'link').symlink_to('script')
+        (root / 'other').write_text("other\n")
+        results = []
+
+        # initial commit of a directory, files, and a symlink
+        repo.commit([root / '.gitignore', root / 'dir', root / 'script', root / 'link', root / '-dash'],
+                    "  initial  \n\n\n\nbody   \n\n", engine=engine)
+        results.append((repo.get_commit_msg(), repo._git(['ls-tree', '-r', 'HEAD'])))
+
+        # modify, add, move a directory, and remove a file; something else is staged
+        (root / 'dir' / 'a').write_text("changed\n")
+        (root / 'dir' / 'new\nline').write_text("changed\n")
+        (root / 'dir' / 'sub').rename(root / 'moved')
+        (root / 'script').unlink()
+        repo._git(['add', 'other'])
+        repo.commit([root / 'dir', root / 'moved', root / 'script'], "second", engine=engine)
+        results.append((repo.get_commit_msg(), repo._git(['ls-tree', '-r', 'HEAD'])))
+        results.append(('index', repo._git(['diff', '--cached', '--name-status'])))
+        results.append(('status', repo._git(['status', '--porcelain'])))
+
+        # nothing to commit
+        with pytest.raises(subprocess.CalledProcessError) as e:
+            repo.commit(root / 'moved', "nothing", engine=engine)
+        assert "nothing" in e.value.stdout
+        results.append(('log', repo._git(['log', '--format=%s'])))
+        return results
+
+    assert run('porcelain') == run('plumbing')
+    pytest.raises(ValueError, GitRepo(tmp_path / 'plumbing').commit, [], "message", engine='invalid')
+
+
 def test_GitRepo_config(gitrepo) -> None:
 
     assert gitrepo.get_config("section.name.option") is None
@@ -382,6 +505,25 @@ def test_GitRepo_config(gitrepo) -> None:
     assert gitrepo.get_config("onyo.test", path=cfg_file) == "another"
 
 
+def test_GitRepo_get_config_list(gitrepo) -> None:
+    cfg_file = gitrepo.root / "test_config"
+    assert gitrepo.get_config_list(cfg_file) == {}
+    cfg_file.write_text('[Section "SubSection"]\n\tKey = a\n\tKey = "b "\n\tflag\n[onyo]\n\tvalue = x=y\n')
+    assert gitrepo.get_config_list(cfg_file) == {"section.SubSection.key": "b",
+                                                 "section.SubSection.flag": "",
+                                                 "onyo.value": "x=y"}
+    # the snapshot agrees with `git config --get`
+    for key, value in gitrepo.get_config_list(cfg_file).items():
+        assert gitrepo.get_config(key, path=cfg_file) == value
+
+    gitrepo.set_config(key="section.name.option", value="some", location='local')
+    assert gitrepo.get_config_list()["section.name.option"] == "some"
+
+    assert gitrepo.normalize_config_key("Section.SubSection.Key") == "section.SubSection.key"
+    assert gitrepo.normalize_config_key("onyo.assets.name-format") == "onyo.assets.name-format"
+    assert gitrepo.normalize_config_key("Core") == "core"
+
+
 def test_GitRepo_check_ignore(gitrepo) -> None:
     committed = gitrepo.root / 'book.pdf'
     committed.touch()
@@ -408,3 +550,57 @@ def test_GitRepo_check_ignore(gitrepo) -> None:
 
     pytest.raises(ValueError, gitrepo.check_ignore,
                   ignore=ignore_file, paths=[Path('/') / 'outside' / 'sub' / 'file'])
+
+
+def test_GitRepo_history(gitrepo, monkeypatch) -> None:
+    import onyo.lib.git
+    # records are split across reads
+    monkeypatch.setattr(onyo.lib.git, '_LOG_READ_SIZE', 7)
+
+    env = dict(GIT_AUTHOR_NAME="Jörg A. Uthor", GIT_AUTHOR_EMAIL="author@example.com",
+               GIT_COMMITTER_NAME="Comm Itter", GIT_COMMITTER_EMAIL="committer@example.com")
+    for i in range(3):
+        (gitrepo.root / f"file{i}").write_text(str(i))
+        gitrepo._git(['add', f"file{i}"])
+        gitrepo._git(['commit', '-m', f"subject {i}\n\n  indented body\n\nlast line"], env=env)
+    gitrepo._git(['mv', 'file0', 'moved'])
+    gitrepo._git(['commit', '-m', "move"])
+
+    commits = list(gitrepo.history())
+    assert [c['hexsha'] for c in commits] == gitrepo._git(['rev-list', 'HEAD']).split()
+    assert commits[1]['author'] == dict(name="Jörg A. Uthor", email="author@example.com")
+    assert commits[1]['committer'] == dict(name="Comm Itter", email="committer@example.com")
+    assert commits[1]['message'] == ["subject 2", "", "  indented body", "", "last line"]
+    assert commits[1]['time'].isoformat() == gitrepo._git(['log', '-n1', '--format=%cI', 'HEAD~1']).strip()
+    assert commits[0]['message'] == ["move"]
+
+    # limits, revisions, and paths
+    assert [c['hexsha'] for c in gitrepo.history(n=2)] == [c['hexsha'] for c in commits[:2]]
+    assert [c['hexsha'] for c in gitrepo.history(revision='HEAD~2..HEAD~1')] == [commits[1]['hexsha']]
+    assert [c['message'][0] for c in gitrepo.history(gitrepo.root / 'moved')] == ["move", "subject 0"]
+
+    # stopping early doesn't wait for the rest
+    history = gitrepo.history()
+    assert next(history)['hexsha'] == commits[0]['hexsha']
+    history.close()
+
+    with pytest.raises(subprocess.CalledProcessError) as e:
+        list(gitrepo.history(revision='does-not-exist'))
+    assert 'does-not-exist' in e.value.stderr
+
+
+def test_GitRepo_fast_import_modes(gitrepo) -> None:
+    root = gitrepo.root
+    (root / "script").write_text("old\n")
+    (root / "script").chmod(0o755)
+    (root / "target").write_text("old\n")
+    (root / "link").symlink_to("target")
+    gitrepo.commit([root / "script", root / "target", root / "link"], "add files")
+
+    gitrepo.fast_import([('M', root / "script", b"new\n"),
+                         ('M', root / "link", b"new\n")], "write files")
+    tree = gitrepo._git(['ls-tree', 'HEAD'])
+    assert [line.split()[0] for line in tree.splitlines()] == ['120000', '100755', '100644']
+    assert (root / "target").read_text() == "new\n"
+    assert (root / "link").is_symlink()
+    assert gitrepo.is_clean_worktree()
@@ -0,0 +1,57 @@
+"""Tests for onyo's ignore module."""
+from pathlib import Path
+
+import pytest
+
+from onyo.lib.consts import IGNORE_FILE_NAME
+from onyo.lib.ignore import IgnoreMatcher
+
+
+@pytest.mark.gitrepo_contents((Path(IGNORE_FILE_NAME), "*.pdf\ndocs/\n/top_only\n"),
+                              (Path("sub") / IGNORE_FILE_NAME, "untracked*\nnested/file\n"),
+                              (Path("sub") / "nested" / "file", ""),
+                              (Path("sub") / "top_only", ""),
+                              (Path("top_only"), ""),
+                              )
+def test_IgnoreMatcher(gitrepo) -> None:
+    root = gitrepo.root
+    ignore_files = [f for f in gitrepo.files if f.name == IGNORE_FILE_NAME]
+    matcher = IgnoreMatcher(root)
+    matcher.load(gitrepo, ignore_files, gitrepo.get_hexsha())
+
+    ignored = [root / "some.pdf",
+               root / "sub" / "deep" / "a.pdf",
+               root / "docs" / "regular",
+               root / "top_only",
+               root / "sub" / "untracked_file",
+               root / "sub" / "nested" / "file"]
+    not_ignored = [root,
+                   root / "untracked_file",
+                   root / "nested" / "file",
+                   root / "sub" / "top_only",
+                   root / "sub" / "deep" / "nested" / "file",
+                   root / "pdf"]
+
+    # a batch gives the same results as single paths
+    assert matcher.match(ignored + not_ignored) == set(ignored)
+    fresh = IgnoreMatcher(root)
+    fresh.load(gitrepo, ignore_files, gitrepo.get_hexsha())
+    assert all(fresh.is_ignored(p) for p in ignored)
+    assert not any(fresh.is_ignored(p) for p in not_ignored)
+
+    # paths outside of the repo are invalid
+    pytest.raises(ValueError, matcher.is_ignored, root.parent / "some.pdf")
+
+    # the committed state is used, and unchanged blobs are not recompiled
+    spec = matcher._specs[root]
+    (root / "sub" / IGNORE_FILE_NAME).write_text("")
+    assert matcher.is_ignored(root / "sub" / "untracked_file")
+    gitrepo.commit(root / "sub" / IGNORE_FILE_NAME, "Empty ignore file")
+    matcher.load(gitrepo, ignore_files, gitrepo.get_hexsha())
+    assert matcher._specs[root] is spec
+    assert not matcher.is_ignored(root / "sub" / "untracked_file")
+    assert matcher.is_ignored(root / "sub" / "a.pdf")
+
+    # no commit, no ignore files
+    matcher.load(gitrepo, ignore_files, None)
+    assert not matcher.is_ignored(root / "some.pdf")
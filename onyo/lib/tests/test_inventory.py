@@ -45,3 +45,140 @@ def test_get_items_types(inventory: Inventory, capsys) -> None:
         assert t["onyo.is.asset"] is True
         assert t["onyo.is.directory"] is False
         assert t["onyo.is.template"] is True
+
+
+@pytest.mark.ui({'yes': True})
+def test_was_pseudo_keys_batch(repo, monkeypatch) -> None:
+    from onyo.lib.commands import (
+        onyo_mkdir,
+        onyo_mv,
+        onyo_new,
+        onyo_set,
+    )
+
+    inventory = Inventory(repo)
+    root = inventory.root
+    spec = dict(type="TYPE", make="MAKER", model=dict(name="MODEL"))
+    onyo_mkdir(inventory, dirs=[root / "a" / "sub"])
+    created_dirs = repo.git.get_hexsha()
+    onyo_new(inventory, directory=root / "a" / "sub", keys=[dict(serial="1", **spec)])
+    created_1 = repo.git.get_hexsha()
+    onyo_new(inventory, directory=root, keys=[dict(serial="2", **spec)])
+    created_2 = repo.git.get_hexsha()
+    onyo_mv(inventory, source=root / "a", destination=root / "b")
+    renamed = repo.git.get_hexsha()
+    moved_asset = root / "b" / "sub" / "TYPE_MAKER_MODEL.1"
+    onyo_set(inventory, keys={'serial': "3"}, assets=[moved_asset])
+    modified = repo.git.get_hexsha()
+
+    history_calls = []
+    history = repo.git.history
+    monkeypatch.setattr(repo.git, "history", lambda *args, **kwargs: history_calls.append(args) or history(*args, **kwargs))
+
+    items = {i['onyo.path.relative']: i for i in inventory.get_items(types=['assets', 'directories'])}
+    asset_1 = items[Path("b") / "sub" / "TYPE_MAKER_MODEL.3"]
+    assert asset_1['onyo.was.created.hexsha'] == created_1
+    assert asset_1['onyo.was.modified.hexsha'] == modified
+    assert asset_1['onyo.was.created.author.name'] == asset_1['onyo.was.created.committer.name'] is not None
+    asset_2 = items[Path("TYPE_MAKER_MODEL.2")]
+    assert asset_2['onyo.was.created.hexsha'] == asset_2['onyo.was.modified.hexsha'] == created_2
+    # directories are modified by moves/renames of themselves and their parents
+    for d in [Path("b"), Path("b") / "sub"]:
+        assert items[d]['onyo.was.created.hexsha'] == created_dirs
+        assert items[d]['onyo.was.modified.hexsha'] == renamed
+    assert items[Path(".")]['onyo.was.created.hexsha'] is None
+
+    # all items were resolved in a single pass over the history
+    assert len(history_calls) == 1
+
+    # a new commit invalidates the results
+    onyo_set(inventory, keys={'other': "value"}, assets=[root / "TYPE_MAKER_MODEL.2"])
+    assert inventory.get_item(root / "TYPE_MAKER_MODEL.2")['onyo.was.modified.hexsha'] == repo.git.get_hexsha()
+    assert len(history_calls) == 2
+
+
+@pytest.mark.ui({'yes': True})
+def test_get_items_prefilter(inventory: Inventory, monkeypatch) -> None:
+    from onyo.lib.filters import Filter
+    from onyo.lib.planner import (
+        COST_CONTENT,
+        COST_HISTORY,
+        COST_PATH,
+        QueryPlan,
+    )
+    from onyo.lib.query import (
+        as_query,
+        parse_query,
+    )
+
+    root = inventory.root
+    inventory.add_asset(Item(dict(type="TYPE", make="OTHER", model=dict(name="MODEL"), serial="1",
+                                  directory=root / "different" / "place"),
+                             repo=inventory.repo))
+    inventory.commit("Second asset added")
+
+    loaded = []
+    get_asset_content = inventory.repo.get_asset_content
+    monkeypatch.setattr(inventory.repo, "get_asset_content",
+                        lambda path, **kwargs: loaded.append(path) or get_asset_content(path, **kwargs))
+
+    # filters are ordered by cost
+    filters = [Filter(f) for f in ["onyo.was.created.hexsha=.*", "some_key=some_value",
+                                   "make=MAKER", "directory=somewhere/nested"]]
+    plan = QueryPlan([[f.match for f in filters]])
+    assert [plan.cost(q) for q in plan.query.leaves()] == [COST_PATH, COST_CONTENT, COST_CONTENT, COST_HISTORY]
+    assert plan.cost(as_query(lambda item: True)) == COST_CONTENT
+
+    # path filters rule out items without reading them
+    items = list(inventory.get_items(match=[[Filter("onyo.path.parent=different/place").match,
+                                             Filter("some_key=some_value").match],
+                                            [Filter("make=MAKER").match]]))
+    assert [i['onyo.path.relative'] for i in items] == [Path("somewhere") / "nested" / "TYPE_MAKER_MODEL.SERIAL"]
+    assert set(loaded) == {root / "different" / "place" / "TYPE_OTHER_MODEL.1",
+                           root / "somewhere" / "nested" / "TYPE_MAKER_MODEL.SERIAL"}
+
+    items = list(inventory.get_items(match=[Filter("make=OTH.*").match, Filter("type=TYPE").match]))
+    assert [i['onyo.path.name'] for i in items] == ["TYPE_OTHER_MODEL.1"]
+
+    loaded.clear()
+    items = list(inventory.get_items(match=[Filter("onyo.path.parent=empty").match,
+                                            Filter("make=MAKER").match]))
+    assert items == []
+    assert loaded == []
+
+    # content must match even if the name does
+    items = list(inventory.get_items(match=[Filter("make=MAKER").match, Filter("other=2").match]))
+    assert items == []
+
+    # query trees are planned as well
+    loaded.clear()
+    query = parse_query(["not", "onyo.path.parent=somewhere/nested", "make=MAKER"])
+    assert list(inventory.get_items(match=[query])) == []
+    assert loaded == [root / "different" / "place" / "TYPE_OTHER_MODEL.1"]
+
+
+@pytest.mark.ui({'yes': True})
+def test_get_items_name_format_changed(inventory: Inventory) -> None:
+    r"""Asset names don't decide filters, since they may follow a previous name format."""
+
+    from onyo.lib.filters import Filter
+    from onyo.lib.query import parse_query
+
+    root = inventory.root
+    inventory.add_asset(Item(dict(type="laptop", make="apple", model=dict(name="pro"), serial="111",
+                                  directory=root),
+                             repo=inventory.repo))
+    inventory.commit("laptop added")
+    asset = root / "laptop_apple_pro.111"
+    assert asset.is_file()
+    inventory.repo.set_config("onyo.assets.name-format", "{make}_{type}_{model.name}.{serial}", location='onyo')
+    inventory.repo.commit(inventory.repo.onyo_config, "change name format")
+
+    def matches(*query: str) -> list[Path]:
+        return [i['onyo.path.absolute'] for i in inventory.get_items(match=[parse_query(list(query))])]
+
+    assert matches("type=laptop") == [asset]
+    assert matches("make=apple") == [asset]
+    assert matches("make=apple", "type=laptop", "serial=111") == [asset]
+    assert asset not in matches("not", "type=laptop")
+    assert [i['onyo.path.absolute'] for i in inventory.get_items(match=[Filter("type=laptop").match])] == [asset]
@@ -1,3 +1,5 @@
+import subprocess
+
 import pytest
 
 from onyo.lib.consts import (
@@ -12,7 +14,7 @@ from onyo.lib.exceptions import (
     NotADirError,
     NotAnAssetError
 )
-from onyo.lib.inventory import Inventory, OPERATIONS_MAPPING
+from onyo.lib.inventory import Inventory, OperationQueue, OPERATIONS_MAPPING
 from onyo.lib.onyo import OnyoRepo
 from onyo.lib.items import Item
 
@@ -38,6 +40,66 @@ def test_Inventory_instantiation(repo: OnyoRepo) -> None:
     assert inventory.operations == []
 
 
+def test_OperationQueue(repo: OnyoRepo) -> None:
+    inventory = Inventory(repo)
+    newdir = inventory.root / "somewhere"
+    assets = [Item(directory=newdir, type="test", make="I", model=dict(name="mk1"), serial=str(i))
+              for i in range(3)]
+    for asset in assets:
+        inventory.add_asset(asset)
+
+    queue = inventory.operations
+    assert isinstance(queue, OperationQueue)
+    assert queue.new_dirs == {newdir}
+    assert queue.new_assets == {newdir / f"test_I_mk1.{i}" for i in range(3)}
+
+    # conflicts with pending operations are detected via the indexes
+    pytest.raises(ValueError, inventory.add_asset, assets[1])
+    assert len(inventory.add_directory(Item(newdir / "sub", repo=repo))) == 1
+    assert queue.new_dirs == {newdir, newdir / "sub"}
+
+    # truncating the queue keeps the indexes consistent
+    inventory.operations = inventory.operations[:2]
+    assert isinstance(inventory.operations, OperationQueue)
+    assert inventory.operations.new_dirs == {newdir}
+    assert inventory.operations.new_assets == {newdir / "test_I_mk1.0"}
+    del inventory.operations[1]
+    assert inventory.operations.new_assets == set()
+    inventory.operations.extend(queue[2:4])
+    assert inventory.operations.new_assets == {newdir / "test_I_mk1.1"}
+
+    inventory.reset()
+    assert inventory.operations == []
+    assert inventory.operations.new_assets == inventory.operations.new_dirs == set()
+
+
+def test_OperationQueue_relocations(inventory: Inventory) -> None:
+    root = inventory.root
+    asset = inventory.get_item(root / "somewhere" / "nested" / "TYPE_MAKER_MODEL.SERIAL")
+    empty = inventory.get_item(root / "empty")
+    place = inventory.get_item(root / "different" / "place")
+
+    inventory.move_asset(asset, empty)
+    inventory.rename_directory(place, "renamed")
+    queue = inventory.operations
+    assert queue.moves == {asset['onyo.path.absolute']: root / "empty" / "TYPE_MAKER_MODEL.SERIAL"}
+    assert queue.renames == {root / "different" / "place": root / "different" / "renamed"}
+    assert root / "empty" / "TYPE_MAKER_MODEL.SERIAL" in queue.new_assets
+    assert root / "different" / "renamed" in queue.new_dirs
+
+    # sources can only be relocated once
+    pytest.raises(ValueError, inventory.move_asset, asset, place)
+    pytest.raises(ValueError, inventory.move_directory, place, empty)
+    pytest.raises(ValueError, inventory.rename_directory, place, "other")
+    # destinations must not be pending already
+    inventory.add_directory(Item(root / "new", repo=inventory.repo))
+    inventory.add_directory(Item(root / "different" / "nested", repo=inventory.repo))
+    pytest.raises(ValueError, inventory.rename_directory, empty, "new")
+    pytest.raises(ValueError, inventory.move_directory, inventory.get_item(root / "somewhere" / "nested"),
+                  inventory.get_item(root / "different"))
+    assert len(queue) == 4
+
+
 def test_add_asset(repo: OnyoRepo) -> None:
     # TODO: mock repo? Real one not needed here.
     #       Possibly also mock add_directory instead.
@@ -130,6 +192,29 @@ def test_add_asset(repo: OnyoRepo) -> None:
     # TODO: should also fail when adding an asset that is already pending? Or one that is also being removed, etc?
 
 
+def test_get_faux_serials(repo: OnyoRepo, monkeypatch) -> None:
+    import random
+    inventory = Inventory(repo)
+    spec = dict(directory=inventory.root, type="test", make="I", model=dict(name="mk1"))
+    inventory.add_asset(Item(serial="fauxAAAAA", **spec))
+
+    # serials of existing and pending assets, and those handed out before, are not generated again
+    choices = iter(["AAAAA", "BBBBB", "AAAAA", "BBBBB", "CCCCC"])
+    monkeypatch.setattr(random, "choices", lambda population, k: next(choices))
+    assert inventory.get_faux_serials(num=1, length=5) == {"fauxBBBBB"}
+    asset = Item(serial="faux", **spec)
+    inventory.add_asset(asset)
+    assert asset['serial'] == "fauxCCCCC"
+
+    # discarding the pending operations releases their serials
+    inventory.reset()
+    monkeypatch.setattr(random, "choices", lambda population, k: "AAAAA")
+    assert inventory.get_faux_serials(num=1, length=5) == {"fauxAAAAA"}
+
+    pytest.raises(ValueError, inventory.get_faux_serials, num=0)
+    pytest.raises(ValueError, inventory.get_faux_serials, length=4)
+
+
 def test_remove_asset(inventory: Inventory) -> None:
     # NOTE: First trial using inventory fixture
 
@@ -1122,3 +1207,72 @@ def test_modify_asset_dir(repo: OnyoRepo) -> None:
     assert asset_from_disk['onyo.is.empty'] is True
     assert asset_from_disk['onyo.was.modified.hexsha'] == inventory.repo.git.get_hexsha()
     assert asset_from_disk['onyo.was.created.hexsha'] == inventory.repo.git.get_hexsha('HEAD~1')
+
+
+@pytest.mark.parametrize('bulk', [False, True])
+def test_commit_bulk(tmp_path, monkeypatch, bulk: bool) -> None:
+    # committing in bulk via git fast-import is equivalent to executing the operations
+
+    def populate(path):
+        repo = OnyoRepo(path, init=True)
+        monkeypatch.chdir(path)
+        repo.set_config("onyo.assets.name-format", "{type}_{make}_{model.name}.{serial}")
+        repo.git.commit(repo.onyo_config, message="Asset name config w/ dot")
+        inventory = Inventory(repo)
+        root = inventory.root
+        for d, serial, is_dir in [("a", "1", False), ("a", "2", False), ("b/c", "3", False), ("d", "4", True),
+                                  ("e", "5", False), ("e/f", "6", False)]:
+            asset = Item(type="T", make="M", model=dict(name="X"), serial=serial, directory=root / d)
+            if is_dir:
+                asset['onyo.is.directory'] = True
+                asset['onyo.path.absolute'] = root / d / f"T_M_X.{serial}"
+            inventory.add_asset(asset)
+        inventory.commit("populate")
+        # modes are kept
+        executable = root / "a" / "T_M_X.1"
+        executable.chmod(0o755)
+        repo.commit(executable, "make asset executable")
+
+        asset = inventory.get_item(root / "a" / "T_M_X.1")
+        modified = asset.copy()
+        modified.update(dict(model=dict(name="Y"), key="value"))
+        modified['onyo.path.absolute'] = None
+        inventory.modify_asset(asset, modified)  # implies a rename
+        inventory.remove_asset(inventory.get_item(root / "a" / "T_M_X.2"))
+        inventory.move_directory(inventory.get_item(root / "b" / "c"), inventory.get_item(root / "a"))
+        inventory.rename_directory(inventory.get_item(root / "b"), "renamed")
+        inventory.add_directory(Item(root / "e" / "T_M_X.5", repo=inventory.repo))  # asset file -> asset dir
+        inventory.remove_directory(inventory.get_item(root / "d" / "T_M_X.4"))  # asset dir -> asset file
+        inventory.remove_directory(inventory.get_item(root / "e" / "f"))
+        inventory.add_asset(Item(type="T", make="M", model=dict(name="X"), serial="7", directory=root / "new" / "dir"))
+        return inventory
+
+    reference = populate(tmp_path / "reference")
+    reference.commit("operations", bulk=False)
+
+    inventory = populate(tmp_path / "inventory")  # changes into its root
+    inventory.commit("operations", bulk=bulk)
+    assert inventory.operations == []
+    assert inventory.repo.git.is_clean_worktree()
+
+    # same tree, same operations record, same files
+    def ls_tree(inv: Inventory) -> str:
+        return inv.repo.git._git(['ls-tree', '-r', 'HEAD'])
+
+    assert ls_tree(inventory) == ls_tree(reference)
+    assert "100755 blob" in ls_tree(inventory)
+    assert inventory.repo.git.get_commit_msg() == reference.repo.git.get_commit_msg()
+    files = sorted(p.relative_to(inventory.root) for p in inventory.root.rglob('*') if '.git' not in p.parts)
+    assert files == sorted(p.relative_to(reference.root) for p in reference.root.rglob('*') if '.git' not in p.parts)
+    for f in files:
+        if (inventory.root / f).is_file():
+            assert (inventory.root / f).read_bytes() == (reference.root / f).read_bytes()
+    # caches are updated
+    assert inventory.repo.asset_paths == [inventory.root / p.relative_to(reference.root)
+                                          for p in reference.repo.asset_paths]
+
+    # nothing to commit
+    head = inventory.repo.git.get_hexsha()
+    with pytest.raises(subprocess.CalledProcessError):
+        inventory.repo.git.fast_import([('M', inventory.root / "new" / "dir" / ANCHOR_FILE_NAME, b'')], "noop")
+    assert inventory.repo.git.get_hexsha() == head
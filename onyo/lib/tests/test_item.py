@@ -6,6 +6,7 @@ from types import NoneType
 import pytest
 
 from onyo.lib.consts import ANCHOR_FILE_NAME
+from onyo.lib.exceptions import NotAnAssetError
 from onyo.lib.items import Item
 from onyo.lib.pseudokeys import (
     PSEUDO_KEYS,
@@ -207,3 +208,64 @@ def test_item_roundtrip(tmp_path) -> None:
     fixed_content = fixed_content.replace(" Null", "").replace(" NULL", "").replace(" null", "")
 
     assert item.yaml() == fixed_content
+
+
+def test_item_readonly(tmp_path) -> None:
+    """Content loaded read-only is reloaded with comments before it is modified."""
+
+    asset_path = tmp_path / "asset-file"
+    asset_path.write_text(asset_file_content.replace("  explicit: !!int '2'\n", ""))
+    roundtrip = Item(asset_path)
+
+    item = Item()
+    item.update_from_path(asset_path, readonly=True)
+    assert item._reload is not None
+    assert item.data == roundtrip.data
+    assert not hasattr(item['model'], 'ca')
+
+    # pseudo-keys don't require a reload
+    item['onyo.path.absolute']
+    item['onyo.test-pseudokey'] = 'value'
+    assert item._reload is not None
+
+    # modifying content does
+    item['type'] = 'other'
+    assert item._reload is None
+    assert item['type'] == 'other'
+    assert item['onyo.test-pseudokey'] == 'value'
+    roundtrip['type'] = 'other'
+    assert item.yaml() == roundtrip.yaml()
+    assert "# comment in nested dict" in item.yaml()
+
+    # as does getting the YAML
+    item = Item()
+    item.update_from_path(asset_path, readonly=True)
+    assert item.yaml() == Item(asset_path).yaml()
+
+
+def test_item_lazy(tmp_path) -> None:
+    """Loading content is deferred until a key other than a pseudo-key is accessed."""
+
+    asset_path = tmp_path / "asset-file"
+    asset_path.write_text("type: a  # comment\nmake: b\n")
+
+    item = Item()
+    item.update_from_path(asset_path, lazy=True)
+    asset_path.write_text("type: changed\n")
+    assert item['onyo.path.name'] == "asset-file"
+    item['onyo.test-pseudokey'] = 'value'
+    assert 'path' in item
+    assert item._load is not None
+
+    assert item['type'] == 'changed'
+    assert item._load is None
+    assert item['onyo.test-pseudokey'] == 'value'
+    assert 'make' not in item
+
+    # load errors surface on access
+    asset_path.write_text("type: [invalid\n")
+    item = Item()
+    item.update_from_path(asset_path, lazy=True)
+    assert item['onyo.path.name'] == "asset-file"
+    with pytest.raises(NotAnAssetError):
+        item.get('type')
@@ -0,0 +1,94 @@
+"""Tests for onyo's key_index module."""
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from onyo.lib.commands import (
+    onyo_new,
+    onyo_set,
+)
+from onyo.lib.consts import GIT_CACHE_DIR
+from onyo.lib.filters import Filter
+from onyo.lib.inventory import Inventory
+from onyo.lib.onyo import OnyoRepo
+from onyo.lib.query import parse_query
+
+
+@pytest.mark.ui({'yes': True})
+def test_KeyIndex(repo, monkeypatch, capsys) -> None:
+    inventory = Inventory(repo)
+    root = inventory.root
+    spec = dict(type="TYPE", make="MAKER", model=dict(name="MODEL"))
+    onyo_new(inventory, directory=root, keys=[dict(serial=f"AB{i}", **spec) for i in range(3)])
+    onyo_new(inventory, directory=root, keys=[dict(type="TYPE", make="MAKER", model=dict(name=["a", "b"]),
+                                                   serial="CD1")])
+
+    # nothing is indexed unless configured
+    assert repo.get_index_keys() == []
+    assert repo.key_index is None
+    repo.set_config('onyo.index.keys', 'serial, model.name owner path', location='local')
+    assert repo.get_index_keys() == ['serial', 'model.name', 'owner']
+
+    index = repo.key_index
+    assert index.path == repo.git.git_dir / GIT_CACHE_DIR / 'keys.sqlite'
+    assert index.head == repo.git.get_hexsha()
+    assert index.keys == ['serial', 'model.name', 'owner']
+    assert index.lookup('serial', 'AB1') == ({Path("TYPE_MAKER_MODEL.AB1")}, set())
+    assert index.lookup('serial', 'AB', prefix=True) == ({Path(f"TYPE_MAKER_MODEL.AB{i}") for i in range(3)}, set())
+    assert index.lookup('serial', 'AB') == (set(), set())
+    # structures are undecided
+    structured = {p.relative_to(root) for p in repo.asset_paths if p.name.endswith("CD1")}
+    assert index.lookup('model.name', 'MODEL') == ({Path(f"TYPE_MAKER_MODEL.AB{i}") for i in range(3)}, structured)
+
+    # equality, `in`, and prefix matches are answered without reading assets
+    read = []
+    get_asset_content = repo.get_asset_content
+    monkeypatch.setattr(repo, "get_asset_content",
+                        lambda path, **kwargs: read.append(path) or get_asset_content(path, **kwargs))
+    read_objects = repo.git.read_objects
+    monkeypatch.setattr(repo.git, "read_objects",
+                        lambda objects: read.extend(objects := list(objects)) or read_objects(objects))
+
+    def get(*query: str) -> set[str]:
+        return {i['onyo.path.name'] for i in inventory.get_items(match=[parse_query(list(query))], lazy=True)}
+
+    assert get("serial=AB1") == {"TYPE_MAKER_MODEL.AB1"}
+    assert get("serial", "in", "AB0,AB2,XY") == {"TYPE_MAKER_MODEL.AB0", "TYPE_MAKER_MODEL.AB2"}
+    assert get("serial=AB.*", "not", "serial=AB0") == {"TYPE_MAKER_MODEL.AB1", "TYPE_MAKER_MODEL.AB2"}
+    assert read == []
+
+    # regular expressions and undecided assets are read
+    assert get("serial=A.1") == {"TYPE_MAKER_MODEL.AB1"}
+    assert len(read) == 4  # asset names are not relied upon
+    read.clear()
+    assert len(get("model.name=MODEL")) == 3
+    assert len(read) == 1
+
+    # commits update the index with their changes only
+    read.clear()
+    onyo_set(inventory, assets=[root / "TYPE_MAKER_MODEL.AB1"], keys={"model.name": "OTHER"})
+    assert repo.key_index.head == repo.git.get_hexsha()
+    assert get("model.name=OTHER") == {"TYPE_MAKER_OTHER.AB1"}
+    assert len([r for r in read if not isinstance(r, Path)]) == 1
+
+    # external changes are picked up via diff-tree
+    (root / "TYPE_MAKER_MODEL.AB2").write_text("type: TYPE\nmake: MAKER\nmodel:\n  name: MODEL\nserial: AB2\n"
+                                               "owner: XY\n")
+    assert get("owner=XY") == {"TYPE_MAKER_MODEL.AB2"}  # dirty worktree: the index isn't used
+    subprocess.run(['git', 'commit', '-q', '-am', 'external'], cwd=root, check=True)
+    fresh = Inventory(OnyoRepo(root))
+    assert fresh.repo.key_index.lookup('owner', 'XY') == ({Path("TYPE_MAKER_MODEL.AB2")}, set())
+
+    # invalid YAML is undecided for all keys, and reported
+    (root / "TYPE_MAKER_MODEL.AB0").write_text("key: [invalid\n")
+    repo.git.commit(root / "TYPE_MAKER_MODEL.AB0", "break asset")
+    assert fresh.repo.key_index.lookup('owner', 'XY')[1] == {Path("TYPE_MAKER_MODEL.AB0")}
+    assert [i['onyo.path.name'] for i in fresh.get_items(match=[Filter("owner=XY").match])] == \
+        ["TYPE_MAKER_MODEL.AB2"]
+    assert "invalid" in capsys.readouterr().err
+
+    # changing the configured keys rebuilds the index
+    fresh.repo.set_config('onyo.index.keys', 'make', location='local')
+    assert fresh.repo.key_index.keys == ['make']
+    assert len(fresh.repo.key_index.lookup('make', 'MAKER')[0]) == 3
@@ -0,0 +1,60 @@
+"""Tests for onyo's nameformat module."""
+import pytest
+
+from onyo.lib.nameformat import AssetNameFormat
+
+
+def test_AssetNameFormat() -> None:
+    name_format = AssetNameFormat("{type}_{make}_{model.name}.{serial}")
+    assert name_format.keys == ["type", "make", "model.name", "serial"]
+    assert name_format.parse("laptop_apple_macbookpro.0io4ff") == \
+        {"type": "laptop", "make": "apple", "model.name": "macbookpro", "serial": "0io4ff"}
+    # separators within values are fine, as long as the name is unambiguous
+    assert name_format.parse("laptop_apple_macbook.pro.0io4ff") is None
+    assert name_format.parse("laptop_apple_macbook-pro.0io.4ff") is None
+    assert name_format.parse("laptop_apple_macbook_pro.0io4ff") is None
+    # not matching the format
+    assert name_format.parse("laptop_apple.0io4ff") is None
+    assert name_format.parse("laptop__macbookpro.0io4ff") is None
+
+    name_format = AssetNameFormat("{type}-{serial}.yaml")
+    assert name_format.parse("laptop-1.2.yaml") == {"type": "laptop", "serial": "1.2"}
+    assert name_format.parse("laptop-1-2.yaml") is None
+
+    # values modified by format specifications can't be recovered
+    name_format = AssetNameFormat("{type:.3}_{serial!s}_{make}")
+    assert name_format.keys == ["make"]
+    assert name_format.parse("lap_123_apple") == {"make": "apple"}
+
+    # a key used more than once must have the same value
+    name_format = AssetNameFormat("{type}.{serial}.{type}")
+    assert name_format.parse("laptop.1.laptop") == {"type": "laptop", "serial": "1"}
+    assert name_format.parse("laptop.1.monitor") is None
+
+    pytest.raises(ValueError, AssetNameFormat, "{type")
+
+
+def test_AssetNameFormat_format_name() -> None:
+    name_format = AssetNameFormat("{type}_{make}_{model.name}.{serial}")
+    assert name_format.required_keys == ["type", "make", "model.name", "serial"]
+    asset = {"type": "laptop", "make": "apple", "model.name": "macbookpro", "serial": 1}
+    assert name_format.format_name(asset) == "laptop_apple_macbookpro.1"
+    assert name_format.parse(name_format.format_name(asset)) == \
+        {"type": "laptop", "make": "apple", "model.name": "macbookpro", "serial": "1"}
+    with pytest.raises(ValueError, match="'model.name'"):
+        name_format.format_name({"type": "laptop", "make": "apple", "serial": 1})
+
+    # format specifications, conversions, and escaped braces
+    name_format = AssetNameFormat("{type:.3}-{serial!r:>5}{{x}}")
+    assert name_format.required_keys == ["type", "serial"]
+    assert name_format.format_name({"type": "laptop", "serial": 12}) == "lap-   12{x}"
+
+    # indexing into a value and nested fields are left to `str.format`
+    name_format = AssetNameFormat("{tags[0]}_{serial:{width}}")
+    assert name_format.required_keys == ["tags", "serial", "width"]
+    assert name_format.format_name({"tags": ["a", "b"], "serial": 1, "width": 3}) == "a_  1"
+    pytest.raises(ValueError, name_format.format_name, {"tags": ["a"], "serial": 1})
+
+    # fields must reference keys
+    pytest.raises(ValueError, AssetNameFormat, "{}_{serial}")
+    pytest.raises(ValueError, AssetNameFormat, "{type!x}")
@@ -1,13 +1,16 @@
+import subprocess
 from pathlib import Path
 
 import pytest
 
 from onyo.lib.consts import (
     ANCHOR_FILE_NAME,
+    ASSET_DIR_FILE_NAME,
     IGNORE_FILE_NAME,
     TEMPLATE_DIR,
 )
 from onyo.lib.onyo import OnyoRepo, OnyoInvalidRepoError
+from onyo.lib.pathindex import PathIndex
 from onyo.lib.items import (
     Item,
     ItemSpec,
@@ -263,6 +266,55 @@ def test_validate_anchors(onyorepo) -> None:
         assert not onyorepo.validate_anchors()
 
 
+def test_onyo_maintenance(onyorepo, monkeypatch) -> None:
+    r"""Maintenance tasks report their effect, and run automatically if configured."""
+
+    for i in range(3):
+        (onyorepo.git.root / f"file{i}").write_text(str(i))
+        onyorepo.commit(onyorepo.git.root / f"file{i}", f"add file{i}")
+
+    results = onyorepo.maintenance()
+    assert [r['task'] for r in results] == ['commit-graph', 'repack', 'caches']
+    assert all(r['time'] >= 0 and r['before'].keys() == r['after'].keys() for r in results)
+    graph, repack, caches = results
+    assert graph['after']['size (KiB)'] > 0
+    assert (onyorepo.git.git_dir / 'objects' / 'info' / 'commit-graph').exists() or \
+        (onyorepo.git.git_dir / 'objects' / 'info' / 'commit-graphs').exists()
+    assert repack['before']['loose objects'] > 0
+    assert repack['after']['loose objects'] == 0
+    assert repack['after']['packs'] == 1
+    assert list(onyorepo.git.git_dir.glob('objects/pack/*.bitmap'))
+    assert onyorepo.operations_index.head == onyorepo.git.get_hexsha()
+    assert onyorepo.asset_cache.head == onyorepo.git.get_hexsha()
+    assert caches['after']['size (KiB)'] > 0
+
+    # subsets of tasks
+    assert [r['task'] for r in onyorepo.maintenance(['caches'])] == ['caches']
+    pytest.raises(ValueError, onyorepo.maintenance, ['invalid'])
+
+    # automatic maintenance after N commits
+    assert onyorepo.maintenance_auto == 0
+    assert not onyorepo.maintenance_due()
+    onyorepo.set_config("onyo.maintenance.auto", "2", location='local')
+    assert onyorepo.maintenance_auto == 2
+    assert not onyorepo.maintenance_due()
+
+    runs = []
+    maintenance = onyorepo.maintenance
+    monkeypatch.setattr(onyorepo, "maintenance", lambda tasks=None: runs.append(tasks) or maintenance(tasks))
+    for i in range(3):
+        (onyorepo.git.root / f"other{i}").write_text(str(i))
+        onyorepo.commit(onyorepo.git.root / f"other{i}", f"add other{i}")
+        assert len(runs) == (1 if i > 0 else 0)
+    assert not onyorepo.maintenance_due()
+    # only the cheap tasks run automatically
+    assert runs == [['commit-graph', 'caches']]
+
+    # a recorded commit that is gone counts all commits
+    (onyorepo.git.git_dir / 'onyo' / 'maintenance').write_text("0" * 40 + "\n")
+    assert onyorepo.maintenance_due()
+
+
 @pytest.mark.gitrepo_contents((Path('.gitignore'), "idea/"),
                               (Path("subdir") / ".gitignore", "i_*"),
                               (Path(IGNORE_FILE_NAME), "*.pdf\ndocs/"),
@@ -327,6 +379,57 @@ def test_onyo_auto_message(onyorepo, caplog) -> None:
     assert "Invalid config value" in caplog.text
 
 
+def test_onyo_commit_engine(onyorepo, caplog) -> None:
+    """Test configuration ``'onyo.commit.engine'``."""
+
+    assert onyorepo.commit_engine == 'porcelain'
+    onyorepo.set_config("onyo.commit.engine", "Plumbing", location='local')
+    assert onyorepo.commit_engine == 'plumbing'
+    (onyorepo.git.root / "file").write_text("content")
+    onyorepo.commit(onyorepo.git.root / "file", "add file")
+    assert onyorepo.git.get_commit_msg().strip() == "add file"
+    assert onyorepo.git.is_clean_worktree()
+
+    # invalid config gives warning and uses the default
+    onyorepo.set_config("onyo.commit.engine", "invalid", location='local')
+    assert onyorepo.commit_engine == 'porcelain'
+    assert "Invalid config value" in caplog.text
+
+
+def test_onyo_config_snapshot(onyorepo, monkeypatch) -> None:
+    r"""Config lookups are answered from a snapshot, loaded with one call per layer."""
+
+    onyorepo.set_config("onyo.test.Key", "onyo", location='onyo')
+    onyorepo.set_config("onyo.test.other", "git", location='local')
+    onyorepo.set_config("onyo.test.Key", "local", location='local')
+
+    calls = []
+    get_config_list = onyorepo.git.get_config_list
+    monkeypatch.setattr(onyorepo.git, "get_config_list",
+                        lambda path=None: calls.append(path) or get_config_list(path))
+    # git's config takes precedence over .onyo/config; section and key names are case-insensitive
+    assert onyorepo.get_config("ONYO.test.key") == "local"
+    assert onyorepo.get_config("onyo.test.other") == "git"
+    assert onyorepo.get_config("onyo.repo.version") == onyorepo.version
+    assert onyorepo.get_config("onyo.test.missing") is None
+    assert onyorepo.get_config("onyo.assets.name-format")
+    assert calls == [None, onyorepo.onyo_config]
+
+    # writes invalidate the snapshot; commits only if they include .onyo/config
+    onyorepo.set_config("onyo.test.other", "changed", location='local')
+    assert onyorepo.get_config("onyo.test.other") == "changed"
+    assert onyorepo.get_config("onyo.test.missing") is None
+    assert len(calls) == 4
+    (onyorepo.git.root / "file").touch()
+    onyorepo.commit(onyorepo.git.root / "file", "add file")
+    assert onyorepo.get_config("onyo.test.other") == "changed"
+    assert len(calls) == 4
+    subprocess.run(["git", "config", "-f", str(onyorepo.onyo_config), "onyo.test.new", "value"],
+                   cwd=onyorepo.git.root, check=True)
+    onyorepo.commit(onyorepo.onyo_config, "change config")
+    assert onyorepo.get_config("onyo.test.new") == "value"
+
+
 @pytest.mark.gitrepo_contents((Path('.gitignore'), "idea/"),
                               (Path("subdir") / ".gitignore", "i_*"),
                               (Path(IGNORE_FILE_NAME), "*.pdf\ndocs/"),
@@ -365,3 +468,86 @@ def test_get_item_paths(onyorepo) -> None:
                for p in onyorepo.get_item_paths(types=['assets', 'directories']))
 
     # TODO: Test include/exclude/depth. This is currently only done at higher level (onyo get command).
+
+
+@pytest.mark.gitrepo_contents((Path(IGNORE_FILE_NAME), "*.pdf\n"),
+                              (Path("some.pdf"), "bla"))
+@pytest.mark.inventory_assets(Item(type="atype",
+                                   make="amake",
+                                   model="amodel",
+                                   serial=1,
+                                   path=Path("subdir") / "atype_amake_amodel.1"))
+@pytest.mark.inventory_dirs(Path('a/test/directory/structure/'),
+                            Path('another/dir/'))
+@pytest.mark.inventory_templates((TEMPLATE_DIR / "t_dir" / "atemplate", "--\nkey: value\n"))
+def test_path_index(onyorepo) -> None:
+    root = onyorepo.git.root
+    asset = root / "subdir" / "atype_amake_amodel.1"
+    index = onyorepo.path_index
+
+    def assert_index_is_current() -> None:
+        fresh = PathIndex(root, onyorepo.template_dir)
+        fresh.add_files(onyorepo.git.get_files(), onyorepo.is_item_path)
+        assert onyorepo.path_index.files == fresh.files
+        assert onyorepo.path_index.assets == fresh.assets
+        assert onyorepo.path_index.directories == fresh.directories
+        assert onyorepo.path_index.get_children(root) == fresh.get_children(root)
+        # the order of the tracked files is that of git:
+        assert onyorepo.path_index.get_files() == onyorepo.git.get_files()
+
+    assert_index_is_current()
+    assert onyorepo.is_asset_path(asset)
+    assert onyorepo.is_asset_file(asset)
+    assert not onyorepo.is_asset_dir(asset)
+    assert not onyorepo.is_asset_path(root / "some.pdf")
+    assert onyorepo.is_inventory_dir(root)
+    assert onyorepo.is_inventory_dir(root / "a" / "test")
+    assert not onyorepo.is_inventory_dir(root / "a" / "test" / "doesnotexist")
+    assert index.is_template(onyorepo.template_dir / "t_dir" / "atemplate")
+    assert not onyorepo.is_asset_path(onyorepo.template_dir / "t_dir" / "atemplate")
+    assert index.get_children(root / "another") == {root / "another" / "dir", root / "another" / ANCHOR_FILE_NAME}
+    assert index.get_children(root / "subdir") == {asset, root / "subdir" / ANCHOR_FILE_NAME}
+
+    # committing updates the index in place
+    new_asset = root / "another" / "dir" / "new_asset"
+    new_asset.write_text("key: value\n")
+    asset.unlink()
+    (root / "a" / "test" / "directory" / "structure" / ANCHOR_FILE_NAME).unlink()
+    onyorepo.commit([new_asset, asset, root / "a"], "Modify inventory")
+    assert onyorepo.path_index is index
+    assert_index_is_current()
+    assert onyorepo.is_asset_path(new_asset)
+    assert not onyorepo.is_asset_path(asset)
+    assert not onyorepo.is_inventory_dir(root / "a" / "test" / "directory" / "structure")
+    assert index.get_children(root / "a" / "test" / "directory") == {root / "a" / "test" / "directory" / ANCHOR_FILE_NAME}
+
+    # turn an asset file into an asset directory
+    new_asset.unlink()
+    new_asset.mkdir()
+    (new_asset / ANCHOR_FILE_NAME).touch()
+    (new_asset / ASSET_DIR_FILE_NAME).write_text("key: value\n")
+    onyorepo.commit([new_asset / ANCHOR_FILE_NAME, new_asset / ASSET_DIR_FILE_NAME], "Turn into asset dir")
+    assert onyorepo.path_index is index
+    assert_index_is_current()
+    assert onyorepo.is_asset_dir(new_asset)
+
+    # changes to an ignore file invalidate the index
+    (root / IGNORE_FILE_NAME).write_text("")
+    onyorepo.commit(root / IGNORE_FILE_NAME, "Unignore pdf")
+    assert onyorepo.path_index is not index
+    assert_index_is_current()
+    assert onyorepo.is_asset_path(root / "some.pdf")
+
+    # commits made around OnyoRepo are picked up as well
+    index = onyorepo.path_index
+    (root / "some.pdf").unlink()
+    onyorepo.git.commit(root / "some.pdf", "Remove pdf")
+    assert not onyorepo.is_asset_path(root / "some.pdf")
+    # a commit by another process is picked up by `get_item_paths()`
+    subprocess.run(['git', 'rm', '-q', str(root / "another" / "dir" / ANCHOR_FILE_NAME)], cwd=root, check=True)
+    subprocess.run(['git', 'commit', '-q', '-m', 'Remove dir'], cwd=root, check=True)
+    assert onyorepo.is_inventory_dir(root / "another" / "dir")
+    assert root / "another" / "dir" not in onyorepo.get_item_paths(types=['directories'])
+    assert not onyorepo.is_inventory_dir(root / "another" / "dir")
+    assert onyorepo.path_index is index
+    assert_index_is_current()
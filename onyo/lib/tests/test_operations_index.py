@@ -0,0 +1,114 @@
+"""Tests for onyo's operations_index module."""
+import sqlite3
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from onyo.lib.commands import (
+    onyo_mkdir,
+    onyo_mv,
+    onyo_new,
+    onyo_set,
+)
+from onyo.lib.consts import GIT_CACHE_DIR
+from onyo.lib.inventory import Inventory
+from onyo.lib.onyo import OnyoRepo
+from onyo.lib.operations_index import OperationsIndex
+
+
+@pytest.mark.ui({'yes': True})
+def test_OperationsIndex(repo, monkeypatch) -> None:
+    inventory = Inventory(repo)
+    root = inventory.root
+    spec = dict(type="TYPE", make="MAKER", model=dict(name="MODEL"))
+    onyo_mkdir(inventory, dirs=[root / "a"])
+    onyo_new(inventory, directory=root / "a", keys=[dict(serial="1", **spec)])
+    onyo_mv(inventory, source=root / "a", destination=root / "b")
+
+    # the index has the same history as git log
+    index = repo.operations_index
+    assert index.path == repo.git.git_dir / GIT_CACHE_DIR / 'operations.sqlite'
+    assert index.head == repo.git.get_hexsha()
+    expected = [repo._parse_operations(c) for c in repo.git.history()]
+    assert list(index.get_commits()) == expected
+    assert list(index.get_commits(2)) == expected[:2]
+    assert [c.data for c in repo.get_history()] == expected
+    n = len(expected)
+    assert index.get_path_operations(Path("b")) == [(n, 'rename_directories', Path("b"), Path("a"))]
+    assert index.get_path_operations(Path("a") / "TYPE_MAKER_MODEL.1") == \
+        [(n, 'rename_directories', Path("b"), Path("a")),
+         (n - 1, 'new_assets', Path("a") / "TYPE_MAKER_MODEL.1", None),
+         (n - 2, 'new_directories', Path("a"), None)]
+    assert index.get_path_operations(Path("a"), until=n - 1, descendants=True) == \
+        [(n - 1, 'new_assets', Path("a") / "TYPE_MAKER_MODEL.1", None),
+         (n - 2, 'new_directories', Path("a"), None)]
+    assert index.get_unrecorded_commits() == [(n - i, c['hexsha']) for i, c in enumerate(expected)
+                                              if 'operations' not in c]
+    assert list(index.get_commits(seqs=[n, 1])) == [expected[0], expected[-1]]
+
+    # the index persists, and only new commits are read
+    revisions = []
+    history = repo.git.history
+    monkeypatch.setattr(repo.git, "history",
+                        lambda *args, **kwargs: revisions.append(kwargs.get('revision')) or history(*args, **kwargs))
+    fresh = OnyoRepo(root)
+    monkeypatch.setattr(fresh.git, "history", repo.git.history)
+    assert [c.data for c in fresh.get_history()] == expected
+    assert revisions == []
+
+    base = repo.git.get_hexsha()
+    onyo_new(inventory, directory=root / "b", keys=[dict(serial="2", **spec)])
+    assert fresh.operations_index.head == repo.git.get_hexsha()
+    assert revisions == [f"{base}..{repo.git.get_hexsha()}"]
+    assert [c.data for c in fresh.get_history()] == [repo._parse_operations(c) for c in history()]
+
+    # rewritten history rebuilds the index
+    subprocess.run(['git', 'reset', '--hard', 'HEAD~2'], cwd=root, check=True)
+    repo.clear_cache()
+    assert fresh.operations_index.head == repo.git.get_hexsha()
+    assert revisions[-1] == repo.git.get_hexsha()
+    assert [c.data for c in fresh.get_history()] == [repo._parse_operations(c) for c in history()]
+
+    # a database of another schema is discarded
+    index.close()
+    fresh.operations_index.close()
+    fresh._operations_index = None
+    with sqlite3.connect(index.path) as db:
+        db.execute("UPDATE meta SET value = '0' WHERE key = 'schema'")
+    assert OperationsIndex(index.path).head is None
+
+
+@pytest.mark.ui({'yes': True})
+def test_OperationsIndex_path_history(repo, monkeypatch) -> None:
+    inventory = Inventory(repo)
+    root = inventory.root
+    spec = dict(type="TYPE", make="MAKER", model=dict(name="MODEL"))
+    onyo_mkdir(inventory, dirs=[root / "a", root / "c"])
+    onyo_new(inventory, directory=root / "a", keys=[dict(serial="1", **spec), dict(serial="2", **spec)])
+    onyo_set(inventory, keys=dict(color="red"), assets=[root / "a" / "TYPE_MAKER_MODEL.1"])
+    onyo_mv(inventory, source=root / "a", destination=root / "b")
+    onyo_set(inventory, keys=dict(color="blue"), assets=[root / "b" / "TYPE_MAKER_MODEL.2"])
+    onyo_mv(inventory, source=root / "b" / "TYPE_MAKER_MODEL.1", destination=root / "c")
+    # a commit without an operations record
+    (root / "c" / "TYPE_MAKER_MODEL.1").write_text("type: TYPE\nmake: MAKER\nmodel:\n  name: MODEL\nserial: 1\n")
+    repo.commit(root / "c" / "TYPE_MAKER_MODEL.1", "manual edit")
+    onyo_set(inventory, keys=dict(color="green"), assets=[root / "b" / "TYPE_MAKER_MODEL.2"])
+
+    def hexshas(commits) -> list[str]:
+        return [c['hexsha'] for c in commits]
+
+    # the history of assets and directories is the same as git's, but is served from the index
+    expected = {path: hexshas(repo.git.history(path))
+                for path in [root / "c" / "TYPE_MAKER_MODEL.1", root / "b" / "TYPE_MAKER_MODEL.2",
+                             root / "b", root / "c", Path("c") / "TYPE_MAKER_MODEL.1"]}
+    assert repo.operations_index.head == repo.git.get_hexsha()
+    monkeypatch.setattr(repo.git, "history", lambda *args, **kwargs: pytest.fail("git log was called"))
+    for path, commits in expected.items():
+        assert hexshas(repo.get_history(path)) == commits
+        assert hexshas(repo.get_history(path, n=1)) == commits[:1]
+    assert len(expected[root / "c" / "TYPE_MAKER_MODEL.1"]) == 5
+
+    # other paths fall back to git
+    with pytest.raises(pytest.fail.Exception):
+        list(repo.get_history(root / "c" / ".anchor"))
@@ -0,0 +1,97 @@
+"""Tests for onyo's query module."""
+import pytest
+
+from onyo.lib.exceptions import OnyoInvalidFilterError
+from onyo.lib.filters import Filter
+from onyo.lib.items import Item
+from onyo.lib.query import (
+    AndQuery,
+    FilterQuery,
+    NotQuery,
+    OrQuery,
+    Query,
+    as_query,
+    parse_query,
+)
+
+
+items = [Item(type='laptop', make='apple', serial='1'),
+         Item(type='laptop', make='dell', serial='2', user='someone'),
+         Item(type='display', make='dell', serial='3'),
+         Item(type='headphones', make='sennheiser', serial='4', user='someone')]
+
+
+def serials(query: str) -> list[str]:
+    return [i['serial'] for i in items if parse_query(query.split())(i)]
+
+
+def test_parse_query() -> None:
+    # statements are connected with 'and' by default
+    assert serials('type=laptop make=dell') == ['2']
+    assert serials('type=laptop and make=dell') == ['2']
+    assert serials('type=laptop AND make=dell') == ['2']
+
+    # 'and' binds stronger than 'or'
+    assert serials('type=display or type=laptop make=apple') == ['1', '3']
+    assert serials('( type=display or type=laptop ) make=dell') == ['2', '3']
+    assert serials('not ( type=display or type=laptop )') == ['4']
+    assert serials('not not type=display') == ['3']
+    assert serials('not type=laptop make=dell') == ['3']
+
+    assert serials('type in laptop,headphones') == ['1', '2', '4']
+    assert serials('type in lap.*') == ['1', '2']
+    assert serials('exists user') == ['2', '4']
+    assert serials('not exists user type=laptop') == ['1']
+
+    query = parse_query(['type=laptop', 'or', 'not', 'user=someone'])
+    assert isinstance(query, OrQuery)
+    assert isinstance(query.children[0], FilterQuery)
+    assert isinstance(query.children[1], NotQuery)
+    assert query.children[0].filter == Filter('type=laptop')
+
+    # a single statement is no compound query
+    assert isinstance(parse_query(['type=laptop']), FilterQuery)
+
+
+@pytest.mark.parametrize('tokens', [
+    [], ['('], ['(', 'type=laptop'], ['type=laptop', ')'], ['type=laptop', 'or'], ['or', 'type=laptop'],
+    ['not'], ['exists'], ['type', 'in'], ['type', 'in', 'laptop,'], ['type'], ['in', 'laptop'],
+])
+def test_parse_query_invalid(tokens: list[str]) -> None:
+    pytest.raises(OnyoInvalidFilterError, parse_query, tokens)
+
+
+def test_query_prefilter_and_ordering() -> None:
+    r"""Sub-queries are ordered by cost, and decided as far as possible."""
+
+    cheap = as_query(Filter('serial=1').match)
+    expensive = as_query(lambda item: True)
+    assert isinstance(cheap, FilterQuery)
+    assert as_query(cheap) is cheap
+
+    cost = {cheap: 0, expensive: 2}.__getitem__
+    query = AndQuery([expensive, NotQuery(expensive), cheap])
+    ordered = query.ordered(lambda q: max(cost(leaf) for leaf in q.leaves()))
+    assert ordered.children[0] is cheap
+    assert list(ordered.leaves()) == [cheap, expensive, expensive]
+
+    def leaf(q, item):
+        return q(item) if q is cheap else None
+
+    # undecided parts don't rule out an item, but decided ones do
+    assert query.prefilter(items[0], leaf) is None
+    assert query.prefilter(items[1], leaf) is False
+    assert OrQuery([cheap, expensive]).prefilter(items[0], leaf) is True
+    assert OrQuery([cheap, expensive]).prefilter(items[1], leaf) is None
+    assert NotQuery(cheap).prefilter(items[1], leaf) is True
+    assert AndQuery([]).prefilter(items[1], leaf) is True
+    assert OrQuery([]).prefilter(items[1], leaf) is False
+
+
+def test_query_abstract() -> None:
+    class Incomplete(Query):
+        r"""Query without ``__call__``."""
+
+    # an incomplete query fails when created, rather than when used
+    pytest.raises(TypeError, Incomplete)
+    pytest.raises(TypeError, Query)
@@ -0,0 +1,64 @@
+"""Tests for onyo's sqlite_cache module."""
+import sqlite3
+
+from onyo.lib.sqlite_cache import SQLiteCache
+
+
+class Cache(SQLiteCache):
+    r"""Minimal cache with a single table."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS values_ (
+        value TEXT
+    );
+    """
+
+    SCHEMA_VERSION = '3'
+
+    TABLES = ('values_',)
+
+
+def test_SQLiteCache(tmp_path) -> None:
+    path = tmp_path / "nested" / "cache.sqlite"
+    cache = Cache(path)
+    assert cache.path == path
+    assert path.exists()
+    assert cache.head is None
+    assert cache._get_meta('schema') == '3'
+
+    with cache._db:
+        cache._db.execute("INSERT INTO values_ VALUES ('a')")
+        cache._set_meta('head', 'abc')
+    cache.close()
+
+    # content persists
+    cache = Cache(path)
+    assert cache.head == 'abc'
+    assert cache._db.execute("SELECT value FROM values_").fetchall() == [('a',)]
+
+    # clearing removes the content and the meta data, except for the schema version
+    cache._reset({'other': 'value'})
+    assert cache.head is None
+    assert cache._get_meta('other') == 'value'
+    assert cache._db.execute("SELECT value FROM values_").fetchall() == []
+    cache._set_meta('head', 'abc')
+    cache._db.commit()
+    cache.close()
+
+    # a database of another schema is discarded, including its table layout
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE meta SET value = '2' WHERE key = 'schema'")
+        db.execute("DROP TABLE values_")
+        db.execute("CREATE TABLE values_ (old TEXT NOT NULL, other TEXT NOT NULL)")
+        db.execute("CREATE INDEX values_old ON values_ (old)")
+    db.close()
+    cache = Cache(path)
+    assert cache.head is None
+    assert cache._get_meta('schema') == '3'
+    assert [c[1] for c in cache._db.execute("PRAGMA table_info(values_)")] == ['value']
+    assert cache._db.execute("SELECT name FROM sqlite_master WHERE name = 'values_old'").fetchall() == []
+    with cache._db:
+        cache._db.execute("INSERT INTO values_ VALUES ('b')")
+    cache.clear()
+    assert cache._get_meta('other') is None
+    cache.close()
@@ -1,3 +1,5 @@
+import pytest
+
 from onyo.lib.utils import (
     get_asset_content,
     yaml_to_dict_multi,
@@ -82,3 +84,130 @@ def test_yaml_to_dict_multi(tmp_path) -> None:
 
     for d in from_file + from_string:
         assert_all_keys_strings(d)
+
+
+def test_patched_yaml_pool() -> None:
+    from threading import Thread
+
+    from ruamel.yaml.error import YAMLError
+
+    from onyo.lib.utils import (
+        dict_to_yaml,
+        patched_yaml,
+        yaml_to_dict,
+        YAMLPool,
+    )
+
+    # objects are reused, and loading is unaffected
+    pool = YAMLPool()
+    with pool.get() as yaml:
+        first = yaml
+        assert yaml.load(asset_file_content) == yaml_to_dict(asset_file_content)
+    with pool.get() as yaml:
+        assert yaml is first
+        assert yaml.doc_infos == []
+        # nested use gets a separate object
+        with pool.get() as nested:
+            assert nested is not yaml
+
+    # an object is discarded after an error
+    with pytest.raises(YAMLError):
+        with pool.get() as yaml:
+            yaml.load("key: [invalid")
+    with pool.get() as yaml:
+        assert yaml is not first
+
+    # round-trip and read-only profiles load the same values
+    with patched_yaml() as rt, patched_yaml('safe') as safe:
+        rt_dict = rt.load(asset_file_content)
+        safe_dict = safe.load(asset_file_content)
+    assert safe_dict == rt_dict
+    assert not hasattr(safe_dict, 'ca')
+    assert "# key comment" in dict_to_yaml(rt_dict)
+
+    # abandoning a multi-document load does not leave a half-read stream behind
+    assert next(yaml_to_dict_multi(asset_file_content + asset_file_content)) == rt_dict
+    assert yaml_to_dict(asset_file_content) == rt_dict
+
+    # concurrent use
+    results = []
+
+    def load() -> None:
+        results.extend(yaml_to_dict(asset_file_content) == rt_dict for _ in range(20))
+
+    threads = [Thread(target=load) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [True] * 80
+
+
+@pytest.mark.parametrize('content', [
+    asset_file_content,
+    asset_file_content.replace("!!int ", ""),
+    "a: -b\nc: b#c\nd: b #c\n'e': \"f\"\n-g: h\n:i: j\n",
+    "a: [b, c,]\nd: {e: f,}\ng: [h: i]\nj: [a, [b, [c]]]\n? |\n  block key\n: v\n",
+    "a: \"multi\n  line\"\nb: plain\n  continued\nc: 'multi\n\n  line'\nd: \"\\\n  escaped\"\n",
+    "a: |2\n   indented\nb: >\n  folded\n\n  para\nc: |-\n  x\n",
+    "a: \"\\N\\_\\L\\P\\e\\a\\0\\u0001\"\nb: \"é\"\n",
+    "a: &x b\nc: *x\n",
+    "a: 2001-12-14t21:59:43.10-05:00\nb: 0b101\nc: =\nd: 1e3\ne: .inf\nf: yes\ng: NULL\nh: FALSE\n",
+    "a: b\n...\n---\nc: d\n",
+    "a: b\n---\n- x\n",
+    "- a\n- b\n",
+    "",
+    # invalid YAML
+    "a: @x\n", "a: `x`\n", "a: b: c\n", "a: 'x'y\n", "a: 'unterminated\n", "a: \"\\q\"\n", "a: {b: c\n",
+    "a: b\n b: c\n", "a: *x\n", "a: - b\n", "a: b\na: c\n", "a:\n  b: c\n  b: d\n",
+    # content left to the round-trip loader
+    "%YAML 1.2\n---\na: b\n", "a: &x {b: c}\nd:\n  <<: *x\n", "a:\tb\n", "a: |\n\ttab\n",
+    "a: b\x85c\n", "\x01a: b\n",
+])
+def test_load_readonly(content: str, tmp_path) -> None:
+    r"""The read-only loader loads the same values as the round-trip loader, or defers to it."""
+
+    from onyo.lib.exceptions import NotAnAssetError
+    from onyo.lib.utils import (
+        load_readonly,
+        validate_yaml,
+    )
+
+    try:
+        expected = list(yaml_to_dict_multi(content))
+    except NotAnAssetError:
+        expected = None
+
+    documents = load_readonly(content)
+    if documents is not None and expected is not None:
+        assert documents == expected
+        assert not any(hasattr(d, 'ca') for d in documents)
+    elif documents is not None:
+        # only non-mappings fail to load for onyo, but are valid YAML
+        assert not all(isinstance(d, dict) for d in documents)
+
+    asset_file = tmp_path / "asset-file"
+    asset_file.write_text(content, encoding='utf-8')
+    assert load_readonly(asset_file) == documents
+
+    # assets load identically (or fail identically)
+    def load(readonly: bool) -> dict | str:
+        try:
+            return get_asset_content(asset_file, readonly=readonly)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+
+    assert load(readonly=True) == load(readonly=False)
+
+    # validation agrees with the round-trip loader
+    def validate() -> bool | str:
+        try:
+            return validate_yaml([asset_file])
+        except Exception as e:
+            return type(e).__name__
+
+    result = validate()
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr('onyo.lib.utils.get_readonly_loader', lambda: None)
+        assert load_readonly(content) is None
+        assert validate() == result
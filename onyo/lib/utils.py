@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 import os
+import re
+from contextlib import (
+    closing,
+    contextmanager,
+)
+from functools import cache
 from pathlib import Path
+from threading import Lock
 from typing import TYPE_CHECKING
 
 from ruamel.yaml import CommentedMap, scanner, YAML  # pyre-ignore[21]
@@ -11,27 +18,39 @@ from onyo.lib.exceptions import NotAnAssetError
 from onyo.lib.ui import ui
 
 if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
     from typing import (
+        Any,
+        Callable,
         Dict,
         Generator,
+        Literal,
     )
     from onyo.lib.items import Item
 
 
-def get_patched_yaml() -> YAML:  # pyre-ignore[11]
+def get_patched_yaml(typ: Literal['rt', 'safe'] = 'rt') -> YAML:  # pyre-ignore[11]
     r"""Return a ``YAML`` object that interprets all keys and values as strings.
 
     With the exception of YAML's nulls, which are typed as ``None``.
+
+    Building the object is comparatively expensive. Use
+    :py:func:`patched_yaml` to reuse existing objects instead.
+
+    Parameters
+    ----------
+    typ
+        ``'rt'`` (round-trip) preserves comments and formatting. ``'safe'``
+        loads plain Python objects and is only suitable for reading.
     """
 
-    import re
     import ruamel.yaml.resolver  # pyre-ignore[21]
     from ruamel.yaml.util import RegExp  # pyre-ignore[21]
 
     # Remove all default implicit typing, and replace with one that resolves
     # everything to a string.
     ruamel.yaml.resolver.implicit_resolvers = []
-    yaml = YAML(typ='rt', pure=True)
+    yaml = YAML(typ=typ, pure=True)
 
     # YAML nulls are `None`
     yaml.resolver.add_implicit_resolver(
@@ -55,6 +74,91 @@ def get_patched_yaml() -> YAML:  # pyre-ignore[11]
     return yaml
 
 
+_yaml_build_lock: Lock = Lock()
+r"""Serializes :py:func:`get_patched_yaml`, which modifies ruamel's global resolvers."""
+
+
+class YAMLPool(object):
+    r"""A thread-safe pool of reusable ``YAML`` objects (see :py:func:`get_patched_yaml`).
+
+    ``YAML`` objects are neither thread-safe nor reentrant. Each user gets an
+    object of its own for the duration of its use, and returns it to the
+    pool afterwards. New objects are only built when all existing ones are in
+    use (e.g. by nested or concurrent loading).
+
+    Objects are discarded (rather than returned) after an error, as a failed
+    load can leave state behind.
+    """
+
+    def __init__(self,
+                 typ: Literal['rt', 'safe'] = 'rt') -> None:
+        r"""Instantiate an empty ``YAMLPool``.
+
+        Parameters
+        ----------
+        typ
+            The type of ``YAML`` objects to build. Passed to
+            :py:func:`get_patched_yaml`.
+        """
+
+        self.typ = typ
+        self._free: list[YAML] = []
+        self._lock: Lock = Lock()
+
+    @contextmanager
+    def get(self) -> Generator[YAML, None, None]:
+        r"""Yield a ``YAML`` object for exclusive use until the context exits.
+
+        Documents are dumped with an explicit start (``---``).
+        """
+
+        with self._lock:
+            yaml = self._free.pop() if self._free else None
+
+        if yaml is None:
+            with _yaml_build_lock:
+                yaml = get_patched_yaml(self.typ)
+            yaml.explicit_start = True
+
+        try:
+            yield yaml
+        except GeneratorExit:
+            # the user's generator was closed (e.g. after reading the first of
+            # multiple documents)
+            self._release(yaml)
+            raise
+        # any other error discards the object
+        self._release(yaml)
+
+    def _release(self,
+                 yaml: YAML) -> None:
+        r"""Return ``yaml`` to the pool."""
+
+        # one entry is added per loaded document
+        yaml.doc_infos = []
+        with self._lock:
+            self._free.append(yaml)
+
+
+_yaml_pools: dict[str, YAMLPool] = {'rt': YAMLPool('rt'), 'safe': YAMLPool('safe')}
+
+
+def patched_yaml(typ: Literal['rt', 'safe'] = 'rt') -> AbstractContextManager[YAML]:
+    r"""Get a pooled ``YAML`` object (see :py:func:`get_patched_yaml`) for use in a ``with`` statement.
+
+    The object must not be used after the ``with`` statement. Documents are
+    dumped with an explicit start (``---``).
+
+    Parameters
+    ----------
+    typ
+        ``'rt'`` (round-trip) preserves comments and formatting. ``'safe'``
+        loads plain Python objects and is only suitable for reading.
+    """
+
+    return _yaml_pools[typ].get()
+
+
 def deduplicate(sequence: list | None) -> list | None:
     r"""Deduplicate a list and preserve its order.
 
@@ -76,6 +180,47 @@ def deduplicate(sequence: list | None) -> list | None:
     return [x for x in sequence if not (x in seen or seen.add(x))]
 
 
+def natsort_key(key: str) -> Callable[[Any], Any]:
+    r"""Get the natural sort key function for values of ``key``.
+
+    Values of ``onyo.path.*`` keys are sorted as paths. The key functions are
+    created once and reused.
+
+    Parameters
+    ----------
+    key
+        Name of the key whose values are to be sorted.
+    """
+
+    from onyo.lib.items import resolve_alias
+
+    return _natsort_keygen(resolve_alias(key).startswith('onyo.path'))
+
+
+@cache
+def _natsort_keygen(path: bool) -> Callable[[Any], Any]:
+    r"""Create a natural sort key function.
+
+    The locale is set to the user's default setting for all categories when a
+    key function is created.
+
+    Parameters
+    ----------
+    path
+        Sort values as paths.
+    """
+
+    import locale
+    import natsort
+
+    locale.setlocale(locale.LC_ALL, '')
+    alg = natsort.ns.LOCALE | natsort.ns.INT
+    if path:
+        alg |= natsort.ns.PATH
+
+    return natsort.natsort_keygen(alg=alg)
+
+
 def dict_to_yaml(d: Dict) -> str:
     r"""Convert a dictionary to a YAML string.
 
@@ -94,11 +239,9 @@ def dict_to_yaml(d: Dict) -> str:
 
     from io import StringIO
 
-    yaml = get_patched_yaml()
-    yaml.explicit_start = True
     s = StringIO()
-
-    yaml.dump(d, s)
+    with patched_yaml() as yaml:
+        yaml.dump(d, s)
     return s.getvalue()
 
 
@@ -118,10 +261,10 @@ def yaml_to_dict(s: str) -> Dict | CommentedMap:  # pyre-ignore[11]
         The YAML is invalid.
     """
 
-    yaml = get_patched_yaml()
     contents = dict()
     try:
-        contents = yaml.load(s)
+        with patched_yaml() as yaml:
+            contents = yaml.load(s)
     except YAMLError as e:  # pyre-ignore[66]
         # Remove ruamel usage pointer (see github issue 436)
         if hasattr(e, 'note') and isinstance(e.note, str) and "suppress this check" in e.note:
@@ -139,13 +282,126 @@ def yaml_to_dict(s: str) -> Dict | CommentedMap:  # pyre-ignore[11]
     return contents
 
 
-def get_asset_content(asset_file: Path) -> dict:
+@cache
+def get_readonly_loader() -> type | None:
+    r"""Return a libyaml-based PyYAML loader that interprets YAML like :py:func:`get_patched_yaml`.
+
+    All keys and values are strings, with the exception of YAML's nulls
+    (``None``) and true/false (booleans). Duplicate keys are an error.
+
+    The loaded content is plain Python objects without comments. Thus it is
+    only suitable for reading. See :py:func:`load_readonly`.
+
+    ``None`` if PyYAML or its libyaml bindings are not available.
+    """
+
+    try:
+        from yaml import CSafeLoader  # pyre-ignore[21]
+        from yaml.constructor import ConstructorError  # pyre-ignore[21]
+    except ImportError:
+        return None
+
+    class ReadOnlyLoader(CSafeLoader):  # pyre-ignore[11]
+        # start without any of PyYAML's implicit typing
+        yaml_implicit_resolvers = {}
+
+        def construct_mapping(self, node, deep=False):
+            mapping = super().construct_mapping(node, deep=deep)
+            if len(mapping) != len(node.value):
+                raise ConstructorError(None, None, "found duplicate key", node.start_mark)
+            return mapping
+
+    # the same rules as get_patched_yaml()
+    ReadOnlyLoader.add_implicit_resolver(
+            'tag:yaml.org,2002:null',
+            re.compile('''^(?: ~|null|Null|NULL| )$''', re.X),
+            ['~', 'n', 'N', '']
+    )
+    ReadOnlyLoader.add_implicit_resolver(
+            'tag:yaml.org,2002:bool',
+            re.compile(r'''^(?:true|True|TRUE|false|False|FALSE)$''', re.X),
+            ['t', 'T', 'f', 'F']
+    )
+    ReadOnlyLoader.add_implicit_resolver(
+            'tag:yaml.org,2002:str',
+            re.compile('^.*$'),
+            None
+    )
+
+    return ReadOnlyLoader
+
+
+_READONLY_UNSUPPORTED = re.compile('!|^%|<<|[\t\x85\u2028\u2029]', re.M)
+r"""Content that may load differently with :py:func:`get_readonly_loader` than with the round-trip loader.
+
+Tags, directives, merge keys, tabs (which libyaml accepts in more places), and
+line breaks that only YAML 1.1 knows.
+"""
+
+
+def load_readonly(stream: Path | str,
+                  first: bool = False) -> list | None:
+    r"""Load the documents of a YAML stream with :py:func:`get_readonly_loader`.
+
+    The result is identical to loading with the round-trip loader, except that
+    it contains plain Python objects without comments. Round-trip loading is
+    needed instead if ``None`` is returned, which is the case when:
+
+    - the read-only loader is not available
+    - the content uses YAML features that may load differently
+    - the content fails to load (the round-trip loader reports the error)
+
+    Parameters
+    ----------
+    stream
+        Path of a file, or YAML content.
+    first
+        Only load the first document.
+    """
+
+    loader = get_readonly_loader()
+    if loader is None:
+        return None
+
+    if isinstance(stream, Path):
+        try:
+            stream = stream.read_bytes().decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+
+    if _READONLY_UNSUPPORTED.search(stream):
+        return None
+
+    from yaml import (  # pyre-ignore[21]
+        load_all,
+        YAMLError as PyYAMLError,
+    )
+
+    documents = []
+    try:
+        for document in load_all(stream, Loader=loader):
+            documents.append(document)
+            if first:
+                break
+    except PyYAMLError:
+        return None
+
+    return documents
+
+
+def get_asset_content(asset_file: Path | str,
+                      readonly: bool = False) -> dict:
     r"""Get the contents of a Path as a dictionary.
 
     Parameters
     ----------
     asset_file
-        Path to get the contents of.
+        Path to get the contents of. A ``str`` is interpreted as YAML content
+        that was already read (e.g. from a git object).
+    readonly
+        Load plain Python objects without comments via
+        :py:func:`load_readonly`, if possible. This is considerably faster,
+        but the content is not suitable to be written back.
 
     Raises
     ------
@@ -153,6 +409,11 @@ def get_asset_content(asset_file: Path) -> dict:
         The YAML is invalid.
     """
 
+    if readonly:
+        documents = load_readonly(asset_file, first=True)
+        if documents is not None and all(isinstance(d, dict) for d in documents):
+            return documents[0] if documents else dict()
+
     try:
         contents = yaml_to_dict_multi(asset_file).__next__()
     except StopIteration:
@@ -166,13 +427,14 @@ def yaml_to_dict_multi(stream: Path | str) -> Generator[dict | CommentedMap, Non
     # TODO: Input should actually be stream (`TextIO` or sth) not str
     #       Figure when utilizing properly via `onyo_new` where things can come in from file or stdin.
     # TODO: Utilize this function in `get_asset_content` by retrieving only the first document and ignore the rest.
-    yaml = get_patched_yaml()
     try:
-        for document in yaml.load_all(stream):
-            if not isinstance(document, (dict, CommentedMap)):
-                # TODO: Better error. See also get_asset_content
-                raise NotAnAssetError(f"Invalid item in YAML document ({stream}).")
-            yield document
+        # close `load_all()` before the YAML object is returned to the pool
+        with patched_yaml() as yaml, closing(yaml.load_all(stream)) as documents:
+            for document in documents:
+                if not isinstance(document, (dict, CommentedMap)):
+                    # TODO: Better error. See also get_asset_content
+                    raise NotAnAssetError(f"Invalid item in YAML document ({stream}).")
+                yield document
     except YAMLError as e:  # pyre-ignore[66]
         # Remove ruamel usage pointer (see github issue 436)
         if hasattr(e, 'note') and isinstance(e.note, str) and "suppress this check" in e.note:
@@ -216,8 +478,13 @@ def validate_yaml(asset_files: list[Path] | None) -> bool:
     invalid_yaml = []
     asset_files = asset_files or []
     for asset in asset_files:
+        # the read-only loader can only confirm valid YAML; errors are up to the round-trip loader
+        documents = load_readonly(asset)
+        if documents is not None and len(documents) <= 1:
+            continue
         try:
-            get_patched_yaml().load(asset)
+            with patched_yaml() as yaml:
+                yaml.load(asset)
         except scanner.ScannerError:  # pyre-ignore[66]
             invalid_yaml.append(str(asset))
 
@@ -260,6 +260,7 @@ def setup_parser() -> OnyoArgumentParser:
     from onyo.cli.get import args_get, epilog_get
     from onyo.cli.history import args_history, epilog_history
     from onyo.cli.init import args_init, epilog_init
+    from onyo.cli.maintenance import args_maintenance, epilog_maintenance
     from onyo.cli.mkdir import args_mkdir, epilog_mkdir
     from onyo.cli.mv import args_mv, epilog_mv
     from onyo.cli.new import args_new, epilog_new
@@ -359,6 +360,18 @@ def setup_parser() -> OnyoArgumentParser:
     cmd_init.set_defaults(run=cli.init)
     build_parser(cmd_init, args_init)
     #
+    # subcommand "maintenance"
+    #
+    cmd_maintenance = subcmds.add_parser(
+        'maintenance',
+        description=cli.maintenance.__doc__,
+        epilog=epilog_maintenance,
+        formatter_class=parser.formatter_class,
+        help='Optimize the Onyo repository and refresh Onyo\'s caches.'
+    )
+    cmd_maintenance.set_defaults(run=cli.maintenance)
+    build_parser(cmd_maintenance, args_maintenance)
+    #
     # subcommand "mkdir"
     #
     cmd_mkdir = subcmds.add_parser(
@@ -194,3 +194,63 @@ class TestOnyoBenchmark:
         assert len(onyo_get(inventory)) == num
         filters = [Filter('fifty=fifty').match]
         assert len(onyo_get(inventory, match=filters)) == 50  # pyre-ignore[6]
+
+
+@pytest.mark.parametrize('pooled', [False, True], ids=['new', 'pooled'])
+class TestYAMLBenchmark:
+    r"""Per-document cost of loading and dumping YAML.
+
+    Compares building a new ``YAML`` object per call (``new``; the behavior
+    prior to :py:class:`onyo.lib.utils.YAMLPool`) with reusing pooled ones
+    (``pooled``).
+    """
+
+    document = ("---\n# comment\ntype: laptop\nmake: lenovo  # inline\nmodel:\n  name: T14\n"
+                "serial: 00012_3456\nuser: null\nactive: true\nports:\n- usb\n- hdmi\n")
+
+    @staticmethod
+    def get_yaml(pooled: bool):
+        r"""Get a context manager yielding a new (``pooled=False``) or pooled ``YAML`` object."""
+
+        from contextlib import nullcontext
+
+        from onyo.lib.utils import (
+            get_patched_yaml,
+            patched_yaml,
+        )
+
+        if pooled:
+            return patched_yaml()
+
+        yaml = get_patched_yaml()
+        yaml.explicit_start = True
+        return nullcontext(yaml)
+
+    def test_yaml_load(self,
+                       pooled: bool,
+                       benchmark) -> None:
+        r"""Load a single document."""
+
+        def load():
+            with self.get_yaml(pooled) as yaml:
+                return yaml.load(self.document)
+
+        assert benchmark(load)['model']['name'] == "T14"
+
+    def test_yaml_dump(self,
+                       pooled: bool,
+                       benchmark) -> None:
+        r"""Dump a single document."""
+
+        from io import StringIO
+
+        with self.get_yaml(pooled) as yaml:
+            content = yaml.load(self.document)
+
+        def dump():
+            s = StringIO()
+            with self.get_yaml(pooled) as yaml:
+                yaml.dump(content, s)
+            return s.getvalue()
+
+        assert "make: lenovo  # inline" in benchmark(dump)